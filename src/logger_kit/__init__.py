@@ -1,11 +1,57 @@
 import asyncio
+import contextvars
+import copy
 import logging
-from contextlib import contextmanager
-from typing import Any, Dict, Optional
-
-from pythonjsonlogger.json import JsonFormatter
+import sys
+import time
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+    cast,
+)
 
+from .context import ContextScope, LogContext
+from .dedup import Deduplicator
+from .formatters import build_formatter, fan_out
+from .handlers import ConsoleHandler
+from .lazy import (
+    Lazy,
+    MessageType,
+    message_key,
+    render,
+    resolve_extra,
+    split_args,
+)
+from .levels import (
+    LEVELS,
+    METHOD_LEVELS,
+    NOTICE,
+    TRACE,
+    add_level,
+    level_number,
+)
 from .masking import KeyMasker
+from .metrics import PipelineMetrics, Timings, handler_name, logger_stats
+from .queueing import BackgroundWriter
+from .records import UNKNOWN_CALLER, Caller, CompactRecord, check_extra
+from .registry import (
+    HandlerLike,
+    as_handler,
+    attach,
+    configure,
+    get_sink,
+    register_sink,
+    unregister_sink,
+)
+from .sampling import Sampler, summary_extra
+from .tail import TailBuffer
 from .version import (
     __author__,
     __author_email__,
@@ -14,10 +60,22 @@ from .version import (
     __version__,
 )
 
+# ``extra`` may be passed as a zero-argument callable that builds the dict;
+# it is only called when the record is actually going to be emitted.
+ExtraType = Union[Dict[str, Any], Callable[[], Dict[str, Any]]]
+
 __all__ = [
     "BaseLogger",
     "Logger",
     "KeyMasker",
+    "Lazy",
+    "TRACE",
+    "NOTICE",
+    "add_level",
+    "configure",
+    "get_sink",
+    "register_sink",
+    "unregister_sink",
     "__version__",
     "__author__",
     "__author_email__",
@@ -29,132 +87,788 @@ __all__ = [
 class BaseLogger:
     """Base logger class providing core logging functionality."""
 
-    def __init__(self, name: str = "app", level: str = "INFO"):
+    def __init__(
+        self,
+        name: str = "app",
+        level: str = "INFO",
+        queued: bool = False,
+        queue_size: int = 10000,
+        overflow: str = "block",
+        serializer: str = "auto",
+        formatter: Union[str, logging.Formatter] = "json",
+        async_inline: bool = False,
+        sampler: Optional[Sampler] = None,
+        sample_by: str = "message",
+        deduplicator: Optional[Deduplicator] = None,
+        tail_buffer: Optional[TailBuffer] = None,
+        extra: Optional[Dict[str, Any]] = None,
+        extra_fields: Optional[Dict[str, Any]] = None,
+        console: bool = True,
+        sinks: Optional[Sequence[HandlerLike]] = None,
+        caller_info: bool = False,
+        metrics: Optional[PipelineMetrics] = None,
+    ):
+        if sample_by not in ("message", "site"):
+            raise ValueError(
+                f"Unknown sample_by {sample_by!r}, expected message or site"
+            )
         self.logger = logging.getLogger(name)
-        self.level = getattr(logging, level.upper())
+        self.level = level_number(level)
         self.logger.setLevel(self.level)
 
-        # Create JSON formatter
-        formatter = JsonFormatter(
-            fmt="%(asctime)s %(name)s %(levelname)s %(message)s",
-            json_ensure_ascii=False,
-            rename_fields={"message": "@message"},
+        self.formatter = build_formatter(formatter, serializer)
+
+        if console:
+            # Replace the console handler of an earlier logger of this name
+            for handler in self.logger.handlers[:]:
+                if isinstance(handler, ConsoleHandler):
+                    self.logger.removeHandler(handler)
+            console_handler = ConsoleHandler()
+            console_handler.setFormatter(self.formatter)
+            self.logger.addHandler(console_handler)
+        for sink in sinks or ():
+            self.add_handler(sink)
+
+        self.async_inline = async_inline
+        self.sampler = sampler
+        self.sample_by_site = sample_by == "site"
+        self.deduplicator = deduplicator
+        self.tail_buffer = tail_buffer
+        self.caller_info = caller_info
+        self.metrics = metrics
+        if metrics is not None:
+            metrics.attach(self)
+        self.fields: Dict[str, Any] = {**(extra or {}), **(extra_fields or {})}
+        # The logger bind() derived this one from, kept by copy.copy()
+        self._root = self
+        # Fields prepared for the given mask generation, see _bound_fields
+        self._prepared_fields: Optional[Tuple[int, Dict[str, Any]]] = None
+        # Shared with bound children, so their records see the context too
+        self._context: "contextvars.ContextVar[Optional[LogContext]]" = (
+            contextvars.ContextVar(f"logger_kit_{name}", default=None)
+        )
+        self.writer: Optional[BackgroundWriter] = None
+        if queued:
+            self.writer = BackgroundWriter(
+                self._emit,
+                capacity=queue_size,
+                overflow=overflow,
+                name=f"logger-kit-{name}",
+            )
+        self._bind_levels()
+
+    def add_handler(self, handler: HandlerLike) -> logging.Handler:
+        """Attach ``handler`` (or sink name) unless it already is.
+
+        A handler without a formatter gets the logger's.
+        """
+        resolved = as_handler(handler)
+        if resolved.formatter is None:
+            resolved.setFormatter(self.formatter)
+        attach(self.logger, resolved)
+        return resolved
+
+    def bind(self, **fields: Any) -> "BaseLogger":
+        """Return a child logger adding ``fields`` to every record.
+
+        The child shares level, handlers, queue and masking rules with this
+        logger; fields passed in ``extra`` take precedence over bound ones.
+        """
+        child = copy.copy(self)
+        child.fields = {**self.fields, **fields}
+        child._prepared_fields = None
+        # The copied stubs would log through this logger
+        child._bind_levels()
+        return child
+
+    def _bound_fields(self) -> Optional[Dict[str, Any]]:
+        """Return the logger, bound and context fields of a record.
+
+        They are prepared (masked) once per set of masking rules.
+        """
+        fields = self._logger_fields()
+        context = self._context.get()
+        if context is None or not context.fields:
+            return fields
+        return context.merge(
+            fields, self._fields_generation(), self._prepare_fields
         )
 
-        # Create console handler
-        console_handler = logging.StreamHandler()
-        console_handler.setFormatter(formatter)
-        self.logger.addHandler(console_handler)
+    def _logger_fields(self) -> Optional[Dict[str, Any]]:
+        """Return the logger and bound fields, prepared."""
+        if not self.fields:
+            return None
+        generation = self._fields_generation()
+        prepared = self._prepared_fields
+        if prepared is None or prepared[0] != generation:
+            prepared = (generation, self._prepare_fields(self.fields))
+            self._prepared_fields = prepared
+        return prepared[1]
+
+    def _prepare_fields(self, fields: Dict[str, Any]) -> Dict[str, Any]:
+        return fields
+
+    def _fields_generation(self) -> int:
+        return 0
+
+    def set_level(self, level: str) -> None:
+        """Change the logging level."""
+        self.level = level_number(level)
+        self._set_level(self.level)
+
+    def _set_level(self, levelno: int) -> None:
+        self.logger.setLevel(levelno)
+        self._bind_levels()
+
+    def _bind_levels(self) -> None:
+        """Rebuild the table of logging methods for the current level.
+
+        Methods of enabled levels are the class's; those of levels filtered
+        out (and not kept by the tail buffer) are instance attributes that
+        return at once, unless the stdlib level or logging.disable() has
+        changed since or a context overrides the level.
+        """
+        logger = self.logger
+        # Per-level answers of isEnabledFor, valid for _cached_state only
+        self._enabled: Dict[str, bool] = {}
+        self._cached_state = (logger.level, logger.manager.disable)
+        tail = self.tail_buffer
+        for level in METHOD_LEVELS:
+            name = level.lower()
+            if logger.isEnabledFor(LEVELS[level]) or (
+                tail is not None and tail.buffers(level)
+            ):
+                self.__dict__.pop(name, None)
+                self.__dict__.pop(f"a{name}", None)
+            else:
+                method, amethod = self._disabled_methods(level)
+                setattr(self, name, method)
+                setattr(self, f"a{name}", amethod)
+
+    def _disabled_methods(
+        self, level: str
+    ) -> Tuple[Callable[..., None], Callable[..., Awaitable[None]]]:
+        var = self._context
+        logger = self.logger
+        manager = logger.manager
+        levelno = logger.level
+        disable = manager.disable
+
+        def log(
+            message: MessageType,
+            *args: Any,
+            extra: Optional[ExtraType] = None,
+        ) -> None:
+            context = var.get()
+            if (
+                logger.level != levelno
+                or manager.disable != disable
+                or (context is not None and context.level is not None)
+            ):
+                self._log(level, message, extra, args)
+
+        async def alog(
+            message: MessageType,
+            *args: Any,
+            extra: Optional[ExtraType] = None,
+        ) -> None:
+            context = var.get()
+            if (
+                logger.level != levelno
+                or manager.disable != disable
+                or (context is not None and context.level is not None)
+            ):
+                await self._alog(level, message, extra, args)
+
+        return log, alog
+
+    def _is_enabled(self, level: str) -> bool:
+        """Return whether a record at ``level`` would be emitted."""
+        logger = self.logger
+        disable = logger.manager.disable
+        if self._cached_state != (logger.level, disable):
+            # The stdlib level was changed directly, or through the parent
+            # of a bound logger, or logging.disable() was called; drop
+            # stale answers
+            self._bind_levels()
+        context = self._context.get()
+        if context is not None and context.level is not None:
+            if disable and logging.getLevelName(level) <= disable:
+                return False
+            return context.is_enabled(level)
+        try:
+            return self._enabled[level]
+        except KeyError:
+            enabled = logger.isEnabledFor(logging.getLevelName(level))
+            self._enabled[level] = enabled
+            return enabled
 
     def _log(
-        self, level: str, message: str, extra: Optional[Dict[str, Any]] = None
+        self,
+        level: str,
+        message: MessageType,
+        extra: Optional[ExtraType] = None,
+        args: Tuple[Any, ...] = (),
     ) -> None:
-        log_method = getattr(self.logger, level.lower())
-        log_method(message, extra=extra)
+        if args:
+            args, extra = split_args(message, args, extra)
+        # Bail out before any masking, copying or queueing work
+        if not self._is_enabled(level):
+            tail = self.tail_buffer
+            if tail is not None and tail.buffers(level):
+                tail.append(
+                    self._context.get(),
+                    level,
+                    message,
+                    args,
+                    extra,
+                    self,
+                    self._find_caller() if self.caller_info else None,
+                )
+            return
+        caller = self._find_caller() if self.caller_info else None
+        if self.sampler is not None and not self._sample(level, message):
+            return
+        # Lazy messages, arguments and extra are evaluated once, here
+        if args or not isinstance(message, str):
+            text: str = render(message, args)
+        else:
+            text = message
+        resolved: Optional[Dict[str, Any]] = None
+        if extra is not None:
+            resolved = resolve_extra(extra)
+        fields = self._bound_fields()
+        deduplicator = self.deduplicator
+        if deduplicator is not None and not deduplicator.check(
+            level, text, resolved, self._deliver, fields
+        ):
+            return
+        tail = self.tail_buffer
+        if tail is not None and tail.triggers(level):
+            for item in self._take_tail():
+                self._deliver(*item)
+        self._deliver(level, text, resolved, fields, None, caller)
 
-    def debug(
+    def _deliver(
         self,
+        level: str,
         message: str,
-        extra: Optional[Dict[str, Any]] = None,
+        extra: Optional[Dict[str, Any]],
+        fields: Optional[Dict[str, Any]],
+        created: Optional[float] = None,
+        caller: Optional[Caller] = None,
     ) -> None:
-        self._log("DEBUG", message, extra)
+        writer = self.writer
+        if writer is not None and not writer.closed:
+            if created is None:
+                # Stamp the record now, not when the writer thread gets to it
+                created = time.time()
+            writer.submit(level, message, extra, fields, created, caller)
+            return
+        self._emit(level, message, extra, fields, created, caller)
 
-    def info(
+    def _find_caller(self, depth: int = 3) -> Caller:
+        """Return the file, line and function of the logging call."""
+        frame = sys._getframe(depth)
+        code = frame.f_code
+        return (code.co_filename, frame.f_lineno, code.co_name)
+
+    def _take_tail(self) -> List[Tuple[Any, ...]]:
+        """Return the records kept by the tail buffer, ready to deliver."""
+        items = []
+        entries = self.tail_buffer.take(  # type: ignore[union-attr]
+            self._context.get()
+        )
+        for created, level, message, args, extra, logger, caller in entries:
+            message = render(message, args)
+            extra = resolve_extra(extra)
+            fields = logger._bound_fields()
+            items.append((level, message, extra, fields, created, caller))
+        return items
+
+    def _sample(
+        self, level: str, message: MessageType, depth: int = 3
+    ) -> bool:
+        """Ask the sampler about a record; ``depth`` locates the caller."""
+        sampler = self.sampler
+        if self.sample_by_site:
+            frame = sys._getframe(depth)
+            key: Any = (frame.f_code.co_filename, frame.f_lineno)
+        else:
+            key = message_key(message)
+        allowed = sampler.allow(level, key)  # type: ignore[union-attr]
+        if not allowed and self.metrics is not None:
+            self.metrics.sampled_out(self.logger.name)
+        summary = sampler.take_summary()  # type: ignore[union-attr]
+        if summary is not None:
+            self._log_summary(summary)
+        return allowed
+
+    def _log_summary(self, summary: Dict[Any, int]) -> None:
+        if not self.logger.isEnabledFor(logging.WARNING):
+            return
+        extra = summary_extra(summary)
+        message = f"Suppressed {extra['suppressed']} sampled log records"
+        # The summary covers records of any context and bound logger, so
+        # it only carries the fields of the logger they were bound from
+        self._deliver("WARNING", message, extra, self._root._logger_fields())
+
+    def _emit(
         self,
+        level: str,
         message: str,
         extra: Optional[Dict[str, Any]] = None,
+        fields: Optional[Dict[str, Any]] = None,
+        created: Optional[float] = None,
+        caller: Optional[Caller] = None,
     ) -> None:
-        self._log("INFO", message, extra)
+        metrics = self.metrics
+        if metrics is not None and metrics.time_next:
+            metrics.time_next = False
+            self._emit_timed(
+                metrics, level, message, extra, fields, created, caller
+            )
+            return
+        message, extra = self._mask(message, extra)
+        if fields:
+            extra = {**fields, **extra} if extra else fields
+        if created is None:
+            created = time.time()
+        record = self._handle(level, message, extra, created, caller)
+        if metrics is not None and record is not None:
+            metrics.record(self.logger.name, level, self.formatter, record)
 
-    def warning(
+    def _emit_timed(
         self,
+        metrics: PipelineMetrics,
+        level: str,
         message: str,
-        extra: Optional[Dict[str, Any]] = None,
+        extra: Optional[Dict[str, Any]],
+        fields: Optional[Dict[str, Any]],
+        created: Optional[float],
+        caller: Optional[Caller],
     ) -> None:
-        self._log("WARNING", message, extra)
+        """Emit a record sampled by ``metrics``, timing each stage."""
+        start = time.perf_counter()
+        message, extra = self._mask(message, extra)
+        timings = [("mask", time.perf_counter() - start)]
+        if fields:
+            extra = {**fields, **extra} if extra else fields
+        if created is None:
+            created = time.time()
+        record = self._handle(level, message, extra, created, caller, timings)
+        if record is not None:
+            timings.append(("emit", time.perf_counter() - start))
+            metrics.record(
+                self.logger.name, level, self.formatter, record, timings
+            )
 
-    def error(
+    def _mask(
+        self, message: str, extra: Optional[Dict[str, Any]]
+    ) -> Tuple[str, Optional[Dict[str, Any]]]:
+        """Return the message and extra of a record as they are logged."""
+        return message, extra
+
+    def _handle(
         self,
+        level: str,
         message: str,
-        extra: Optional[Dict[str, Any]] = None,
+        extra: Optional[Dict[str, Any]],
+        created: float,
+        caller: Optional[Caller],
+        timings: Optional[Timings] = None,
+    ) -> Optional[CompactRecord]:
+        """Pass a record to the handlers of the logger and its parents.
+
+        Like logging.Logger.handle, except that the level was checked by
+        the caller, possibly against a context override, and that handlers
+        accepting CompactRecords get one. A LogRecord is only built for the
+        others, or for the logger's filters and custom record factories.
+        """
+        logger = self.logger
+        if logger.disabled:
+            return None
+        if extra:
+            check_extra(extra)
+        record = CompactRecord(
+            logger.name,
+            logging.getLevelName(level),
+            level,
+            message,
+            extra,
+            created,
+            caller or UNKNOWN_CALLER,
+        )
+        # Formatters shared by the handlers encode the record only once
+        outer = (fan_out.record, fan_out.log_record)
+        fan_out.record = record
+        fan_out.log_record = None
+        try:
+            if (
+                logger.filters
+                or logging.getLogRecordFactory() is not logging.LogRecord
+            ):
+                fan_out.log_record = record.to_log_record()
+                logger.handle(fan_out.log_record)
+            else:
+                self._call_handlers(record, timings)
+        finally:
+            fan_out.record, fan_out.log_record = outer
+        return record
+
+    def _call_handlers(
+        self,
+        record: CompactRecord,
+        timings: Optional[Timings] = None,
     ) -> None:
-        self._log("ERROR", message, extra)
+        levelno = record.levelno
+        if timings is not None:
+            # Encode up front, so handlers sharing the formatter find the
+            # output cached and their timings only cover the writing
+            formatter = self.formatter
+            if getattr(formatter, "accepts_compact", False):
+                start = time.perf_counter()
+                formatter.format_bytes(record)  # type: ignore[attr-defined]
+                timings.append(("format", time.perf_counter() - start))
+        found = False
+        current: Optional[logging.Logger] = self.logger
+        while current is not None:
+            for handler in current.handlers:
+                found = True
+                if levelno < handler.level:
+                    continue
+                if (
+                    getattr(handler, "accepts_compact", False)
+                    and getattr(handler.formatter, "accepts_compact", False)
+                    and not handler.filters
+                ):
+                    passed: Any = record
+                else:
+                    passed = self._converted(record)
+                if timings is None:
+                    handler.handle(passed)
+                else:
+                    start = time.perf_counter()
+                    handler.handle(passed)
+                    stage = f"handler:{handler_name(handler)}"
+                    timings.append((stage, time.perf_counter() - start))
+            current = current.parent if current.propagate else None
+        last_resort = logging.lastResort
+        if not found and last_resort is not None:
+            if levelno >= last_resort.level:
+                last_resort.handle(self._converted(record))
+
+    @staticmethod
+    def _converted(record: CompactRecord) -> logging.LogRecord:
+        """Return the LogRecord of ``record``, converting it once."""
+        log_record = fan_out.log_record
+        if log_record is None:
+            log_record = fan_out.log_record = record.to_log_record()
+        return log_record
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until queued records have reached the handlers.
+
+        Aggregates of ended deduplication windows are logged first.
+        Returns False if the timeout expired first.
+        """
+        if self.deduplicator is not None:
+            self.deduplicator.flush_expired(self._deliver)
+        if self.writer is not None and not self.writer.flush(timeout):
+            return False
+        for handler in self.logger.handlers:
+            handler.flush()
+        return True
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Flush pending records and stop the background writer."""
+        if self.sampler is not None:
+            summary = self.sampler.take_summary(force=True)
+            if summary is not None:
+                self._log_summary(summary)
+        if self.deduplicator is not None:
+            self.deduplicator.flush(self._deliver)
+        if self.writer is not None:
+            self.writer.close(timeout)
+        for handler in self.logger.handlers:
+            handler.flush()
+        if self.metrics is not None:
+            self.metrics.export()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the pipeline statistics (see logger_kit.metrics)."""
+        return logger_stats(self)
+
+    def log(
+        self,
+        level: str,
+        message: MessageType,
+        *args: Any,
+        extra: Optional[ExtraType] = None,
+    ) -> None:
+        """Log at the level named ``level``."""
+        level_number(level)
+        self._log(level.upper(), message, extra, args)
+
+    def trace(
+        self,
+        message: MessageType,
+        *args: Any,
+        extra: Optional[ExtraType] = None,
+    ) -> None:
+        self._log("TRACE", message, extra, args)
+
+    def debug(
+        self,
+        message: MessageType,
+        *args: Any,
+        extra: Optional[ExtraType] = None,
+    ) -> None:
+        self._log("DEBUG", message, extra, args)
+
+    def info(
+        self,
+        message: MessageType,
+        *args: Any,
+        extra: Optional[ExtraType] = None,
+    ) -> None:
+        self._log("INFO", message, extra, args)
+
+    def notice(
+        self,
+        message: MessageType,
+        *args: Any,
+        extra: Optional[ExtraType] = None,
+    ) -> None:
+        self._log("NOTICE", message, extra, args)
+
+    def warning(
+        self,
+        message: MessageType,
+        *args: Any,
+        extra: Optional[ExtraType] = None,
+    ) -> None:
+        self._log("WARNING", message, extra, args)
+
+    def error(
+        self,
+        message: MessageType,
+        *args: Any,
+        extra: Optional[ExtraType] = None,
+    ) -> None:
+        self._log("ERROR", message, extra, args)
 
     def critical(
         self,
-        message: str,
-        extra: Optional[Dict[str, Any]] = None,
+        message: MessageType,
+        *args: Any,
+        extra: Optional[ExtraType] = None,
     ) -> None:
-        self._log("CRITICAL", message, extra)
+        self._log("CRITICAL", message, extra, args)
+
+    async def aflush(self) -> None:
+        """Await until queued records have reached the handlers."""
+        if self.deduplicator is not None:
+            self.deduplicator.flush_expired(self._deliver)
+        if self.writer is not None:
+            await self.writer.aflush()
+        for handler in self.logger.handlers:
+            aflush = getattr(handler, "aflush", None)
+            if aflush is not None:
+                await aflush()
+            else:
+                handler.flush()
+
+    async def aclose(self) -> None:
+        """Flush pending records and stop the writer without blocking."""
+        if self.writer is not None:
+            self.writer.queue.close()
+            await self.writer.aflush()
+        self.close()
 
     async def _alog(
-        self, level: str, message: str, extra: Optional[Dict[str, Any]] = None
+        self,
+        level: str,
+        message: MessageType,
+        extra: Optional[ExtraType] = None,
+        args: Tuple[Any, ...] = (),
     ) -> None:
-        await asyncio.get_event_loop().run_in_executor(
-            None, self._log, level, message, extra
+        if args:
+            args, extra = split_args(message, args, extra)
+        if not self._is_enabled(level):
+            tail = self.tail_buffer
+            if tail is not None and tail.buffers(level):
+                tail.append(
+                    self._context.get(),
+                    level,
+                    message,
+                    args,
+                    extra,
+                    self,
+                    self._find_caller() if self.caller_info else None,
+                )
+            return
+        caller = self._find_caller() if self.caller_info else None
+        if self.sampler is not None and not self._sample(level, message):
+            return
+        # Lazy messages, arguments and extra are evaluated once, here
+        if args or not isinstance(message, str):
+            text: str = render(message, args)
+        else:
+            text = message
+        resolved: Optional[Dict[str, Any]] = None
+        if extra is not None:
+            resolved = resolve_extra(extra)
+        fields = self._bound_fields()
+        deduplicator = self.deduplicator
+        if deduplicator is not None and not deduplicator.check(
+            level, text, resolved, self._deliver, fields
+        ):
+            return
+        tail = self.tail_buffer
+        if tail is not None and tail.triggers(level):
+            await self._aflush_tail()
+        writer = self.writer
+        created = time.time()
+        if writer is not None and not writer.closed:
+            # Queued loggers hand the record straight to the writer thread;
+            # no executor round trip per record.
+            await writer.asubmit(
+                level, text, resolved, fields, created, caller
+            )
+            return
+        if self.async_inline:
+            self._emit(level, text, resolved, fields, created, caller)
+            return
+        # Executor threads do not see this task's context; collect the
+        # fields here
+        await asyncio.get_running_loop().run_in_executor(
+            None, self._emit, level, text, resolved, fields, created, caller
         )
 
+    async def _aflush_tail(self) -> None:
+        items = self._take_tail()
+        if not items:
+            return
+        writer = self.writer
+        if writer is not None and not writer.closed:
+            for item in items:
+                await writer.asubmit(*item)
+        elif self.async_inline:
+            for item in items:
+                self._emit(*item)
+        else:
+            await asyncio.get_running_loop().run_in_executor(
+                None, self._emit_all, items
+            )
+
+    def _emit_all(self, items: List[Tuple[Any, ...]]) -> None:
+        for item in items:
+            self._emit(*item)
+
+    async def alog(
+        self,
+        level: str,
+        message: MessageType,
+        *args: Any,
+        extra: Optional[ExtraType] = None,
+    ) -> None:
+        """Log at the level named ``level``."""
+        level_number(level)
+        await self._alog(level.upper(), message, extra, args)
+
+    async def atrace(
+        self,
+        message: MessageType,
+        *args: Any,
+        extra: Optional[ExtraType] = None,
+    ) -> None:
+        await self._alog("TRACE", message, extra, args)
+
     async def adebug(
-        self, message: str, extra: Optional[Dict[str, Any]] = None
+        self,
+        message: MessageType,
+        *args: Any,
+        extra: Optional[ExtraType] = None,
     ) -> None:
-        await self._alog("DEBUG", message, extra)
+        await self._alog("DEBUG", message, extra, args)
 
     async def ainfo(
         self,
-        message: str,
-        extra: Optional[Dict[str, Any]] = None,
+        message: MessageType,
+        *args: Any,
+        extra: Optional[ExtraType] = None,
     ) -> None:
-        await self._alog("INFO", message, extra)
+        await self._alog("INFO", message, extra, args)
+
+    async def anotice(
+        self,
+        message: MessageType,
+        *args: Any,
+        extra: Optional[ExtraType] = None,
+    ) -> None:
+        await self._alog("NOTICE", message, extra, args)
 
     async def awarning(
-        self, message: str, extra: Optional[Dict[str, Any]] = None
+        self,
+        message: MessageType,
+        *args: Any,
+        extra: Optional[ExtraType] = None,
     ) -> None:
-        await self._alog("WARNING", message, extra)
+        await self._alog("WARNING", message, extra, args)
 
     async def aerror(
-        self, message: str, extra: Optional[Dict[str, Any]] = None
+        self,
+        message: MessageType,
+        *args: Any,
+        extra: Optional[ExtraType] = None,
     ) -> None:
-        await self._alog("ERROR", message, extra)
+        await self._alog("ERROR", message, extra, args)
 
     async def acritical(
-        self, message: str, extra: Optional[Dict[str, Any]] = None
-    ) -> None:
-        await self._alog("CRITICAL", message, extra)
-
-    @contextmanager
-    def context(self, **kwargs):  # type: ignore
-        """Context manager for temporary logger settings"""
-        old_settings = {}
-        for key, value in kwargs.items():
-            if hasattr(self, key):
-                old_settings[key] = getattr(self, key)
-                if key == "level":
-                    value = getattr(logging, value.upper())
-                    self.logger.setLevel(value)
-                setattr(self, key, value)
+        self,
+        message: MessageType,
+        *args: Any,
+        extra: Optional[ExtraType] = None,
+    ) -> None:
+        await self._alog("CRITICAL", message, extra, args)
 
-        try:
-            yield self
-        finally:
-            for key, value in old_settings.items():
-                if key == "level":
-                    self.logger.setLevel(value)
-                setattr(self, key, value)
+    def context(
+        self, level: Optional[str] = None, **fields: Any
+    ) -> ContextScope:
+        """Scope a level override and fields to the current task or thread.
+
+        Use as ``with logger.context(...)`` or ``async with``. Only records
+        logged by the current thread or asyncio task (and tasks it creates)
+        within the block are affected; nested contexts add to the fields of
+        the enclosing one. Context fields take precedence over bound fields,
+        and ``extra`` over both.
+        """
+        return ContextScope(self, self._context, level, fields)
 
 
 class Logger(BaseLogger):
     """Enhanced logger with data masking capabilities."""
 
-    def __init__(self, name: str = "app", level: str = "INFO"):
-        super().__init__(name, level)
+    def __init__(self, name: str = "app", level: str = "INFO", **kwargs: Any):
         self.key_masker = KeyMasker()
+        super().__init__(name, level, **kwargs)
 
-    def _log(
-        self, level: str, message: str, extra: Optional[Dict[str, Any]] = None
-    ) -> None:
+    def _prepare_fields(self, fields: Dict[str, Any]) -> Dict[str, Any]:
+        return cast(Dict[str, Any], self.key_masker.mask_data(fields))
+
+    def _fields_generation(self) -> int:
+        return self.key_masker.generation
+
+    def _mask(
+        self, message: str, extra: Optional[Dict[str, Any]]
+    ) -> Tuple[str, Optional[Dict[str, Any]]]:
+        if self.key_masker.scans_values and isinstance(message, str):
+            message = self.key_masker.mask_text(message)
         masked_extra = self.key_masker.mask_data(extra) if extra else {}
-        # Ensure masked_extra is a dictionary or None before passing to _log
+        # Ensure masked_extra is a dictionary or None before passing on
         masked_extra_dict = None
         if isinstance(masked_extra, dict):
             masked_extra_dict = masked_extra
-        super()._log(level, message, masked_extra_dict)
+        # Bound fields arrive already masked
+        return message, masked_extra_dict
@@ -0,0 +1,202 @@
+import bz2
+import gzip
+import io
+import lzma
+import os
+import queue
+import shutil
+import sys
+import threading
+import time
+import traceback
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import zstandard  # type: ignore[import]
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+# File suffix of each compression method
+COMPRESSION_SUFFIXES: Dict[str, str] = {
+    "gzip": ".gz",
+    "bz2": ".bz2",
+    "lzma": ".xz",
+    "zstd": ".zst",
+}
+
+
+def available_compressions() -> List[str]:
+    """Return the names of the usable compression methods."""
+    return [
+        name
+        for name in COMPRESSION_SUFFIXES
+        if name != "zstd" or zstandard is not None
+    ]
+
+
+# Compression level used when none is given
+DEFAULT_LEVELS: Dict[str, int] = {"gzip": 6, "bz2": 9, "lzma": 6, "zstd": 3}
+
+
+def _open_compressed(
+    method: str, path: str, level: Optional[int]
+) -> io.BufferedIOBase:
+    if level is None:
+        level = DEFAULT_LEVELS[method]
+    if method == "gzip":
+        return gzip.open(path, "wb", compresslevel=level)
+    if method == "bz2":
+        return bz2.open(path, "wb", compresslevel=level)
+    if method == "lzma":
+        return lzma.open(path, "wb", preset=level)
+    compressor = zstandard.ZstdCompressor(level=level)
+    return compressor.stream_writer(open(path, "wb"), closefd=True)
+
+
+class SegmentCompressor:
+    """Compresses rotated log files on a background thread.
+
+    Rotation only renames the active file to a staging name and queues it,
+    so the logging thread never waits for the compression itself. Staging
+    names are unique: a segment whose compression failed is kept there
+    rather than overwritten by the next rotation. Once a
+    segment is compressed, retention removes the oldest compressed
+    segments beyond ``max_count`` files, ``max_total_size`` bytes or older
+    than ``max_age`` seconds.
+    """
+
+    def __init__(
+        self,
+        base_filename: str,
+        method: str = "gzip",
+        level: Optional[int] = None,
+        max_count: Optional[int] = None,
+        max_total_size: Optional[int] = None,
+        max_age: Optional[float] = None,
+    ):
+        if method not in COMPRESSION_SUFFIXES:
+            raise ValueError(
+                f"Unknown compression {method!r}, "
+                f"expected one of {', '.join(COMPRESSION_SUFFIXES)}"
+            )
+        if method == "zstd" and zstandard is None:
+            raise ImportError(
+                "Compression 'zstd' requires zstandard installed"
+            )
+        self.base_filename = os.path.abspath(base_filename)
+        self.method = method
+        self.level = level
+        self.suffix = COMPRESSION_SUFFIXES[method]
+        self.max_count = max_count
+        self.max_total_size = max_total_size
+        self.max_age = max_age
+        self._jobs: "queue.Queue[Optional[Tuple[str, str]]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._thread_lock = threading.Lock()
+
+    def namer(self, name: str) -> str:
+        """Name of the compressed segment, for BaseRotatingHandler.namer."""
+        return name + self.suffix
+
+    def rotate(self, source: str, dest: str) -> None:
+        """Rotator for BaseRotatingHandler: rename now, compress later."""
+        if not os.path.exists(source):
+            return
+        staging = f"{dest[: -len(self.suffix)]}-{time.time_ns()}"
+        os.rename(source, staging)
+        self.submit(staging, dest)
+
+    def submit(self, source: str, dest: str) -> None:
+        """Queue ``source`` to be compressed into ``dest``."""
+        with self._thread_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run,
+                    name=f"logger-kit-compress-"
+                    f"{os.path.basename(self.base_filename)}",
+                )
+                self._thread.daemon = True
+                self._thread.start()
+        self._jobs.put((source, dest))
+
+    def wait(self) -> None:
+        """Block until every queued segment has been compressed."""
+        if self._thread is not None:
+            self._jobs.join()
+
+    def close(self) -> None:
+        """Finish the queued segments and stop the thread."""
+        with self._thread_lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._jobs.put(None)
+            thread.join()
+
+    def _run(self) -> None:
+        while True:
+            job = self._jobs.get()
+            try:
+                if job is None:
+                    return
+                self.compress(*job)
+                self.apply_retention()
+            except Exception:
+                # The uncompressed segment is kept; logging must go on
+                traceback.print_exc(file=sys.stderr)
+            finally:
+                self._jobs.task_done()
+
+    def compress(self, source: str, dest: str) -> None:
+        """Compress ``source`` into ``dest`` and remove ``source``."""
+        partial = dest + ".tmp"
+        with open(source, "rb") as src:
+            with _open_compressed(self.method, partial, self.level) as dst:
+                shutil.copyfileobj(src, dst, 1024 * 1024)
+        # Keep the time of the last record for ordering and max_age
+        stat = os.stat(source)
+        os.utime(partial, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        os.replace(partial, dest)
+        os.remove(source)
+
+    def segments(self) -> List[Tuple[str, os.stat_result]]:
+        """Return the compressed segments, newest first."""
+        directory, base = os.path.split(self.base_filename)
+        prefix = base + "."
+        found: List[Tuple[str, Any]] = []
+        for name in os.listdir(directory):
+            if name.startswith(prefix) and name.endswith(self.suffix):
+                path = os.path.join(directory, name)
+                try:
+                    found.append((path, os.stat(path)))
+                except FileNotFoundError:
+                    continue
+        found.sort(key=lambda item: item[1].st_mtime, reverse=True)
+        return found
+
+    def apply_retention(self) -> None:
+        """Delete the compressed segments beyond the retention limits."""
+        if (
+            self.max_count is None
+            and self.max_total_size is None
+            and self.max_age is None
+        ):
+            return
+        now = time.time()
+        total = 0
+        for index, (path, stat) in enumerate(self.segments()):
+            total += stat.st_size
+            if (
+                (self.max_count is not None and index >= self.max_count)
+                or (
+                    self.max_total_size is not None
+                    and total > self.max_total_size
+                )
+                or (
+                    self.max_age is not None
+                    and now - stat.st_mtime > self.max_age
+                )
+            ):
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
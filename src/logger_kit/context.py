@@ -0,0 +1,114 @@
+import contextvars
+import logging
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .levels import level_number
+
+Fields = Optional[Dict[str, Any]]
+
+
+class LogContext:
+    """Level override and fields in effect for the current task or thread.
+
+    A context is never modified once set: entering a nested scope creates
+    a new one holding its parent's fields merged with its own. Its level
+    answers and its fields merged with the logger's are cached, so records
+    logged within an unchanged context only pay for a ContextVar lookup.
+    """
+
+    __slots__ = ("level", "fields", "_enabled", "_merged")
+
+    def __init__(self, level: Optional[int], fields: Dict[str, Any]):
+        self.level = level
+        self.fields = fields
+        self._enabled: Dict[str, bool] = {}
+        # Logger fields and mask generation of the last merge, and result
+        self._merged: Optional[Tuple[Fields, int, Dict[str, Any]]] = None
+
+    def is_enabled(self, level: str) -> bool:
+        """Return whether ``level`` passes the overridden level."""
+        try:
+            return self._enabled[level]
+        except KeyError:
+            levelno = logging.getLevelName(level)
+            enabled = isinstance(levelno, int) and (
+                levelno >= self.level  # type: ignore[operator]
+            )
+            self._enabled[level] = enabled
+            return enabled
+
+    def merge(
+        self,
+        fields: Fields,
+        generation: int,
+        prepare: Callable[[Dict[str, Any]], Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        """Return ``fields`` updated with the context fields.
+
+        ``prepare`` (masking) is applied to the context fields once per
+        logger fields and mask ``generation``.
+        """
+        merged = self._merged
+        if (
+            merged is None
+            or merged[0] is not fields
+            or merged[1] != generation
+        ):
+            own = prepare(self.fields)
+            merged = (
+                fields,
+                generation,
+                {**fields, **own} if fields else own,
+            )
+            # Tasks sharing this context may race here; both results agree
+            self._merged = merged
+        return merged[2]
+
+
+class ContextScope:
+    """Sets a LogContext for the duration of a ``with`` or ``async with``.
+
+    The context is stored in a ContextVar, so it only applies to the
+    current thread or asyncio task (and tasks created from it), never to
+    concurrent requests served by the same logger.
+    """
+
+    __slots__ = ("_logger", "_var", "_level", "_fields", "_tokens")
+
+    def __init__(
+        self,
+        logger: Any,
+        var: "contextvars.ContextVar[Optional[LogContext]]",
+        level: Optional[str],
+        fields: Dict[str, Any],
+    ):
+        self._logger = logger
+        self._var = var
+        self._level = level_number(level) if level is not None else None
+        self._fields = fields
+        self._tokens: List[contextvars.Token] = []
+
+    def __enter__(self) -> Any:
+        parent = self._var.get()
+        if parent is None:
+            context = LogContext(self._level, self._fields)
+        else:
+            context = LogContext(
+                parent.level if self._level is None else self._level,
+                (
+                    {**parent.fields, **self._fields}
+                    if self._fields
+                    else parent.fields
+                ),
+            )
+        self._tokens.append(self._var.set(context))
+        return self._logger
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._var.reset(self._tokens.pop())
+
+    async def __aenter__(self) -> Any:
+        return self.__enter__()
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        self.__exit__(*exc_info)
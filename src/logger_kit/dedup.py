@@ -0,0 +1,153 @@
+import datetime
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence
+
+# Called with the level, message, extra and fields of each aggregated record
+Emit = Callable[[str, str, Dict[str, Any], Optional[Dict[str, Any]]], None]
+
+
+class _Window:
+    __slots__ = (
+        "start",
+        "first",
+        "last",
+        "count",
+        "level",
+        "message",
+        "extra",
+        "fields",
+    )
+
+    def __init__(
+        self,
+        start: float,
+        level: str,
+        message: str,
+        fields: Optional[Dict[str, Any]],
+    ):
+        self.start = start
+        self.first = time.time()
+        self.last = 0.0
+        self.count = 0
+        self.level = level
+        self.message = message
+        self.extra: Optional[Dict[str, Any]] = None
+        self.fields = fields
+
+
+def _isoformat(timestamp: float) -> str:
+    return datetime.datetime.fromtimestamp(
+        timestamp, datetime.timezone.utc
+    ).isoformat()
+
+
+class Deduplicator:
+    """Collapses repeated records into one record per time window.
+
+    Records are fingerprinted by level, message and the values of the
+    ``keys`` of their extra. The first record of a fingerprint is logged
+    right away and opens a ``window`` seconds long; repeats within it are
+    only counted. Once the window is over, a single record with the last
+    repeat's extra plus ``repeat_count``, ``first_seen`` (the time of the
+    first record) and ``last_seen`` stands for all of them, with the
+    ``fields`` the first record was checked with. It is emitted
+    just before the next record logged after the window ends, or when the
+    logger is flushed or closed. Up to
+    ``max_entries`` recent fingerprints are tracked; evicting one emits
+    its pending aggregate early.
+    """
+
+    def __init__(
+        self,
+        window: float = 1.0,
+        keys: Sequence[str] = (),
+        max_entries: int = 1024,
+    ):
+        self.window = window
+        self.keys = tuple(keys)
+        self.max_entries = max_entries
+        self.suppressed = 0
+        self._windows: "OrderedDict[Hashable, _Window]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def fingerprint(
+        self, level: str, message: str, extra: Optional[Dict[str, Any]]
+    ) -> Hashable:
+        if not self.keys or not extra:
+            return (level, message)
+        values = tuple(extra.get(key) for key in self.keys)
+        try:
+            hash(values)
+        except TypeError:
+            values = tuple(map(repr, values))  # type: ignore[assignment]
+        return (level, message, values)
+
+    def check(
+        self,
+        level: str,
+        message: str,
+        extra: Optional[Dict[str, Any]],
+        emit: Emit,
+        fields: Optional[Dict[str, Any]] = None,
+    ) -> bool:
+        """Return whether the record should be logged now.
+
+        Aggregates of windows that have ended are passed to ``emit``.
+        """
+        now = time.monotonic()
+        key = self.fingerprint(level, message, extra)
+        with self._lock:
+            windows = self._windows
+            expired = self._pop_expired(now)
+            window = windows.get(key)
+            if window is not None:
+                # Still open, as expired windows were just removed
+                window.last = time.time()
+                window.count += 1
+                window.extra = extra
+                self.suppressed += 1
+            else:
+                windows[key] = _Window(now, level, message, fields)
+                if len(windows) > self.max_entries:
+                    expired.append(windows.popitem(last=False)[1])
+        for old in expired:
+            self._emit_aggregate(old, emit)
+        return window is None
+
+    def flush_expired(self, emit: Emit) -> None:
+        """Emit the aggregates of the windows that have ended."""
+        with self._lock:
+            expired = self._pop_expired(time.monotonic())
+        for window in expired:
+            self._emit_aggregate(window, emit)
+
+    def flush(self, emit: Emit) -> None:
+        """Emit the aggregates of every open window."""
+        with self._lock:
+            windows = list(self._windows.values())
+            self._windows.clear()
+        for window in windows:
+            self._emit_aggregate(window, emit)
+
+    def _pop_expired(self, now: float) -> List[_Window]:
+        # Windows are kept in the order they were opened
+        windows = self._windows
+        expired = []
+        while windows:
+            window = next(iter(windows.values()))
+            if now - window.start < self.window:
+                break
+            expired.append(windows.popitem(last=False)[1])
+        return expired
+
+    @staticmethod
+    def _emit_aggregate(window: _Window, emit: Emit) -> None:
+        if not window.count:
+            return
+        extra = dict(window.extra or {})
+        extra["repeat_count"] = window.count
+        extra["first_seen"] = _isoformat(window.first)
+        extra["last_seen"] = _isoformat(window.last)
+        emit(window.level, window.message, extra, window.fields)
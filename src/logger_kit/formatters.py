@@ -0,0 +1,316 @@
+import json
+import logging
+import threading
+import time
+from itertools import islice
+from typing import Any, Dict, FrozenSet, Iterable, Optional, Tuple, Union
+
+from pythonjsonlogger.core import RESERVED_ATTRS
+from pythonjsonlogger.json import JsonFormatter as BaseJsonFormatter
+
+from .records import COMPACT_FIELDS, CompactRecord
+from .serializers import (
+    DumpsSerializer,
+    Serializer,
+    get_serializer,
+    json_default,
+)
+
+
+# ``record`` is set while a logger-kit logger passes one CompactRecord to
+# its handlers, and ``log_record`` once it was converted for some of them.
+# Only then do formatters reuse the output of the previous handler for the
+# same record; formatting a record again at any other time, possibly after
+# changing it, gives fresh output.
+class _FanOut(threading.local):
+    record: Optional[CompactRecord] = None
+    log_record: Optional[logging.LogRecord] = None
+
+    def source(self, record: Any) -> Optional[CompactRecord]:
+        """Return the record ``record`` is a form of, if fanning out."""
+        source = self.record
+        if source is not None and (
+            record is source or record is self.log_record
+        ):
+            return source
+        return None
+
+
+fan_out = _FanOut()
+
+
+class JsonFormatter(BaseJsonFormatter):
+    """JsonFormatter that serializes through a pluggable JSON backend.
+
+    ``serializer`` is a backend name from logger_kit.serializers or a
+    Serializer instance; the default picks the fastest installed one.
+    Handlers that write bytes can call format_bytes() and skip the
+    intermediate ``str`` entirely. Handlers sharing the formatter encode
+    each record logged through BaseLogger only once (see ``fan_out``).
+
+    The ``json_default``, ``json_encoder``, ``json_serializer``,
+    ``json_indent`` and ``json_ensure_ascii`` options of python-json-logger
+    select a serializer calling ``json_serializer`` (``json.dumps`` by
+    default) with them, which rules out the other backends.
+
+    Unless the python-json-logger options or a subclass add fields,
+    CompactRecords are formatted by an equivalent RecordFormatter.
+    """
+
+    def __init__(
+        self,
+        *args: Any,
+        serializer: Union[str, Serializer] = "auto",
+        **kwargs: Any,
+    ):
+        super().__init__(*args, **kwargs)
+        if _customizes_json(kwargs):
+            if serializer not in ("auto", "stdlib"):
+                raise ValueError(
+                    "The json_* options need the stdlib serializer, "
+                    f"not {serializer!r}"
+                )
+            default, encoder = self.json_default, self.json_encoder
+            if default is None and kwargs.get("json_encoder") is None:
+                # Convert values like the backends do, not like JsonEncoder
+                default, encoder = json_default, None
+            self.serializer: Serializer = DumpsSerializer(
+                self.json_serializer,
+                default=default,
+                encoder=encoder,
+                indent=self.json_indent,
+                ensure_ascii=kwargs.get("json_ensure_ascii", False),
+            )
+        else:
+            self.serializer = get_serializer(serializer)
+        self._prefix_bytes = self.prefix.encode("utf-8")
+        # Last record formatted and its output, see format_bytes()
+        self._last: Tuple[Optional[CompactRecord], bytes] = (None, b"")
+        self._compact: Optional[RecordFormatter] = None
+        if (
+            type(self) is JsonFormatter
+            and not self.static_fields
+            and not self.defaults
+            and not self.timestamp
+            and not self.rename_fields_keep_missing
+            and self.reserved_attrs == set(RESERVED_ATTRS)
+            and COMPACT_FIELDS.issuperset(self._required_fields)
+        ):
+            self._compact = RecordFormatter(
+                fields=self._required_fields,
+                rename_fields=self.rename_fields,
+                datefmt=self.datefmt,
+                serializer=self.serializer,
+            )
+        self.accepts_compact = self._compact is not None
+
+    def _build_log_record(self, record: logging.LogRecord) -> Dict[str, Any]:
+        """Collect the fields of ``record`` into the dict to serialize."""
+        if type(record) is CompactRecord:
+            return self._compact._build_log_record(  # type: ignore
+                record
+            )
+        message_dict: Dict[str, Any] = {}
+        if isinstance(record.msg, dict):
+            message_dict = dict(record.msg)
+            record.message = ""
+        else:
+            record.message = record.getMessage()
+
+        if "asctime" in self._required_fields:
+            record.asctime = self.formatTime(record, self.datefmt)
+
+        if record.exc_info and not message_dict.get("exc_info"):
+            message_dict["exc_info"] = self.formatException(record.exc_info)
+        if not message_dict.get("exc_info") and record.exc_text:
+            message_dict["exc_info"] = record.exc_text
+        if record.stack_info and not message_dict.get("stack_info"):
+            message_dict["stack_info"] = self.formatStack(record.stack_info)
+
+        log_record: Dict[str, Any] = {}
+        self.add_fields(log_record, record, message_dict)
+        return self.process_log_record(log_record)
+
+    def format_bytes(self, record: logging.LogRecord) -> bytes:
+        """Format ``record`` as UTF-8 encoded JSON."""
+        source = fan_out.source(record)
+        last = self._last
+        if source is not None and last[0] is source:
+            return last[1]
+        log_record = self._build_log_record(record)
+        data = self._prefix_bytes + self.serializer.dumps(log_record)
+        # One tuple so concurrent threads never see a torn pair
+        self._last = (source, data)
+        return data
+
+    def format(self, record: logging.LogRecord) -> str:
+        return self.format_bytes(record).decode("utf-8")
+
+    def jsonify_log_record(self, log_record: Dict[str, Any]) -> str:
+        return self.serializer.dumps(log_record).decode("utf-8")
+
+
+# Attributes every stdlib LogRecord receives in __init__. Anything stored
+# after them was added through ``extra`` or by filters.
+_RECORD_ATTR_COUNT = len(
+    logging.LogRecord("", logging.INFO, "", 0, "", (), None).__dict__
+)
+# Attributes other formatters may have set on the record since
+_FORMATTER_ATTRS = frozenset(("message", "asctime"))
+_NO_ATTRS: FrozenSet[str] = frozenset()
+
+DEFAULT_FIELDS = ("asctime", "name", "levelname", "message")
+
+
+class RecordFormatter(logging.Formatter):
+    """Fast JSON formatter with a layout fixed at construction.
+
+    Produces the same documents as the default JsonFormatter but avoids
+    its per-record work: the field layout is computed once, the timestamp
+    is rendered once per second with only the milliseconds appended, and
+    extras are read from the end of the record's ``__dict__`` instead of
+    filtering every attribute against a reserved list. Like JsonFormatter
+    it formats a record once for all the handlers sharing it.
+    """
+
+    def __init__(
+        self,
+        fields: Iterable[str] = DEFAULT_FIELDS,
+        rename_fields: Optional[Dict[str, str]] = None,
+        datefmt: Optional[str] = None,
+        serializer: Union[str, Serializer] = "auto",
+    ):
+        super().__init__(datefmt=datefmt)
+        rename_fields = rename_fields or {}
+        self.fields = tuple(fields)
+        self.rename_fields = rename_fields
+        self.serializer = get_serializer(serializer)
+        self._layout: Tuple[Tuple[str, str], ...] = tuple(
+            (field, rename_fields.get(field, field)) for field in self.fields
+        )
+        self._extra_renames = {
+            key: value
+            for key, value in rename_fields.items()
+            if key not in self.fields
+        }
+        self._time_format = datefmt or self.default_time_format
+        self._append_msecs = datefmt is None
+        self._time_cache: Tuple[int, str] = (-1, "")
+        self._last: Tuple[Optional[CompactRecord], bytes] = (None, b"")
+        self.accepts_compact = (
+            type(self)._build_log_record is RecordFormatter._build_log_record
+            and COMPACT_FIELDS.issuperset(self.fields)
+        )
+
+    def _asctime(self, record: logging.LogRecord) -> str:
+        second = int(record.created)
+        cached_second, text = self._time_cache
+        if second != cached_second:
+            text = time.strftime(self._time_format, self.converter(second))
+            self._time_cache = (second, text)
+        msec_format = self.default_msec_format
+        if self._append_msecs and msec_format:
+            return msec_format % (text, record.msecs)
+        return text
+
+    def _build_log_record(self, record: logging.LogRecord) -> Dict[str, Any]:
+        msg = record.msg
+        message = "" if isinstance(msg, dict) else record.getMessage()
+        log_record: Dict[str, Any] = {}
+        for field, key in self._layout:
+            if field == "message":
+                log_record[key] = message
+            elif field == "asctime":
+                log_record[key] = self._asctime(record)
+            else:
+                log_record[key] = getattr(record, field, None)
+        if isinstance(msg, dict):
+            log_record.update(msg)
+
+        renames = self._extra_renames
+        extras: Iterable[Tuple[str, Any]]
+        if type(record) is CompactRecord:
+            extras = record.extra.items() if record.extra else ()
+            skip = _NO_ATTRS
+        else:
+            extras = islice(record.__dict__.items(), _RECORD_ATTR_COUNT, None)
+            skip = _FORMATTER_ATTRS
+        for key, value in extras:
+            if key not in skip:
+                log_record[renames.get(key, key) if renames else key] = value
+
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            log_record["exc_info"] = record.exc_text
+        if record.stack_info:
+            log_record["stack_info"] = self.formatStack(record.stack_info)
+        return log_record
+
+    def format_bytes(self, record: logging.LogRecord) -> bytes:
+        """Format ``record`` as UTF-8 encoded JSON."""
+        source = fan_out.source(record)
+        last = self._last
+        if source is not None and last[0] is source:
+            return last[1]
+        data = self.serializer.dumps(self._build_log_record(record))
+        self._last = (source, data)
+        return data
+
+    def format(self, record: logging.LogRecord) -> str:
+        return self.format_bytes(record).decode("utf-8")
+
+
+def _customizes_json(options: Dict[str, Any]) -> bool:
+    """Return whether python-json-logger ``options`` change the output."""
+    return (
+        options.get("json_default") is not None
+        or options.get("json_encoder") is not None
+        or options.get("json_serializer", json.dumps) is not json.dumps
+        or options.get("json_indent") is not None
+        or bool(options.get("json_ensure_ascii", False))
+    )
+
+
+def build_formatter(
+    formatter: Union[str, logging.Formatter] = "json",
+    serializer: Union[str, Serializer] = "auto",
+) -> logging.Formatter:
+    """Return the formatter named ``"json"`` or ``"fast"``.
+
+    Formatter instances are returned unchanged.
+    """
+    if formatter == "json":
+        return JsonFormatter(
+            fmt="%(asctime)s %(name)s %(levelname)s %(message)s",
+            json_ensure_ascii=False,
+            rename_fields={"message": "@message"},
+            serializer=serializer,
+        )
+    if formatter == "fast":
+        return RecordFormatter(
+            rename_fields={"message": "@message"},
+            serializer=serializer,
+        )
+    if isinstance(formatter, str):
+        raise ValueError(
+            f"Unknown formatter {formatter!r}, expected json or fast"
+        )
+    return formatter
+
+
+def format_bytes(
+    formatter: Optional[logging.Formatter],
+    record: logging.LogRecord,
+    encoding: str = "utf-8",
+) -> bytes:
+    """Format ``record`` to bytes, natively when the formatter supports it."""
+    if formatter is None:
+        formatter = _default_formatter
+    native = getattr(formatter, "format_bytes", None)
+    if native is not None and encoding == "utf-8":
+        return native(record)
+    return formatter.format(record).encode(encoding, errors="replace")
+
+
+_default_formatter = logging.Formatter()
@@ -1,7 +1,728 @@
+import asyncio
+import codecs
+import functools
 import logging
 import logging.handlers
+import os
+import sys
+import threading
+import time
+import weakref
 from pathlib import Path
-from typing import Optional
+from typing import IO, Any, Callable, Dict, Optional
+
+import aiofiles.os
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None  # type: ignore[assignment]
+
+from .compression import SegmentCompressor
+from .formatters import format_bytes
+from .ringbuffer import RingBuffer
+from .shipping import NDJSONShippingHandler
+from .syslog import BatchingSysLogHandler
+
+
+def _shift_backups(
+    filename: str,
+    backup_count: int,
+    suffix: str = "",
+    rotate: Callable[[str, str], None] = os.replace,
+) -> None:
+    """Rotate ``filename`` to ``filename.1``, shifting older backups up.
+
+    ``suffix`` is the extension of the backups, and ``rotate`` moves the
+    active file to the first one.
+    """
+    if backup_count > 0:
+        for index in range(backup_count - 1, 0, -1):
+            source = f"{filename}.{index}{suffix}"
+            if os.path.exists(source):
+                os.replace(source, f"{filename}.{index + 1}{suffix}")
+        rotate(filename, f"{filename}.1{suffix}")
+    else:
+        os.remove(filename)
+
+
+def _check_retention(
+    compression: Optional[str],
+    max_total_size: Optional[int],
+    max_age: Optional[float],
+) -> None:
+    if compression is None and (
+        max_total_size is not None or max_age is not None
+    ):
+        raise ValueError("max_total_size and max_age require compression")
+
+
+class BytesStreamHandler(logging.StreamHandler):
+    """StreamHandler writing formatted bytes to the stream's buffer.
+
+    With a formatter that provides format_bytes() the record goes from
+    JSON serializer to the binary buffer of a UTF-8 stream without being
+    decoded to ``str`` first; the terminator still goes through the text
+    layer and its newline translation. Streams without a ``buffer`` or
+    with another encoding, and records spanning several lines, are
+    written as text.
+    """
+
+    accepts_compact = True
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            stream = self.stream
+            buffer = getattr(stream, "buffer", None)
+            data = format_bytes(self.formatter, record)
+            if (
+                buffer is None
+                or b"\n" in data
+                or not _is_utf8(getattr(stream, "encoding", None))
+            ):
+                stream.write(data.decode("utf-8") + self.terminator)
+            else:
+                # Push out text written by others before our bytes
+                stream.flush()
+                buffer.write(data)
+                stream.write(self.terminator)
+            self.flush()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+
+@functools.lru_cache(maxsize=None)
+def _is_utf8(encoding: Optional[str]) -> bool:
+    if encoding is None:
+        return False
+    try:
+        return codecs.lookup(encoding).name == "utf-8"
+    except LookupError:
+        return False
+
+
+class ConsoleHandler(BytesStreamHandler):
+    """Console handler that BaseLogger attaches to its stdlib logger.
+
+    A logger built again under the same name replaces it rather than
+    adding a second one, so output is never duplicated.
+    """
+
+
+class StreamHandler:
+    def __init__(self, stream: Optional[IO[str]] = None):
+        self.handler = BytesStreamHandler(stream or sys.stderr)
+
+    def get_handler(self) -> logging.Handler:
+        return self.handler
+
+
+class BatchingFileHandler(logging.Handler):
+    """File handler that writes records in large batches.
+
+    Encoded records are collected in a buffer that is written with a
+    single ``os.write`` once it holds ``buffer_size`` bytes, once
+    ``flush_interval`` seconds have passed since the last write, or as
+    soon as a record at ``flush_level`` or above arrives.
+
+    Crash safety: records are in process memory until written, so a hard
+    crash (SIGKILL, power loss, interpreter abort) loses at most
+    ``buffer_size`` bytes or ``flush_interval`` seconds of records below
+    ``flush_level``. flush(), close() and logging.shutdown() at normal
+    interpreter exit write everything out. Written data is handed to the
+    OS but not fsync'ed.
+    """
+
+    accepts_compact = True
+
+    def __init__(
+        self,
+        filename: str,
+        mode: str = "a",
+        encoding: str = "utf-8",
+        buffer_size: int = 65536,
+        flush_interval: Optional[float] = 1.0,
+        flush_level: int = logging.ERROR,
+    ):
+        super().__init__()
+        self.baseFilename = os.path.abspath(filename)
+        self.mode = mode
+        self.encoding = encoding
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self.flush_level = flush_level
+        self.buffer = bytearray()
+        self.fd = self._open(truncate="w" in mode)
+        self._last_write = time.monotonic()
+        self._start_flusher()
+
+    def _start_flusher(self) -> None:
+        self._stopped = threading.Event()
+        if self.flush_interval:
+            # Writes out idle buffers; emit() only notices the interval
+            # when another record arrives.
+            name = os.path.basename(self.baseFilename)
+            flusher = threading.Thread(
+                target=self._flush_periodically,
+                args=(self.flush_interval,),
+                name=f"logger-kit-flush-{name}",
+            )
+            flusher.daemon = True
+            flusher.start()
+
+    def _open(self, truncate: bool = False) -> int:
+        flags = os.O_WRONLY | os.O_CREAT | os.O_APPEND
+        if truncate:
+            flags |= os.O_TRUNC
+        return os.open(self.baseFilename, flags, 0o644)
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self.buffer += format_bytes(self.formatter, record, self.encoding)
+            self.buffer += b"\n"
+            if (
+                len(self.buffer) >= self.buffer_size
+                or record.levelno >= self.flush_level
+                or (
+                    self.flush_interval is not None
+                    and time.monotonic() - self._last_write
+                    >= self.flush_interval
+                )
+            ):
+                self._write_buffer()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+    def _write_buffer(self) -> None:
+        """Write the buffer out; the handler lock must be held."""
+        self._last_write = time.monotonic()
+        if not self.buffer or self.fd < 0:
+            return
+        data = bytes(self.buffer)
+        self.buffer.clear()
+        self._write(data)
+
+    def _write(self, data: bytes) -> None:
+        view = memoryview(data)
+        while view:
+            written = os.write(self.fd, view)
+            view = view[written:]
+
+    def _flush_periodically(self, interval: float) -> None:
+        while not self._stopped.wait(interval):
+            if time.monotonic() - self._last_write >= interval:
+                self.flush()
+
+    def flush(self) -> None:
+        """Write out all buffered records."""
+        self.acquire()
+        try:
+            self._write_buffer()
+        finally:
+            self.release()
+
+    def close(self) -> None:
+        self.acquire()
+        try:
+            try:
+                self._write_buffer()
+            finally:
+                self._stopped.set()
+                if self.fd >= 0:
+                    os.close(self.fd)
+                    self.fd = -1
+                super().close()
+        finally:
+            self.release()
+
+
+class BatchingRotatingFileHandler(BatchingFileHandler):
+    """BatchingFileHandler that rotates files like RotatingFileHandler.
+
+    The size check happens per batch: a batch that would push the file
+    past ``max_bytes`` is written to a fresh file instead, so a file can
+    only exceed ``max_bytes`` when a single batch is larger than that.
+
+    With ``compression`` set, rotated files are compressed in the
+    background as described in CompressingRotatingFileHandler.
+    """
+
+    def __init__(
+        self,
+        filename: str,
+        max_bytes: int = 10485760,
+        backup_count: int = 5,
+        encoding: str = "utf-8",
+        buffer_size: int = 65536,
+        flush_interval: Optional[float] = 1.0,
+        flush_level: int = logging.ERROR,
+        compression: Optional[str] = None,
+        compression_level: Optional[int] = None,
+        max_total_size: Optional[int] = None,
+        max_age: Optional[float] = None,
+    ):
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        _check_retention(compression, max_total_size, max_age)
+        self.compressor: Optional[SegmentCompressor] = None
+        if compression is not None:
+            self.compressor = SegmentCompressor(
+                filename,
+                compression,
+                compression_level,
+                max_total_size=max_total_size,
+                max_age=max_age,
+            )
+        super().__init__(
+            filename,
+            "a",
+            encoding,
+            buffer_size,
+            flush_interval,
+            flush_level,
+        )
+        self.size = os.fstat(self.fd).st_size
+
+    def _write(self, data: bytes) -> None:
+        if (
+            self.max_bytes > 0
+            and self.size > 0
+            and self.size + len(data) > self.max_bytes
+        ):
+            self.do_rollover()
+        super()._write(data)
+        self.size += len(data)
+
+    def do_rollover(self) -> None:
+        """Shift backups up by one and start a new file."""
+        os.close(self.fd)
+        compressor = self.compressor
+        if compressor is None:
+            _shift_backups(self.baseFilename, self.backup_count)
+        else:
+            # The previous segment must be in place before it is shifted
+            compressor.wait()
+            _shift_backups(
+                self.baseFilename,
+                self.backup_count,
+                compressor.suffix,
+                compressor.rotate,
+            )
+        self.fd = self._open()
+        self.size = 0
+
+    def close(self) -> None:
+        try:
+            super().close()
+        finally:
+            if self.compressor is not None:
+                self.compressor.close()
+
+
+class CompressingRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """RotatingFileHandler compressing rotated files in the background.
+
+    A rollover only renames the active file; a SegmentCompressor thread
+    then compresses it to ``<filename>.1.gz`` (or .bz2, .xz, .zst) and
+    applies the size and age retention. The next rollover waits for that
+    compression before shifting the backups, which only stalls logging
+    when files rotate faster than they can be compressed.
+    """
+
+    def __init__(
+        self,
+        filename: str,
+        max_bytes: int = 10485760,
+        backup_count: int = 5,
+        encoding: str = "utf-8",
+        compression: str = "gzip",
+        compression_level: Optional[int] = None,
+        max_total_size: Optional[int] = None,
+        max_age: Optional[float] = None,
+    ):
+        super().__init__(
+            filename,
+            maxBytes=max_bytes,
+            backupCount=backup_count,
+            encoding=encoding,
+        )
+        self.compressor = SegmentCompressor(
+            self.baseFilename,
+            compression,
+            compression_level,
+            max_total_size=max_total_size,
+            max_age=max_age,
+        )
+        self.namer = self.compressor.namer
+        self.rotator = self.compressor.rotate
+
+    def doRollover(self) -> None:
+        self.compressor.wait()
+        super().doRollover()
+
+    def close(self) -> None:
+        try:
+            super().close()
+        finally:
+            self.compressor.close()
+
+
+class CompressingTimedRotatingFileHandler(
+    logging.handlers.TimedRotatingFileHandler
+):
+    """TimedRotatingFileHandler compressing rotated files in the background.
+
+    Old segments are removed by the compressor thread rather than by the
+    standard clean-up, which could pick up a segment still being
+    compressed; ``backup_count`` keeps the same meaning.
+    """
+
+    def __init__(
+        self,
+        filename: str,
+        when: str = "midnight",
+        interval: int = 1,
+        backup_count: int = 7,
+        encoding: str = "utf-8",
+        compression: str = "gzip",
+        compression_level: Optional[int] = None,
+        max_total_size: Optional[int] = None,
+        max_age: Optional[float] = None,
+    ):
+        super().__init__(
+            filename,
+            when=when,
+            interval=interval,
+            backupCount=0,
+            encoding=encoding,
+        )
+        self.compressor = SegmentCompressor(
+            self.baseFilename,
+            compression,
+            compression_level,
+            max_count=backup_count or None,
+            max_total_size=max_total_size,
+            max_age=max_age,
+        )
+        self.namer = self.compressor.namer
+        self.rotator = self.compressor.rotate
+
+    def close(self) -> None:
+        try:
+            super().close()
+        finally:
+            self.compressor.close()
+
+
+class SharedRotatingFileHandler(BatchingRotatingFileHandler):
+    """BatchingRotatingFileHandler that several processes can share.
+
+    Every batch is written under an exclusive ``flock`` on
+    ``<filename>.lock`` with a single O_APPEND write, so batches from
+    different processes never interleave and each process keeps its own
+    record order. The rotation check uses the real size of the file, and
+    a process that finds the file already rotated by another one reopens
+    it instead of rotating again. A forked child reopens both files and
+    drops the records it inherited unwritten, which stay the parent's.
+    Requires a POSIX system.
+    """
+
+    def __init__(
+        self,
+        filename: str,
+        max_bytes: int = 10485760,
+        backup_count: int = 5,
+        encoding: str = "utf-8",
+        buffer_size: int = 65536,
+        flush_interval: Optional[float] = 1.0,
+        flush_level: int = logging.ERROR,
+    ):
+        if fcntl is None:
+            raise RuntimeError("SharedRotatingFileHandler requires fcntl")
+        # Opened first: the flush thread started by the base class may
+        # already write.
+        self.lock_fd = os.open(
+            f"{os.path.abspath(filename)}.lock", os.O_RDWR | os.O_CREAT, 0o644
+        )
+        super().__init__(
+            filename,
+            max_bytes,
+            backup_count,
+            encoding,
+            buffer_size,
+            flush_interval,
+            flush_level,
+        )
+        _shared_handlers.add(self)
+
+    def _after_fork(self) -> None:
+        """Give a forked child its own file descriptions and buffer.
+
+        Descriptors inherited across fork share one open file description,
+        and so one flock, with the parent's.
+        """
+        if self.fd < 0:
+            return
+        os.close(self.lock_fd)
+        self.lock_fd = os.open(
+            f"{self.baseFilename}.lock", os.O_RDWR | os.O_CREAT, 0o644
+        )
+        os.close(self.fd)
+        self.fd = self._open()
+        self.buffer.clear()
+        self._start_flusher()
+
+    def _write(self, data: bytes) -> None:
+        fcntl.flock(self.lock_fd, fcntl.LOCK_EX)
+        try:
+            self._reopen_if_rotated()
+            self.size = os.fstat(self.fd).st_size
+            super()._write(data)
+        finally:
+            fcntl.flock(self.lock_fd, fcntl.LOCK_UN)
+
+    def _reopen_if_rotated(self) -> None:
+        """Reopen the file if another process rotated it away."""
+        try:
+            current = os.stat(self.baseFilename)
+        except FileNotFoundError:
+            current = None
+        opened = os.fstat(self.fd)
+        if current is None or (current.st_ino, current.st_dev) != (
+            opened.st_ino,
+            opened.st_dev,
+        ):
+            os.close(self.fd)
+            self.fd = self._open()
+
+    def close(self) -> None:
+        self.acquire()
+        try:
+            try:
+                super().close()
+            finally:
+                if self.lock_fd >= 0:
+                    os.close(self.lock_fd)
+                    self.lock_fd = -1
+        finally:
+            self.release()
+
+
+_shared_handlers: "weakref.WeakSet[SharedRotatingFileHandler]" = (
+    weakref.WeakSet()
+)
+
+
+def _reopen_shared_handlers() -> None:
+    for handler in list(_shared_handlers):
+        handler._after_fork()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reopen_shared_handlers)
+
+
+class MmapRingHandler(logging.Handler):
+    """Handler writing records into a memory-mapped ring buffer file.
+
+    Logging a record costs its encoding plus a copy into the mapping; the
+    oldest records are overwritten once the buffer is full. Records are
+    kept by the OS if the process crashes and can be read back with
+    ``python -m logger_kit.ringbuffer``.
+    """
+
+    accepts_compact = True
+
+    def __init__(self, filename: str, capacity: int = 16 * 1024 * 1024):
+        super().__init__()
+        self.baseFilename = os.path.abspath(filename)
+        self.ring = RingBuffer(filename, capacity)
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self.ring.write(format_bytes(self.formatter, record))
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+    def flush(self) -> None:
+        """Ask the OS to write the mapping to disk."""
+        self.acquire()
+        try:
+            self.ring.flush()
+        finally:
+            self.release()
+
+    def close(self) -> None:
+        self.acquire()
+        try:
+            self.ring.close()
+        finally:
+            try:
+                super().close()
+            finally:
+                self.release()
+
+
+class AiofilesFileHandler(logging.Handler):
+    """File handler whose writes run off the event loop through aiofiles.
+
+    emit() never touches the file: it appends the encoded record to a
+    pending buffer and makes sure a writer task runs on the event loop.
+    That task writes everything that accumulated between its awaits in
+    one executor call, so a burst costs one hop per batch rather than per
+    record. Records emitted while no event loop is running, and those
+    pending when flush() or close() is called, are written synchronously
+    from the calling thread.
+
+    The batch goes to a plain file object through ``aiofiles.os.wrap``
+    rather than through ``aiofiles.open`` on purpose. An aiofiles file
+    takes one executor hop per write and per flush and is only usable
+    from a coroutine, while flush(), close() and loop-less emits must
+    write the same file synchronously from any thread. One wrapped call
+    per batch does the write, the flush and, when rotating, the rotation.
+    """
+
+    accepts_compact = True
+
+    def __init__(self, filename: str, encoding: str = "utf-8"):
+        super().__init__()
+        self.baseFilename = os.path.abspath(filename)
+        self.encoding = encoding
+        self._pending = bytearray()
+        self._pending_lock = threading.Lock()
+        # Held while a batch is taken and written, so batches written
+        # from different threads keep their order.
+        self._write_lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional["asyncio.Task[None]"] = None
+        self._stream: Optional[IO[bytes]] = None
+        self._write_off_loop = aiofiles.os.wrap(self._write_pending_sync)
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            data = format_bytes(self.formatter, record, self.encoding)
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+            return
+        with self._pending_lock:
+            self._pending += data
+            self._pending += b"\n"
+        self._schedule()
+
+    def _schedule(self) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        if loop is not None:
+            self._loop = loop
+            self._start_writer()
+            return
+        loop = self._loop
+        if loop is not None and loop.is_running():
+            try:
+                loop.call_soon_threadsafe(self._start_writer)
+                return
+            except RuntimeError:
+                # The loop stopped in the meantime
+                pass
+        self._write_pending_sync()
+
+    def _start_writer(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = self._loop.create_task(  # type: ignore[union-attr]
+                self._drain()
+            )
+
+    def _take_pending(self) -> bytes:
+        with self._pending_lock:
+            data = bytes(self._pending)
+            self._pending.clear()
+            return data
+
+    async def _drain(self) -> None:
+        while self._pending:
+            await self._write_off_loop()
+
+    def _write_pending_sync(self) -> None:
+        with self._write_lock:
+            data = self._take_pending()
+            if data:
+                self._write_sync(data)
+
+    def _write_sync(self, data: bytes) -> None:
+        if self._stream is None:
+            self._stream = open(self.baseFilename, "ab")
+        self._stream.write(data)
+        self._stream.flush()
+
+    async def aflush(self) -> None:
+        """Await until every emitted record has been written."""
+        self._loop = asyncio.get_running_loop()
+        while True:
+            self._start_writer()
+            await self._task  # type: ignore[misc]
+            if not self._pending:
+                return
+
+    def flush(self) -> None:
+        """Write pending records from the calling thread."""
+        self._write_pending_sync()
+
+    def close(self) -> None:
+        try:
+            self._write_pending_sync()
+        finally:
+            with self._write_lock:
+                if self._stream is not None:
+                    self._stream.close()
+                    self._stream = None
+            super().close()
+
+
+class AiofilesRotatingFileHandler(AiofilesFileHandler):
+    """AiofilesFileHandler rotating the file once it reaches max_bytes.
+
+    Rotation happens after the batch that crossed the limit, in the same
+    executor call as the write, so the event loop never waits on it.
+    """
+
+    def __init__(
+        self,
+        filename: str,
+        max_bytes: int = 10485760,
+        backup_count: int = 5,
+        encoding: str = "utf-8",
+    ):
+        super().__init__(filename, encoding)
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        try:
+            self.size = os.path.getsize(self.baseFilename)
+        except OSError:
+            self.size = 0
+
+    def _write_sync(self, data: bytes) -> None:
+        super()._write_sync(data)
+        self.size += len(data)
+        if self.max_bytes > 0 and self.size >= self.max_bytes:
+            stream = self._stream
+            self._stream = None
+            self._rotate(stream)
+
+    def _rotate(self, stream: Optional[IO[bytes]]) -> None:
+        if stream is not None:
+            stream.close()
+        _shift_backups(self.baseFilename, self.backup_count)
+        self.size = 0
 
 
 class FileHandler:
@@ -10,10 +731,24 @@ class FileHandler:
         filename: str,
         mode: str = "a",
         encoding: str = "utf-8",
+        buffer_size: int = 0,
+        flush_interval: Optional[float] = 1.0,
+        flush_level: int = logging.ERROR,
     ):
         path = Path(filename)
         path.parent.mkdir(parents=True, exist_ok=True)
-        self.handler = logging.FileHandler(filename, mode, encoding)
+        self.handler: logging.Handler
+        if buffer_size > 0:
+            self.handler = BatchingFileHandler(
+                filename,
+                mode,
+                encoding,
+                buffer_size,
+                flush_interval,
+                flush_level,
+            )
+        else:
+            self.handler = logging.FileHandler(filename, mode, encoding)
 
     def get_handler(self) -> logging.Handler:
         return self.handler
@@ -22,14 +757,33 @@ class FileHandler:
 class SysLogHandler:
     def __init__(
         self,
-        address: Optional[tuple] = None,
+        address: Optional[Any] = None,
         facility: int = logging.handlers.SysLogHandler.LOG_USER,
+        transport: Optional[str] = None,
+        app_name: Optional[str] = None,
+        capacity: int = 10000,
+        overflow: str = "drop_oldest",
+        batch_size: int = 256,
     ):
+        self.handler: logging.Handler
+        if transport is None:
+            if address is None:
+                # Default to local syslog
+                address = ("localhost", 514)
+            self.handler = logging.handlers.SysLogHandler(
+                address=address, facility=facility
+            )
+            return
         if address is None:
-            # Default to local syslog
-            address = ("localhost", 514)
-        self.handler = logging.handlers.SysLogHandler(
-            address=address, facility=facility
+            address = "/dev/log" if transport == "unix" else ("localhost", 514)
+        self.handler = BatchingSysLogHandler(
+            address,
+            facility,
+            transport,
+            app_name=app_name,
+            capacity=capacity,
+            overflow=overflow,
+            batch_size=batch_size,
         )
 
     def get_handler(self) -> logging.Handler:
@@ -43,15 +797,66 @@ class RotatingFileHandler:
         max_bytes: int = 10485760,
         backup_count: int = 5,
         encoding: str = "utf-8",
+        buffer_size: int = 0,
+        flush_interval: Optional[float] = 1.0,
+        flush_level: int = logging.ERROR,
+        multiprocess: bool = False,
+        compression: Optional[str] = None,
+        compression_level: Optional[int] = None,
+        max_total_size: Optional[int] = None,
+        max_age: Optional[float] = None,
     ):
         path = Path(filename)
         path.parent.mkdir(parents=True, exist_ok=True)
-        self.handler = logging.handlers.RotatingFileHandler(
-            filename,
-            maxBytes=max_bytes,
-            backupCount=backup_count,
-            encoding=encoding,
-        )
+        self.handler: logging.Handler
+        _check_retention(compression, max_total_size, max_age)
+        compression_options: Dict[str, Any] = {
+            "compression_level": compression_level,
+            "max_total_size": max_total_size,
+            "max_age": max_age,
+        }
+        if multiprocess:
+            if compression is not None:
+                raise ValueError(
+                    "compression is not supported with multiprocess=True"
+                )
+            self.handler = SharedRotatingFileHandler(
+                filename,
+                max_bytes,
+                backup_count,
+                encoding,
+                buffer_size,
+                flush_interval,
+                flush_level,
+            )
+        elif buffer_size > 0:
+            self.handler = BatchingRotatingFileHandler(
+                filename,
+                max_bytes,
+                backup_count,
+                encoding,
+                buffer_size,
+                flush_interval,
+                flush_level,
+                compression=compression,
+                **compression_options,
+            )
+        elif compression is not None:
+            self.handler = CompressingRotatingFileHandler(
+                filename,
+                max_bytes,
+                backup_count,
+                encoding,
+                compression=compression,
+                **compression_options,
+            )
+        else:
+            self.handler = logging.handlers.RotatingFileHandler(
+                filename,
+                maxBytes=max_bytes,
+                backupCount=backup_count,
+                encoding=encoding,
+            )
 
     def get_handler(self) -> logging.Handler:
         return self.handler
@@ -65,16 +870,107 @@ class TimedRotatingFileHandler:
         interval: int = 1,
         backup_count: int = 7,
         encoding: str = "utf-8",
+        compression: Optional[str] = None,
+        compression_level: Optional[int] = None,
+        max_total_size: Optional[int] = None,
+        max_age: Optional[float] = None,
     ):
         path = Path(filename)
         path.parent.mkdir(parents=True, exist_ok=True)
-        self.handler = logging.handlers.TimedRotatingFileHandler(
+        _check_retention(compression, max_total_size, max_age)
+        self.handler: logging.Handler
+        if compression is not None:
+            self.handler = CompressingTimedRotatingFileHandler(
+                filename,
+                when,
+                interval,
+                backup_count,
+                encoding,
+                compression=compression,
+                compression_level=compression_level,
+                max_total_size=max_total_size,
+                max_age=max_age,
+            )
+        else:
+            self.handler = logging.handlers.TimedRotatingFileHandler(
+                filename,
+                when=when,
+                interval=interval,
+                backupCount=backup_count,
+                encoding=encoding,
+            )
+
+    def get_handler(self) -> logging.Handler:
+        return self.handler
+
+
+class AsyncFileHandler:
+    def __init__(self, filename: str, encoding: str = "utf-8"):
+        path = Path(filename)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.handler = AiofilesFileHandler(filename, encoding)
+
+    def get_handler(self) -> logging.Handler:
+        return self.handler
+
+
+class AsyncRotatingFileHandler:
+    def __init__(
+        self,
+        filename: str,
+        max_bytes: int = 10485760,
+        backup_count: int = 5,
+        encoding: str = "utf-8",
+    ):
+        path = Path(filename)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.handler = AiofilesRotatingFileHandler(
             filename,
-            when=when,
-            interval=interval,
-            backupCount=backup_count,
+            max_bytes=max_bytes,
+            backup_count=backup_count,
             encoding=encoding,
         )
 
     def get_handler(self) -> logging.Handler:
         return self.handler
+
+
+class RingBufferHandler:
+    def __init__(self, filename: str, capacity: int = 16 * 1024 * 1024):
+        path = Path(filename)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.handler = MmapRingHandler(filename, capacity)
+
+    def get_handler(self) -> logging.Handler:
+        return self.handler
+
+
+class NetworkHandler:
+    def __init__(
+        self,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        compress: bool = False,
+        batch_size: int = 500,
+        linger: float = 0.5,
+        capacity: int = 10000,
+        overflow: str = "drop_oldest",
+        connections: int = 1,
+        max_retries: int = 3,
+        spill_dir: Optional[str] = None,
+    ):
+        self.handler = NDJSONShippingHandler(
+            url,
+            headers=headers,
+            compress=compress,
+            batch_size=batch_size,
+            linger=linger,
+            capacity=capacity,
+            overflow=overflow,
+            connections=connections,
+            max_retries=max_retries,
+            spill_dir=spill_dir,
+        )
+
+    def get_handler(self) -> logging.Handler:
+        return self.handler
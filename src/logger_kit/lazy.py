@@ -0,0 +1,146 @@
+import functools
+import re
+import types
+from typing import Any, Callable, Dict, Hashable, Mapping, Tuple, Union
+
+
+class Lazy:
+    """A value computed only once its record is known to be logged.
+
+    Message arguments and ``extra`` values are only evaluated when wrapped
+    in Lazy; any other callable is logged as it is.
+    """
+
+    __slots__ = ("func",)
+
+    def __init__(self, func: Callable[[], Any]):
+        self.func = func
+
+    def __call__(self) -> Any:
+        return self.func()
+
+    def __repr__(self) -> str:
+        return f"Lazy({self.func!r})"
+
+
+# A message or ``extra`` of these types is a zero-argument callable building
+# it; other callables, such as classes, are logged as they are.
+LAZY_TYPES = (types.FunctionType, functools.partial, Lazy)
+
+MessageType = Union[str, Callable[[], str]]
+
+Renderer = Callable[[Tuple[Any, ...]], str]
+
+# A printf-style conversion, as understood by ``str % args``
+_PERCENT = re.compile(
+    r"%(?:\([^)]*\))?[#0 +-]*(?:\*|\d+)?(?:\.(?:\*|\d+))?[diouxXeEfFgGcrsa]"
+)
+
+# Templates whose renderer is cached before the cache is reset
+MAX_TEMPLATES = 4096
+
+_renderers: Dict[str, Renderer] = {}
+
+
+def _percent_renderer(template: str) -> Renderer:
+    def render(args: Tuple[Any, ...]) -> str:
+        # Like logging.LogRecord: a single mapping fills %(name)s fields
+        if len(args) == 1 and isinstance(args[0], Mapping) and args[0]:
+            return template % args[0]
+        return template % args
+
+    return render
+
+
+def _brace_renderer(template: str) -> Renderer:
+    format = template.format
+
+    def render(args: Tuple[Any, ...]) -> str:
+        return format(*args)
+
+    return render
+
+
+def compile_template(template: str) -> Renderer:
+    """Return the cached renderer of ``template``.
+
+    Templates with a printf-style conversion use ``%`` formatting, other
+    templates with braces use str.format().
+    """
+    try:
+        return _renderers[template]
+    except KeyError:
+        pass
+    if _PERCENT.search(template) or "{" not in template:
+        renderer = _percent_renderer(template)
+    else:
+        renderer = _brace_renderer(template)
+    if len(_renderers) >= MAX_TEMPLATES:
+        _renderers.clear()
+    _renderers[template] = renderer
+    return renderer
+
+
+def render(message: Any, args: Tuple[Any, ...]) -> Any:
+    """Evaluate a lazy ``message`` and interpolate ``args`` into it."""
+    if isinstance(message, LAZY_TYPES):
+        message = message()
+    if not args:
+        return message
+    args = tuple(arg() if isinstance(arg, Lazy) else arg for arg in args)
+    template = message if isinstance(message, str) else str(message)
+    try:
+        return compile_template(template)(args)
+    except (TypeError, ValueError, KeyError, IndexError):
+        # Logging must not fail on a bad template; keep what was given
+        return f"{template} {args!r}"
+
+
+def split_args(
+    message: Any, args: Tuple[Any, ...], extra: Any
+) -> Tuple[Tuple[Any, ...], Any]:
+    """Move a lone mapping argument into ``extra`` if nothing uses it.
+
+    ``extra`` used to be the second positional parameter; a mapping (or
+    None) passed there with a message that has no placeholder is taken as
+    ``extra``, and an ``extra`` keyword takes precedence over it.
+    """
+    if len(args) != 1:
+        return args, extra
+    arg = args[0]
+    if arg is not None and not isinstance(arg, Mapping):
+        return args, extra
+    if not isinstance(message, str) or "{" in message:
+        return args, extra
+    if _PERCENT.search(message):
+        return args, extra
+    if arg is None:
+        return (), extra
+    if extra is None:
+        return (), args[0]
+    return (), {**args[0], **resolve_extra(extra)}
+
+
+def resolve_extra(extra: Any) -> Any:
+    """Evaluate a lazy ``extra`` and the lazy values in it."""
+    if isinstance(extra, LAZY_TYPES):
+        extra = extra()
+    if not extra:
+        return extra
+    for value in extra.values():
+        if isinstance(value, Lazy):
+            break
+    else:
+        return extra
+    return {
+        key: value() if isinstance(value, Lazy) else value
+        for key, value in extra.items()
+    }
+
+
+def message_key(message: Any) -> Hashable:
+    """Return the sampling key of a template or lazy message."""
+    if isinstance(message, str):
+        return message
+    # A lambda gives one code object per call site
+    return getattr(message, "__code__", message)
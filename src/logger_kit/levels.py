@@ -0,0 +1,50 @@
+import logging
+from typing import Dict
+
+TRACE = 5
+NOTICE = 25
+
+# Known levels by name. Loggers have a method named after each of these
+# built-in ones, lower-cased, and its ``a``-prefixed async twin; levels
+# added with add_level() are logged through log() and alog().
+LEVELS: Dict[str, int] = {
+    "TRACE": TRACE,
+    "DEBUG": logging.DEBUG,
+    "INFO": logging.INFO,
+    "NOTICE": NOTICE,
+    "WARNING": logging.WARNING,
+    "ERROR": logging.ERROR,
+    "CRITICAL": logging.CRITICAL,
+}
+
+METHOD_LEVELS = tuple(LEVELS)
+
+for _name in ("TRACE", "NOTICE"):
+    logging.addLevelName(LEVELS[_name], _name)
+
+
+def add_level(name: str, levelno: int) -> None:
+    """Register a custom level, also with the logging module.
+
+    Its name is then accepted by log(), set_level(), context() and
+    anywhere else a level name is.
+    """
+    name = name.upper()
+    current = LEVELS.get(name)
+    if current is not None and current != levelno:
+        raise ValueError(f"Level {name} is already {current}")
+    LEVELS[name] = levelno
+    logging.addLevelName(levelno, name)
+
+
+def level_number(level: str) -> int:
+    """Return the number of the level named ``level`` (in any case)."""
+    name = level.upper()
+    try:
+        return LEVELS[name]
+    except KeyError:
+        pass
+    levelno = logging.getLevelName(name)
+    if not isinstance(levelno, int):
+        raise ValueError(f"Unknown level {level!r}")
+    return levelno
@@ -1,7 +1,21 @@
 import logging
 import re
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Pattern, Union
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Hashable,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Pattern,
+    Tuple,
+    Union,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -14,17 +28,122 @@ class MaskingRule:
     mask: str = "*****"
 
 
+class _Rules(Dict[str, MaskingRule]):
+    """Rules by name, calling ``changed`` whenever they are modified."""
+
+    def __init__(
+        self, changed: Callable[[], None], rules: Mapping[str, MaskingRule]
+    ):
+        super().__init__(rules)
+        self.changed = changed
+
+    def __setitem__(self, key: str, rule: MaskingRule) -> None:
+        super().__setitem__(key, rule)
+        self.changed()
+
+    def __delitem__(self, key: str) -> None:
+        super().__delitem__(key)
+        self.changed()
+
+    def __ior__(  # type: ignore[override,misc]
+        self, other: Any
+    ) -> "_Rules":
+        self.update(other)
+        return self
+
+    def clear(self) -> None:
+        super().clear()
+        self.changed()
+
+    def pop(self, *args: Any) -> Any:
+        try:
+            return super().pop(*args)
+        finally:
+            self.changed()
+
+    def popitem(self) -> Tuple[str, MaskingRule]:
+        try:
+            return super().popitem()
+        finally:
+            self.changed()
+
+    def setdefault(self, key: str, default: Any = None) -> Any:
+        try:
+            return super().setdefault(key, default)
+        finally:
+            self.changed()
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        super().update(*args, **kwargs)
+        self.changed()
+
+
+class ShapeCacheInfo(NamedTuple):
+    """Statistics of the KeyMasker shape cache."""
+
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+# A shape plan lists, for one dictionary shape, the keys whose values have
+# to be looked at together with the action to take on them.
+ShapePlan = Tuple[Tuple[str, int], ...]
+_DESCEND = 0
+_MASK = 1
+_SCAN = 2
+
+# Smaller dictionaries are cheaper to walk than to fingerprint
+_MIN_SHAPE_KEYS = 4
+
+
+# Ready-made value patterns for content scanning
+COMMON_VALUE_PATTERNS: Dict[str, str] = {
+    "email": r"[\w.+-]+@[\w-]+\.[\w.-]+",
+    "card_number": r"\b(?:\d[ -]?){12,18}\d\b",
+    "bearer_token": r"(?i:bearer)\s+[\w\-.~+/]+=*",
+}
+
+
 class KeyMasker:
     """Handles masking of sensitive data in logging output.
 
     Provides functionality for masking data
     using exact matches or regex patterns.
     Supports nested dictionaries and lists.
+
+    The rule keys are compiled into a frozen set on first use and
+    recompiled whenever ``rules`` or ``value_rules`` change, including
+    when they are modified or assigned directly; replace a rule rather
+    than changing its fields. Containers without anything to mask
+    are returned as-is rather than copied, so callers must treat the
+    result of mask_data as read-only.
+
+    With ``shape_cache_size`` > 0, the keys that need attention in a
+    dictionary are cached per shape (its keys and value types) in an LRU
+    of that size. Payloads that repeat the same shapes then skip the rule
+    lookups for every clean key.
+
+    Value patterns added with add_value_pattern enable content scanning:
+    every string value, list elements included, is searched for them in
+    a single pass of one combined regex, regardless of its key.
     """
 
-    def __init__(self, default_mask: str = "*****"):
-        self.rules: Dict[str, MaskingRule] = {}
+    def __init__(
+        self, default_mask: str = "*****", shape_cache_size: int = 0
+    ):
+        self._rules = _Rules(self._invalidate, {})
+        self._value_rules = _Rules(self._invalidate, {})
         self.default_mask: str = default_mask
+        self.shape_cache_size = shape_cache_size
+        self._keys: Optional[FrozenSet[str]] = None
+        self._scanner: Optional[Pattern[str]] = None
+        self._scan_repl: Any = None
+        self._shapes: "OrderedDict[Hashable, ShapePlan]" = OrderedDict()
+        self._shape_hits = 0
+        self._shape_misses = 0
+        self._generation = 0
 
     def add_pattern(
         self,
@@ -45,17 +164,167 @@ class KeyMasker:
         """Add a key to be masked with exact matching."""
         self.rules[key] = MaskingRule(mask=mask or self.default_mask)
 
+    def add_value_pattern(
+        self,
+        name: str,
+        pattern: str,
+        mask: Optional[str] = None,
+    ) -> None:
+        """Add a regex whose matches are masked inside any string value.
+
+        The pattern is combined with the other value patterns into a single
+        alternation, so it must not use global inline flags (use scoped
+        ones like ``(?i:...)``) or numbered backreferences.
+        """
+        try:
+            compiled_pattern = re.compile(pattern)
+            # Make sure the pattern can be embedded in the combined regex
+            re.compile(f"(?:{pattern})|x")
+        except re.error as e:
+            logger.error(f"Invalid value pattern {name}: {e}")
+            return
+        self.value_rules[name] = MaskingRule(
+            pattern=compiled_pattern, mask=mask or self.default_mask
+        )
+
+    @property
+    def rules(self) -> Dict[str, MaskingRule]:
+        """Key rules by key name."""
+        return self._rules
+
+    @rules.setter
+    def rules(self, rules: Mapping[str, MaskingRule]) -> None:
+        self._rules = _Rules(self._invalidate, rules)
+        self._invalidate()
+
+    @property
+    def value_rules(self) -> Dict[str, MaskingRule]:
+        """Value patterns by name."""
+        return self._value_rules
+
+    @value_rules.setter
+    def value_rules(self, rules: Mapping[str, MaskingRule]) -> None:
+        self._value_rules = _Rules(self._invalidate, rules)
+        self._invalidate()
+
+    @property
+    def scans_values(self) -> bool:
+        """Whether content scanning is enabled."""
+        return bool(self.value_rules)
+
     def set_default_mask(self, mask: str) -> None:
         """Set the default masking string."""
         if not mask:
             raise ValueError("Mask value cannot be empty")
 
         # Update mask for rules using the default mask
-        for rule in self.rules.values():
+        for rule in (*self.rules.values(), *self.value_rules.values()):
             if rule.mask == self.default_mask:
                 rule.mask = mask
 
         self.default_mask = mask
+        self._invalidate()
+
+    def _invalidate(self) -> None:
+        """Drop the compiled plan so it is rebuilt from the current rules."""
+        self._keys = None
+
+    def _compiled_keys(self) -> FrozenSet[str]:
+        keys = self._keys
+        if keys is None:
+            self._scanner = self._compile_scanner()
+            keys = self._keys = frozenset(self._rules)
+            self._shapes.clear()
+            self._generation += 1
+        return keys
+
+    @property
+    def generation(self) -> int:
+        """A number that changes whenever the masking rules change."""
+        self._compiled_keys()
+        return self._generation
+
+    def _compile_scanner(self) -> Optional[Pattern[str]]:
+        """Combine all value patterns into one alternation.
+
+        Non-capturing groups are used on purpose: they let the regex
+        compiler factor out common prefixes and skip ahead on the set of
+        possible first characters, which capturing groups would disable.
+        """
+        if not self.value_rules:
+            return None
+        rules = list(self.value_rules.values())
+        masks = {rule.mask for rule in rules}
+        if len(masks) == 1:
+            # One mask for everything: no need to find the matching rule
+            self._scan_repl = masks.pop().replace("\\", "\\\\")
+        else:
+            self._scan_repl = self._replace_match
+        patterns = [rule.pattern for rule in rules if rule.pattern]
+        return re.compile(
+            "|".join(f"(?:{pattern.pattern})" for pattern in patterns)
+        )
+
+    def _replace_match(self, match: "re.Match[str]") -> str:
+        """Return the mask of the value pattern that produced ``match``."""
+        start, end = match.span()
+        for rule in self.value_rules.values():
+            if rule.pattern is None:
+                continue
+            found = rule.pattern.match(match.string, start)
+            if found is not None and found.end() == end:
+                return rule.mask
+        return self.default_mask
+
+    def mask_text(self, text: str) -> str:
+        """Mask every value pattern match inside ``text``."""
+        self._compiled_keys()
+        scanner = self._scanner
+        if scanner is None:
+            return text
+        return scanner.sub(self._scan_repl, text)
+
+    def shape_cache_info(self) -> ShapeCacheInfo:
+        """Return hit/miss statistics of the shape cache."""
+        return ShapeCacheInfo(
+            self._shape_hits,
+            self._shape_misses,
+            self.shape_cache_size,
+            len(self._shapes),
+        )
+
+    def _shape_plan(
+        self, data: Dict[str, Any], keys: FrozenSet[str]
+    ) -> ShapePlan:
+        """Return the cached plan for the shape of ``data``."""
+        shape = (tuple(data), tuple(map(type, data.values())))
+        shapes = self._shapes
+        try:
+            plan = shapes[shape]
+        except KeyError:
+            self._shape_misses += 1
+            scan = self._scanner is not None
+            actions = (
+                (key, _action(key, value, keys, scan))
+                for key, value in data.items()
+            )
+            plan = tuple(
+                (key, action) for key, action in actions if action is not None
+            )
+            shapes[shape] = plan
+            if len(shapes) > self.shape_cache_size:
+                try:
+                    shapes.popitem(last=False)
+                except KeyError:
+                    # Evicted concurrently by another thread
+                    pass
+            return plan
+        self._shape_hits += 1
+        try:
+            shapes.move_to_end(shape)
+        except KeyError:
+            pass
+        return plan
 
     def _mask_value(self, key: str, value: Any) -> Any:
         """Mask a single value based on configured patterns and exact matches.
@@ -70,10 +339,11 @@ class KeyMasker:
         if not isinstance(value, (str, int, float, bool, type(None))):
             return value
 
-        if key not in self.rules:
+        rules = self._rules
+        if key not in rules:
             return value
 
-        rule = self.rules[key]
+        rule = rules[key]
         str_value = str(value)
 
         try:
@@ -93,34 +363,104 @@ class KeyMasker:
             data: The dictionary or list containing data to be masked
 
         Returns:
-            A new dictionary or list with sensitive data
-            masked according to rules
+            The data with sensitive values masked according to rules.
+            Only containers on the path to a masked value are copied;
+            everything else is the original object.
         """
         # Handle None case
         if data is None:
             return None
 
-        # Handle dictionary case
-        if isinstance(data, dict):
-            return {
-                key: (
-                    self.mask_data(value)
-                    if isinstance(value, (dict, list))
-                    else self._mask_value(key, value)
-                )
-                for key, value in data.items()
-            }
+        keys = self._compiled_keys()
+        if not keys and self._scanner is None:
+            return data
 
-        # Handle list case
-        if isinstance(data, list):
-            return [
-                self.mask_data(val) if isinstance(val, (dict, list)) else val
-                for val in data
-            ]
+        if isinstance(data, str):
+            return self.mask_text(data)
 
-        # Handle tuple case by converting to list and back
+        # Handle tuple case by masking it as a sequence
         if isinstance(data, tuple):
-            return tuple(self.mask_data(list(data)))
+            masked = self._mask_sequence(data, keys)
+            return data if masked is data else tuple(masked)
+
+        return self._mask_container(data, keys)
 
-        # Return unmodified data for other types
+    def _mask_container(self, data: Any, keys: FrozenSet[str]) -> Any:
+        if isinstance(data, dict):
+            return self._mask_dict(data, keys)
+        if isinstance(data, list):
+            return self._mask_sequence(data, keys)
         return data
+
+    def _mask_dict(
+        self, data: Dict[str, Any], keys: FrozenSet[str]
+    ) -> Dict[str, Any]:
+        """Mask a dictionary, copying it only if a value changes."""
+        if self.shape_cache_size > 0 and len(data) >= _MIN_SHAPE_KEYS:
+            return self._mask_dict_by_plan(
+                data, self._shape_plan(data, keys), keys
+            )
+        scanner = self._scanner
+        masked = None
+        for key, value in data.items():
+            if isinstance(value, (dict, list)):
+                new_value = self._mask_container(value, keys)
+            elif key in keys:
+                new_value = self._mask_value(key, value)
+            elif scanner is not None and isinstance(value, str):
+                new_value = scanner.sub(self._scan_repl, value)
+            else:
+                continue
+            if new_value is not value:
+                if masked is None:
+                    masked = dict(data)
+                masked[key] = new_value
+        return data if masked is None else masked
+
+    def _mask_dict_by_plan(
+        self, data: Dict[str, Any], plan: ShapePlan, keys: FrozenSet[str]
+    ) -> Dict[str, Any]:
+        masked = None
+        for key, action in plan:
+            value = data[key]
+            if action == _DESCEND:
+                new_value = self._mask_container(value, keys)
+            elif action == _MASK:
+                new_value = self._mask_value(key, value)
+            else:
+                new_value = self.mask_text(value)
+            if new_value is not value:
+                if masked is None:
+                    masked = dict(data)
+                masked[key] = new_value
+        return data if masked is None else masked
+
+    def _mask_sequence(self, data: Any, keys: FrozenSet[str]) -> Any:
+        """Mask the items of a list, copying it only if one changes."""
+        scanner = self._scanner
+        masked = None
+        for index, value in enumerate(data):
+            if isinstance(value, (dict, list)):
+                new_value = self._mask_container(value, keys)
+            elif scanner is not None and isinstance(value, str):
+                new_value = scanner.sub(self._scan_repl, value)
+            else:
+                continue
+            if new_value is not value:
+                if masked is None:
+                    masked = list(data)
+                masked[index] = new_value
+        return data if masked is None else masked
+
+
+def _action(
+    key: str, value: Any, keys: FrozenSet[str], scan: bool
+) -> Optional[int]:
+    """Return the shape plan action for one dictionary item."""
+    if isinstance(value, (dict, list)):
+        return _DESCEND
+    if key in keys:
+        return _MASK
+    if scan and isinstance(value, str):
+        return _SCAN
+    return None
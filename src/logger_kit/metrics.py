@@ -0,0 +1,406 @@
+import bisect
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+import weakref
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from .queueing import RecordQueue
+
+# Upper bounds, in seconds, of the latency histogram buckets
+LATENCY_BUCKETS = (
+    1e-06,
+    2.5e-06,
+    5e-06,
+    1e-05,
+    2.5e-05,
+    5e-05,
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    1.0,
+)
+
+# Stage name and seconds spent in it, for one timed record
+Timings = List[Tuple[str, float]]
+
+ExportTarget = Union[str, Callable[[str], Any]]
+
+# (logger name, level) -> [records, bytes]
+Counts = Dict[Tuple[str, str], List[int]]
+
+
+class Histogram:
+    """Counts of observed latencies in fixed buckets."""
+
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.bounds = bounds
+        # One count per bound, plus one for larger values
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, seconds)] += 1
+        self.sum += seconds
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """Return the upper bound of the bucket holding quantile ``q``."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.bounds, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "p50": self.quantile(0.5),
+            "p99": self.quantile(0.99),
+            "buckets": dict(zip(self.bounds, self.counts)),
+            "overflow": self.counts[-1],
+        }
+
+
+class PipelineMetrics:
+    """Counters and sampled stage latencies of logger-kit loggers.
+
+    Every record a logger built with ``metrics=`` emits is counted by
+    level, with the bytes its formatter produced for it. One record in
+    ``sample_every`` is also timed stage by stage: masking (``mask``),
+    encoding (``format``), each handler (``handler:<name>``) and the
+    whole emission (``emit``). Counts are kept per thread, without
+    locking, and summed when read, when the counts of threads that have
+    ended are also merged into one total; records filtered out by the
+    level are not seen at all.
+
+    stats() of a logger adds what its queue, tail buffer, deduplicator
+    and handlers already count, such as queue depth and dropped records.
+    One instance may be shared by several loggers; it keys everything by
+    logger name.
+
+    ``export`` is a file path, rewritten atomically in the Prometheus text
+    format (as read by node_exporter's textfile collector), or a callable
+    taking that text. A background thread exports every
+    ``export_interval`` seconds until close() is called, and closing a
+    logger exports too.
+    """
+
+    def __init__(
+        self,
+        sample_every: int = 64,
+        export: Optional[ExportTarget] = None,
+        export_interval: float = 10.0,
+    ):
+        if sample_every < 1:
+            raise ValueError("sample_every must be at least 1")
+        self.sample_every = sample_every
+        self.export_target = export
+        self.export_interval = export_interval
+        # Set when the next record is to be timed, see record()
+        self.time_next = True
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        # One shard of counts per thread
+        self._shards: List[Tuple[threading.Thread, Counts]] = []
+        # The counts of threads that have ended
+        self._retired: Counts = {}
+        self._sampled_out: Dict[str, int] = {}
+        self._latency: Dict[str, Dict[str, Histogram]] = {}
+        self._loggers: "weakref.WeakValueDictionary[str, Any]" = (
+            weakref.WeakValueDictionary()
+        )
+        self._next_export = time.monotonic() + export_interval
+        self._stopped = threading.Event()
+        if export is not None:
+            # Holds no reference to the metrics, which may be collected
+            exporter = threading.Thread(
+                target=_export_periodically,
+                args=(weakref.ref(self), self._stopped, export_interval),
+                name="logger-kit-metrics-export",
+            )
+            exporter.daemon = True
+            exporter.start()
+
+    def attach(self, logger: Any) -> None:
+        """Report the gauges of ``logger`` under its name."""
+        self._loggers[logger.logger.name] = logger
+
+    def record(
+        self,
+        name: str,
+        level: str,
+        formatter: logging.Formatter,
+        record: Any,
+        timings: Optional[Timings] = None,
+    ) -> None:
+        """Count a record ``formatter`` encoded, and its stage timings."""
+        try:
+            shard = self._local.shard
+        except AttributeError:
+            shard = self._local.shard = {}
+            with self._lock:
+                self._retire_ended_threads()
+                self._shards.append((threading.current_thread(), shard))
+        key = (name, level)
+        counts = shard.get(key)
+        if counts is None:
+            counts = shard[key] = [0, 0]
+        counts[0] += 1
+        # The formatter's cached output of the record, see fan_out
+        last = getattr(formatter, "_last", None)
+        if last is not None and last[0] is record:
+            counts[1] += len(last[1])
+        if counts[0] % self.sample_every == 0:
+            self.time_next = True
+        if timings is None:
+            return
+        with self._lock:
+            latency = self._latency.setdefault(name, {})
+            for stage, seconds in timings:
+                histogram = latency.get(stage)
+                if histogram is None:
+                    histogram = latency[stage] = Histogram()
+                histogram.observe(seconds)
+
+    def _retire_ended_threads(self) -> None:
+        """Merge the shards of ended threads; the lock must be held."""
+        live = []
+        retired = self._retired
+        for thread, shard in self._shards:
+            if thread.is_alive():
+                live.append((thread, shard))
+                continue
+            for key, (records, size) in shard.items():
+                total = retired.setdefault(key, [0, 0])
+                total[0] += records
+                total[1] += size
+        self._shards = live
+
+    def sampled_out(self, name: str) -> None:
+        """Count a record the sampler dropped."""
+        with self._lock:
+            self._sampled_out[name] = self._sampled_out.get(name, 0) + 1
+
+    def counters(self, name: str) -> Dict[str, Any]:
+        """Return the counters and latencies kept for logger ``name``."""
+        records: Dict[str, int] = {}
+        size = 0
+        with self._lock:
+            self._retire_ended_threads()
+            shards = [self._retired]
+            shards += [shard for _, shard in self._shards]
+            for shard in shards:
+                for (logger, level), counts in list(shard.items()):
+                    if logger == name:
+                        records[level] = records.get(level, 0) + counts[0]
+                        size += counts[1]
+            return {
+                "records": records,
+                "bytes_formatted": size,
+                "sampled_out": self._sampled_out.get(name, 0),
+                "latency": {
+                    stage: histogram.snapshot()
+                    for stage, histogram in self._latency.get(
+                        name, {}
+                    ).items()
+                },
+            }
+
+    def to_prometheus(self, prefix: str = "logger_kit") -> str:
+        """Return the metrics of all attached loggers as Prometheus text."""
+        stats = {
+            name: logger.stats() for name, logger in self._loggers.items()
+        }
+        lines: List[str] = []
+
+        def family(name: str, kind: str, help: str) -> str:
+            lines.append(f"# HELP {prefix}_{name} {help}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+            return f"{prefix}_{name}"
+
+        metric = family(
+            "records_total", "counter", "Records emitted, by level."
+        )
+        for name, values in stats.items():
+            for level, count in values["records"].items():
+                labels = _labels(logger=name, level=level)
+                lines.append(f"{metric}{labels} {count}")
+        for key, help in (
+            ("bytes_formatted", "Bytes produced by the logger's formatter."),
+            ("sampled_out", "Records dropped by the sampler."),
+            ("deduplicated", "Records collapsed by the deduplicator."),
+            ("tail_flushed", "Buffered records logged on errors."),
+        ):
+            metric = family(f"{key}_total", "counter", help)
+            for name, values in stats.items():
+                lines.append(f"{metric}{_labels(logger=name)} {values[key]}")
+
+        queues = [
+            (name, handler, values)
+            for name, logger_stats in stats.items()
+            for handler, values in _queues(logger_stats)
+        ]
+        metric = family("queue_depth", "gauge", "Records waiting in a queue.")
+        for name, handler, values in queues:
+            labels = _labels(logger=name, queue=handler)
+            lines.append(f"{metric}{labels} {values['depth']}")
+        metric = family(
+            "queue_dropped_total", "counter", "Records a full queue dropped."
+        )
+        for name, handler, values in queues:
+            for policy in ("oldest", "new"):
+                labels = _labels(logger=name, queue=handler, policy=policy)
+                count = values[f"dropped_{policy}"]
+                lines.append(f"{metric}{labels} {count}")
+
+        metric = family(
+            "stage_seconds", "histogram", "Latency of sampled records."
+        )
+        for name, values in stats.items():
+            for stage, histogram in values["latency"].items():
+                cumulative = 0
+                for bound, count in histogram["buckets"].items():
+                    cumulative += count
+                    labels = _labels(logger=name, stage=stage, le=repr(bound))
+                    lines.append(f"{metric}_bucket{labels} {cumulative}")
+                labels = _labels(logger=name, stage=stage, le="+Inf")
+                lines.append(f"{metric}_bucket{labels} {histogram['count']}")
+                labels = _labels(logger=name, stage=stage)
+                lines.append(f"{metric}_sum{labels} {histogram['sum']!r}")
+                lines.append(f"{metric}_count{labels} {histogram['count']}")
+        return "\n".join(lines) + "\n"
+
+    def export(self) -> None:
+        """Write or pass on the Prometheus text now."""
+        target = self.export_target
+        if target is None:
+            return
+        self._next_export = time.monotonic() + self.export_interval
+        text = self.to_prometheus()
+        if callable(target):
+            target(text)
+            return
+        staging = f"{target}.{os.getpid()}.tmp"
+        with open(staging, "w") as f:
+            f.write(text)
+        os.replace(staging, target)
+
+    def _export_if_due(self) -> None:
+        if time.monotonic() < self._next_export:
+            return
+        try:
+            self.export()
+        except Exception:
+            # Like logging.Handler.handleError: report and go on
+            if logging.raiseExceptions:
+                traceback.print_exc(file=sys.stderr)
+
+    def close(self) -> None:
+        """Stop the periodic export."""
+        self._stopped.set()
+
+
+def _export_periodically(
+    ref: "weakref.ref[PipelineMetrics]",
+    stopped: threading.Event,
+    interval: float,
+) -> None:
+    while not stopped.wait(interval):
+        metrics = ref()
+        if metrics is None:
+            return
+        metrics._export_if_due()
+        del metrics
+
+
+def _labels(**labels: str) -> str:
+    def escape(value: str) -> str:
+        return (
+            value.replace("\\", "\\\\")
+            .replace('"', '\\"')
+            .replace("\n", "\\n")
+        )
+
+    pairs = ",".join(f'{k}="{escape(str(v))}"' for k, v in labels.items())
+    return "{" + pairs + "}"
+
+
+def _queues(stats: Dict[str, Any]) -> List[Tuple[str, Dict[str, int]]]:
+    queues = []
+    if stats["queue"] is not None:
+        queues.append(("writer", stats["queue"]))
+    for handler, values in stats["handlers"].items():
+        if "queue" in values:
+            queues.append((handler, values["queue"]))
+    return queues
+
+
+def _queue_stats(queue: RecordQueue) -> Dict[str, int]:
+    return {
+        "depth": len(queue),
+        "capacity": queue.capacity,
+        "dropped_oldest": queue.dropped_oldest,
+        "dropped_new": queue.dropped_new,
+    }
+
+
+def handler_name(handler: logging.Handler) -> str:
+    return handler.get_name() or type(handler).__name__
+
+
+def logger_stats(logger: Any) -> Dict[str, Any]:
+    """Return the pipeline statistics of a logger-kit logger.
+
+    Counters and latencies come from the logger's PipelineMetrics, if it
+    has any; queue, tail buffer, deduplicator and handler figures are
+    read from those components.
+    """
+    metrics = logger.metrics
+    if metrics is not None:
+        stats = metrics.counters(logger.logger.name)
+    else:
+        stats = {
+            "records": {},
+            "bytes_formatted": 0,
+            "sampled_out": 0,
+            "latency": {},
+        }
+    writer = logger.writer
+    stats["queue"] = _queue_stats(writer.queue) if writer else None
+    deduplicator = logger.deduplicator
+    stats["deduplicated"] = deduplicator.suppressed if deduplicator else 0
+    tail = logger.tail_buffer
+    stats["tail_flushed"] = tail.flushed if tail is not None else 0
+    handlers: Dict[str, Dict[str, Any]] = {}
+    for handler in logger.logger.handlers:
+        values: Dict[str, Any] = {}
+        queue = getattr(handler, "queue", None)
+        if isinstance(queue, RecordQueue):
+            values["queue"] = _queue_stats(queue)
+        for counter in ("sent", "failed", "spilled"):
+            if isinstance(getattr(handler, counter, None), int):
+                values[counter] = getattr(handler, counter)
+        if values:
+            handlers[handler_name(handler)] = values
+    stats["handlers"] = handlers
+    return stats
@@ -0,0 +1,283 @@
+import asyncio
+import atexit
+import sys
+import threading
+import traceback
+import weakref
+from collections import deque
+from typing import Any, Callable, List, Optional
+
+OVERFLOW_POLICIES = ("block", "drop_oldest", "drop_new")
+
+
+class RecordQueue:
+    """Bounded ring buffer holding records waiting to be written.
+
+    When the buffer is full the overflow policy decides what happens:
+    ``block`` waits for free space, ``drop_oldest`` evicts the oldest
+    pending record and ``drop_new`` discards the incoming one. Dropped
+    records are counted in ``dropped_oldest`` and ``dropped_new``.
+
+    Coroutines can wait for free space or for the queue to drain without
+    blocking their event loop; they are woken from the writer thread with
+    ``call_soon_threadsafe``.
+    """
+
+    def __init__(self, capacity: int = 10000, overflow: str = "block"):
+        if capacity < 1:
+            raise ValueError("Queue capacity must be at least 1")
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(
+                f"Unknown overflow policy {overflow!r}, "
+                f"expected one of {', '.join(OVERFLOW_POLICIES)}"
+            )
+        self.capacity = capacity
+        self.overflow = overflow
+        self.dropped_oldest = 0
+        self.dropped_new = 0
+        self._items: deque = deque()
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+        self._progress = threading.Condition(self._lock)
+        # Records accepted so far and records written or evicted so far.
+        # flush() waits for the second counter to catch up with the first.
+        self._accepted = 0
+        self._completed = 0
+        self._closed = False
+        self._space_waiters: List[_AsyncWaiter] = []
+        self._join_waiters: List[_AsyncWaiter] = []
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def put(self, item: Any, timeout: Optional[float] = None) -> bool:
+        """Add an item, applying the overflow policy when full.
+
+        Returns:
+            True if the item was accepted, False if it was dropped or the
+            queue is closed
+        """
+        with self._lock:
+            if self._closed:
+                return False
+            if len(self._items) >= self.capacity:
+                if self.overflow == "drop_new":
+                    self.dropped_new += 1
+                    return False
+                if self.overflow == "drop_oldest":
+                    self._items.popleft()
+                    self.dropped_oldest += 1
+                    self._completed += 1
+                    self._progress.notify_all()
+                    self._wake_joiners()
+                elif not self._not_full.wait_for(
+                    lambda: self._closed
+                    or len(self._items) < self.capacity,
+                    timeout,
+                ):
+                    return False
+                if self._closed:
+                    return False
+            self._items.append(item)
+            self._accepted += 1
+            self._not_empty.notify()
+            return True
+
+    def get_batch(
+        self, max_items: int, timeout: Optional[float] = None
+    ) -> List[Any]:
+        """Remove up to ``max_items`` items, waiting until one is available.
+
+        Returns an empty list once the queue is closed and drained, or
+        when ``timeout`` seconds pass without an item.
+        """
+        with self._lock:
+            while not self._items:
+                if self._closed:
+                    return []
+                if not self._not_empty.wait(timeout) and timeout is not None:
+                    return []
+            items = self._items
+            count = min(max_items, len(items))
+            batch = [items.popleft() for _ in range(count)]
+            self._not_full.notify_all()
+            if self._space_waiters:
+                _wake_all(self._space_waiters)
+                self._space_waiters = []
+            return batch
+
+    def task_done(self, count: int) -> None:
+        """Mark ``count`` items returned by get_batch as written."""
+        with self._lock:
+            self._completed += count
+            self._progress.notify_all()
+            self._wake_joiners()
+
+    def join(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every item accepted so far has been written."""
+        with self._lock:
+            target = self._accepted
+            return self._progress.wait_for(
+                lambda: self._completed >= target, timeout
+            )
+
+    async def wait_not_full(self) -> None:
+        """Wait without blocking the event loop until an item fits."""
+        with self._lock:
+            if self._closed or len(self._items) < self.capacity:
+                return
+            waiter = _AsyncWaiter(0)
+            self._space_waiters.append(waiter)
+        await waiter.future
+
+    async def ajoin(self) -> None:
+        """Async counterpart of join(), without a timeout."""
+        with self._lock:
+            target = self._accepted
+            if self._completed >= target:
+                return
+            waiter = _AsyncWaiter(target)
+            self._join_waiters.append(waiter)
+        await waiter.future
+
+    def close(self) -> None:
+        """Stop accepting items; pending items are still handed out."""
+        with self._lock:
+            self._closed = True
+            self._not_empty.notify_all()
+            self._not_full.notify_all()
+            _wake_all(self._space_waiters)
+            self._space_waiters = []
+
+    def _wake_joiners(self) -> None:
+        if not self._join_waiters:
+            return
+        done = self._completed
+        ready = [w for w in self._join_waiters if w.target <= done]
+        if ready:
+            _wake_all(ready)
+            self._join_waiters = [
+                w for w in self._join_waiters if w.target > done
+            ]
+
+
+class _AsyncWaiter:
+    """A future owned by an event loop, resolvable from any thread."""
+
+    __slots__ = ("target", "loop", "future")
+
+    def __init__(self, target: int):
+        self.target = target
+        self.loop = asyncio.get_running_loop()
+        self.future = self.loop.create_future()
+
+    def wake(self) -> None:
+        try:
+            self.loop.call_soon_threadsafe(self._resolve)
+        except RuntimeError:
+            # The waiting loop has already been closed
+            pass
+
+    def _resolve(self) -> None:
+        if not self.future.done():
+            self.future.set_result(None)
+
+
+def _wake_all(waiters: List[_AsyncWaiter]) -> None:
+    for waiter in waiters:
+        waiter.wake()
+
+
+class BackgroundWriter:
+    """Drains a RecordQueue on a dedicated thread.
+
+    Every queued item is passed to ``emit`` as positional arguments, so
+    masking, formatting and handler I/O all run off the caller's thread.
+    Writers are flushed and stopped automatically at interpreter exit.
+    """
+
+    def __init__(
+        self,
+        emit: Callable[..., None],
+        capacity: int = 10000,
+        overflow: str = "block",
+        batch_size: int = 256,
+        name: str = "logger-kit-writer",
+    ):
+        self.queue = RecordQueue(capacity, overflow)
+        self.batch_size = batch_size
+        self._emit = emit
+        self._thread = threading.Thread(target=self._run, name=name)
+        self._thread.daemon = True
+        self._thread.start()
+        _writers.add(self)
+
+    @property
+    def closed(self) -> bool:
+        return self.queue.closed
+
+    def submit(self, *item: Any) -> bool:
+        """Queue one record for the writer thread."""
+        return self.queue.put(item)
+
+    async def asubmit(self, *item: Any) -> bool:
+        """Queue one record, awaiting free space under the block policy."""
+        queue = self.queue
+        if queue.overflow != "block":
+            return queue.put(item)
+        while not queue.put(item, timeout=0):
+            if queue.closed:
+                return False
+            await queue.wait_not_full()
+        return True
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until every record submitted so far has been emitted."""
+        if threading.current_thread() is self._thread:
+            return False
+        return self.queue.join(timeout)
+
+    async def aflush(self) -> None:
+        """Await until every record submitted so far has been emitted."""
+        await self.queue.ajoin()
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Write out pending records and stop the writer thread."""
+        self.queue.close()
+        if threading.current_thread() is not self._thread:
+            self._thread.join(timeout)
+        _writers.discard(self)
+
+    def _run(self) -> None:
+        queue = self.queue
+        emit = self._emit
+        while True:
+            batch = queue.get_batch(self.batch_size)
+            if not batch:
+                return
+            for item in batch:
+                try:
+                    emit(*item)
+                except Exception:
+                    # Mirror logging.Handler.handleError: report and go on,
+                    # a bad record must never kill the writer thread.
+                    traceback.print_exc(file=sys.stderr)
+            queue.task_done(len(batch))
+
+
+_writers: "weakref.WeakSet[BackgroundWriter]" = weakref.WeakSet()
+
+
+def _close_all_writers() -> None:
+    for writer in list(_writers):
+        writer.close()
+
+
+# Registered after logging's own shutdown hook, so it runs first and
+# pending records still reach open handlers.
+atexit.register(_close_all_writers)
@@ -0,0 +1,128 @@
+import logging
+import os
+from typing import Any, Dict, Optional, Tuple
+
+# File, line and function of the code that logged a record
+Caller = Tuple[str, int, Optional[str]]
+
+UNKNOWN_CALLER: Caller = ("(unknown file)", 0, None)
+
+# When the logging module was loaded, the origin of relativeCreated
+_START_TIME: float = logging._startTime  # type: ignore[attr-defined]
+
+# Record attributes a CompactRecord provides to formatters
+COMPACT_FIELDS = frozenset(
+    (
+        "asctime",
+        "name",
+        "levelname",
+        "levelno",
+        "message",
+        "created",
+        "msecs",
+        "relativeCreated",
+        "pathname",
+        "filename",
+        "module",
+        "lineno",
+        "funcName",
+    )
+)
+
+# Attributes of a stdlib LogRecord, which ``extra`` may not overwrite
+_LOG_RECORD_ATTRS = frozenset(
+    logging.LogRecord("", logging.INFO, "", 0, "", (), None).__dict__
+) | {"message", "asctime"}
+
+
+class CompactRecord:
+    """Slotted stand-in for logging.LogRecord on logger-kit's fast path.
+
+    It carries only what logger-kit's formatters and handlers read: no
+    thread, process or caller lookups happen unless ``caller`` is given,
+    and ``extra`` stays a dict instead of being copied onto the record.
+    Handlers and formatters advertise support with an ``accepts_compact``
+    attribute; any other handler receives to_log_record() instead.
+    """
+
+    __slots__ = (
+        "name",
+        "msg",
+        "levelno",
+        "levelname",
+        "created",
+        "msecs",
+        "extra",
+        "pathname",
+        "lineno",
+        "funcName",
+    )
+
+    args: Tuple[Any, ...] = ()
+    exc_info = None
+    exc_text = None
+    stack_info = None
+
+    def __init__(
+        self,
+        name: str,
+        levelno: int,
+        levelname: str,
+        msg: Any,
+        extra: Optional[Dict[str, Any]],
+        created: float,
+        caller: Caller = UNKNOWN_CALLER,
+    ):
+        self.name = name
+        self.msg = msg
+        self.levelno = levelno
+        self.levelname = levelname
+        self.created = created
+        self.msecs = int((created - int(created)) * 1000) + 0.0
+        self.extra = extra
+        self.pathname, self.lineno, self.funcName = caller
+
+    @property
+    def relativeCreated(self) -> float:
+        return (self.created - _START_TIME) * 1000
+
+    @property
+    def filename(self) -> str:
+        return os.path.basename(self.pathname)
+
+    @property
+    def module(self) -> str:
+        return os.path.splitext(self.filename)[0]
+
+    def getMessage(self) -> str:
+        msg = self.msg
+        return msg if isinstance(msg, str) else str(msg)
+
+    def to_log_record(self) -> logging.LogRecord:
+        """Return the equivalent stdlib LogRecord."""
+        record = logging.LogRecord(
+            self.name,
+            self.levelno,
+            self.pathname,
+            self.lineno,
+            self.msg,
+            (),
+            None,
+            self.funcName,
+        )
+        record.created = self.created
+        record.msecs = self.msecs
+        record.relativeCreated = self.relativeCreated
+        if self.extra:
+            record.__dict__.update(self.extra)
+        return record
+
+
+def check_extra(extra: Dict[str, Any]) -> None:
+    """Reject ``extra`` keys clashing with record attributes.
+
+    Mirrors logging.Logger.makeRecord, so both paths fail alike.
+    """
+    if not _LOG_RECORD_ATTRS.isdisjoint(extra):
+        key = next(key for key in extra if key in _LOG_RECORD_ATTRS)
+        raise KeyError(f"Attempt to overwrite {key!r} in LogRecord")
@@ -0,0 +1,159 @@
+import logging
+import sys
+import threading
+from typing import Any, Dict, Optional, Tuple, Union
+
+from .formatters import build_formatter
+from .handlers import (
+    AsyncFileHandler,
+    AsyncRotatingFileHandler,
+    FileHandler,
+    NetworkHandler,
+    RingBufferHandler,
+    RotatingFileHandler,
+    StreamHandler,
+    SysLogHandler,
+    TimedRotatingFileHandler,
+)
+
+# Handler wrappers from logger_kit.handlers by sink ``type``
+SINK_TYPES: Dict[str, Any] = {
+    "stream": StreamHandler,
+    "file": FileHandler,
+    "rotating_file": RotatingFileHandler,
+    "timed_rotating_file": TimedRotatingFileHandler,
+    "syslog": SysLogHandler,
+    "async_file": AsyncFileHandler,
+    "async_rotating_file": AsyncRotatingFileHandler,
+    "ring_buffer": RingBufferHandler,
+    "network": NetworkHandler,
+}
+
+# A logging.Handler, a wrapper from logger_kit.handlers, or a sink name
+HandlerLike = Union[logging.Handler, Any]
+
+_lock = threading.RLock()
+# Registered sinks: name -> (spec given to configure() or None, handler)
+_sinks: Dict[str, Tuple[Optional[Dict[str, Any]], logging.Handler]] = {}
+
+
+def as_handler(handler: HandlerLike) -> logging.Handler:
+    """Resolve a sink name or handler wrapper to its logging.Handler."""
+    if isinstance(handler, logging.Handler):
+        return handler
+    if isinstance(handler, str):
+        return get_sink(handler)
+    get_handler = getattr(handler, "get_handler", None)
+    if get_handler is None:
+        raise TypeError(f"Not a handler: {handler!r}")
+    return get_handler()
+
+
+def attach(logger: logging.Logger, handler: logging.Handler) -> None:
+    """Add ``handler`` to ``logger`` unless it is already attached."""
+    with _lock:
+        if handler not in logger.handlers:
+            logger.addHandler(handler)
+
+
+def register_sink(name: str, handler: HandlerLike) -> logging.Handler:
+    """Register ``handler`` under ``name`` for loggers to share.
+
+    A sink previously registered under ``name`` is unregistered first.
+    """
+    resolved = as_handler(handler)
+    with _lock:
+        if _sinks.get(name, (None, None))[1] is not resolved:
+            unregister_sink(name)
+        _sinks[name] = (None, resolved)
+    return resolved
+
+
+def get_sink(name: str) -> logging.Handler:
+    """Return the handler registered under ``name``."""
+    try:
+        return _sinks[name][1]
+    except KeyError:
+        raise KeyError(f"No sink registered as {name!r}") from None
+
+
+def unregister_sink(name: str) -> None:
+    """Detach the sink ``name`` from every logger and close it."""
+    with _lock:
+        entry = _sinks.pop(name, None)
+        if entry is None:
+            return
+        handler = entry[1]
+        loggers = [logging.getLogger()] + [
+            logger
+            for logger in logging.Logger.manager.loggerDict.values()
+            if isinstance(logger, logging.Logger)
+        ]
+        for logger in loggers:
+            if handler in logger.handlers:
+                logger.removeHandler(handler)
+    handler.close()
+
+
+def _build_sink(
+    spec: Dict[str, Any], formatters: Dict[Any, logging.Formatter]
+) -> logging.Handler:
+    options = dict(spec)
+    sink_type = options.pop("type", None)
+    if sink_type not in SINK_TYPES:
+        raise ValueError(
+            f"Unknown sink type {sink_type!r}, "
+            f"expected one of {', '.join(SINK_TYPES)}"
+        )
+    level = options.pop("level", None)
+    formatter = options.pop("formatter", None)
+    serializer = options.pop("serializer", "auto")
+    if sink_type == "stream":
+        stream = options.pop("stream", None)
+        options["stream"] = (
+            getattr(sys, stream) if isinstance(stream, str) else stream
+        )
+    handler = SINK_TYPES[sink_type](**options).get_handler()
+    if level is not None:
+        handler.setLevel(level.upper())
+    if formatter is not None:
+        key = (formatter, serializer)
+        if key not in formatters:
+            formatters[key] = build_formatter(formatter, serializer)
+        handler.setFormatter(formatters[key])
+    return handler
+
+
+def configure(
+    config: Dict[str, Any], logger_class: Optional[type] = None
+) -> Dict[str, Any]:
+    """Set up sinks and loggers from a declarative ``config``.
+
+    ``config["sinks"]`` maps sink names to a ``type`` from SINK_TYPES plus
+    the arguments of its handler wrapper, and optionally ``level``,
+    ``formatter`` and ``serializer``. ``config["loggers"]`` maps logger
+    names to Logger arguments, where ``sinks`` lists sink names. Returns
+    the loggers by name.
+
+    Calling it again is safe: sinks whose spec is unchanged are kept, so
+    no file is opened twice, and loggers never get a handler twice. A sink
+    whose spec changed is detached from every logger and closed, and the
+    listed loggers get its replacement.
+    """
+    if logger_class is None:
+        from . import Logger
+
+        logger_class = Logger
+    formatters: Dict[Any, logging.Formatter] = {}
+    with _lock:
+        for name, spec in config.get("sinks", {}).items():
+            entry = _sinks.get(name)
+            if entry is not None and entry[0] == spec:
+                continue
+            handler = _build_sink(spec, formatters)
+            unregister_sink(name)
+            _sinks[name] = (dict(spec), handler)
+        return {
+            name: logger_class(name, **options)
+            for name, options in config.get("loggers", {}).items()
+        }
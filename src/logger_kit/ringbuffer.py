@@ -0,0 +1,266 @@
+"""Memory-mapped circular buffer of length-prefixed log records.
+
+File layout: a 64 byte header followed by ``capacity`` bytes of data. The
+header holds a magic value, the capacity and two absolute byte positions:
+``head``, where the next frame will be written, and ``tail``, the start of
+the oldest frame still intact. A frame is a 4 byte length, the 4 byte
+CRC32 of the payload and the payload itself; frames wrap around the end
+of the data area.
+
+The writer advances ``tail`` past the frames it is about to overwrite,
+copies the new frame and only then publishes it by moving ``head``. The
+mapping lives in the OS page cache, so every published frame survives a
+crash of the writing process. Readers never modify the file.
+
+Run ``python -m logger_kit.ringbuffer PATH`` to print the buffered records
+as JSON lines, with ``--follow`` to keep tailing it.
+"""
+
+import argparse
+import mmap
+import os
+import struct
+import sys
+import time
+from typing import Iterator, List, Optional, Tuple
+from zlib import crc32
+
+MAGIC = b"LKRING01"
+HEADER = struct.Struct("<8sQQQ")
+HEADER_SIZE = 64
+FRAME = struct.Struct("<II")
+POSITION = struct.Struct("<Q")
+_HEAD_OFFSET = 16
+_TAIL_OFFSET = 24
+_EVICT_FRACTION = 16
+
+
+class RingBuffer:
+    """Writer side of the ring buffer; not safe across processes."""
+
+    def __init__(self, path: str, capacity: int = 16 * 1024 * 1024):
+        if capacity <= FRAME.size:
+            raise ValueError(f"Capacity must exceed {FRAME.size} bytes")
+        self.path = os.path.abspath(path)
+        self.dropped = 0
+        flags = os.O_RDWR | os.O_CREAT | getattr(os, "O_BINARY", 0)
+        fd = os.open(self.path, flags, 0o644)
+        try:
+            size = os.fstat(fd).st_size
+            existing = None
+            if size >= HEADER_SIZE:
+                # Seek and read rather than pread, which Windows lacks
+                existing = HEADER.unpack(os.read(fd, HEADER.size))
+            if existing is not None and existing[0] == MAGIC:
+                # Keep appending to a buffer left by a previous run
+                capacity = existing[1]
+            else:
+                os.ftruncate(fd, 0)
+                os.ftruncate(fd, HEADER_SIZE + capacity)
+                os.lseek(fd, 0, os.SEEK_SET)
+                os.write(fd, HEADER.pack(MAGIC, capacity, 0, 0))
+            self.map = mmap.mmap(fd, HEADER_SIZE + capacity)
+        finally:
+            os.close(fd)
+        self.capacity = capacity
+        _, _, self.head, self.tail = HEADER.unpack_from(self.map, 0)
+
+    def write(self, payload: bytes) -> bool:
+        """Append one record, evicting the oldest ones to make room.
+
+        Returns False, and counts the record in ``dropped``, when it is
+        larger than the whole buffer.
+        """
+        length = len(payload)
+        size = FRAME.size + length
+        capacity = self.capacity
+        if size > capacity:
+            self.dropped += 1
+            return False
+        head = self.head
+        if head + size - self.tail > capacity:
+            self._evict(head, size)
+        buffer = self.map
+        offset = head % capacity
+        if offset + size <= capacity:
+            # Common case: the frame is contiguous, copy it in place
+            start = HEADER_SIZE + offset
+            FRAME.pack_into(buffer, start, length, crc32(payload))
+            body = start + FRAME.size
+            end = start + size
+            buffer[body:end] = payload
+        else:
+            self._copy(head, FRAME.pack(length, crc32(payload)) + payload)
+        head += size
+        self.head = head
+        POSITION.pack_into(buffer, _HEAD_OFFSET, head)
+        return True
+
+    def _evict(self, head: int, size: int) -> None:
+        """Move the tail past the frames the next one will overwrite.
+
+        A sixteenth of the buffer is freed in one go so that the frame
+        headers are not read back on every write once the buffer is full.
+        """
+        capacity = self.capacity
+        target = head + size - capacity + capacity // _EVICT_FRACTION
+        tail = self.tail
+        while tail < target and tail < head:
+            length = FRAME.unpack(self._read(tail, FRAME.size))[0]
+            tail += FRAME.size + length
+        # A damaged length cannot push the tail past the head
+        tail = min(tail, head)
+        self.tail = tail
+        POSITION.pack_into(self.map, _TAIL_OFFSET, tail)
+
+    def _copy(self, position: int, data: bytes) -> None:
+        offset = position % self.capacity
+        start = HEADER_SIZE + offset
+        first = self.capacity - offset
+        if len(data) <= first:
+            end = start + len(data)
+            self.map[start:end] = data
+        else:
+            end = start + first
+            self.map[start:end] = data[:first]
+            end = HEADER_SIZE + len(data) - first
+            self.map[HEADER_SIZE:end] = data[first:]
+
+    def _read(self, position: int, size: int) -> bytes:
+        return _read_circular(self.map, self.capacity, position, size)
+
+    def flush(self) -> None:
+        """Ask the OS to write the mapping to disk."""
+        self.map.flush()
+
+    def close(self) -> None:
+        if not self.map.closed:
+            self.map.flush()
+            self.map.close()
+
+
+class RingBufferReader:
+    """Reads records from a ring buffer file without modifying it.
+
+    Frames whose CRC does not match are skipped and counted in
+    ``corrupted``; records overwritten by the writer while being read are
+    discarded and counted in ``overrun``.
+    """
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.capacity, _, _ = HEADER.unpack_from(self.map, 0)
+        if magic != MAGIC:
+            self.map.close()
+            raise ValueError(f"{path} is not a logger-kit ring buffer")
+        self.corrupted = 0
+        self.overrun = 0
+
+    def positions(self) -> Tuple[int, int]:
+        """Return the current ``(tail, head)`` positions."""
+        _, _, head, tail = HEADER.unpack_from(self.map, 0)
+        return tail, head
+
+    def read(self, since: Optional[int] = None) -> Tuple[List[bytes], int]:
+        """Return the records written after position ``since``.
+
+        Without ``since`` every record still in the buffer is returned.
+        The second item is the position to pass to the next call.
+        """
+        tail, head = self.positions()
+        position = tail if since is None or since < tail else since
+        records = []
+        starts = []
+        while position < head:
+            header = self._read(position, FRAME.size)
+            length, crc = FRAME.unpack(header)
+            if FRAME.size + length > head - position:
+                # Cannot be a real frame: the writer overtook us
+                self.overrun += 1
+                break
+            payload = self._read(position + FRAME.size, length)
+            if crc32(payload) == crc:
+                records.append(payload)
+                starts.append(position)
+            else:
+                self.corrupted += 1
+            position += FRAME.size + length
+        # Anything the writer evicted meanwhile may have been overwritten
+        new_tail, _ = self.positions()
+        if starts and starts[0] < new_tail:
+            valid = [i for i, start in enumerate(starts) if start >= new_tail]
+            self.overrun += len(starts) - len(valid)
+            records = [records[i] for i in valid]
+        return records, position
+
+    def __iter__(self) -> Iterator[bytes]:
+        return iter(self.read()[0])
+
+    def _read(self, position: int, size: int) -> bytes:
+        return _read_circular(self.map, self.capacity, position, size)
+
+    def close(self) -> None:
+        self.map.close()
+
+
+def _read_circular(
+    buffer: mmap.mmap, capacity: int, position: int, size: int
+) -> bytes:
+    offset = position % capacity
+    start = HEADER_SIZE + offset
+    first = capacity - offset
+    if size <= first:
+        end = start + size
+        return buffer[start:end]
+    end = HEADER_SIZE + size - first
+    return buffer[start:] + buffer[HEADER_SIZE:end]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m logger_kit.ringbuffer",
+        description="Print the records of a logger-kit ring buffer.",
+    )
+    parser.add_argument("path", help="ring buffer file")
+    parser.add_argument(
+        "-f",
+        "--follow",
+        action="store_true",
+        help="keep printing records as they are written",
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=0.2,
+        help="polling interval in seconds with --follow",
+    )
+    args = parser.parse_args(argv)
+
+    reader = RingBufferReader(args.path)
+    out = sys.stdout.buffer
+    position = None
+    try:
+        while True:
+            records, position = reader.read(position)
+            for record in records:
+                out.write(record.rstrip(b"\n") + b"\n")
+            out.flush()
+            if not args.follow:
+                break
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        reader.close()
+    if reader.corrupted or reader.overrun:
+        print(
+            f"skipped {reader.corrupted} corrupted and "
+            f"{reader.overrun} overwritten records",
+            file=sys.stderr,
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
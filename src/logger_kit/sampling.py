@@ -0,0 +1,173 @@
+import abc
+import logging
+import random
+import threading
+import time
+from typing import Any, Dict, Hashable, List, Optional
+
+# Keys tracked by the stateful samplers before their tables are reset
+MAX_KEYS = 10000
+
+
+class Sampler(abc.ABC):
+    """Decides which records of noisy call sites are logged.
+
+    Records are keyed by message template or by call site (see the
+    ``sample_by`` argument of BaseLogger) and only records at or below
+    ``max_level`` are sampled, so warnings and errors always get through.
+    Subclasses implement ``_allow``. Suppressed records are counted per
+    key; the logger emits them as a summary record every
+    ``summary_interval`` seconds.
+    """
+
+    def __init__(
+        self, max_level: str = "INFO", summary_interval: float = 60.0
+    ):
+        self.max_level = logging.getLevelName(max_level.upper())
+        self.summary_interval = summary_interval
+        self._sampled_levels: Dict[str, bool] = {}
+        self._suppressed: Dict[Hashable, int] = {}
+        self._lock = threading.Lock()
+        self._next_summary = time.monotonic() + summary_interval
+
+    def allow(self, level: str, key: Hashable) -> bool:
+        """Return whether the record at ``level`` keyed ``key`` is logged."""
+        try:
+            sampled = self._sampled_levels[level]
+        except KeyError:
+            levelno = logging.getLevelName(level)
+            sampled = isinstance(levelno, int) and levelno <= self.max_level
+            self._sampled_levels[level] = sampled
+        if not sampled:
+            return True
+        with self._lock:
+            if self._allow(key):
+                return True
+            suppressed = self._suppressed
+            suppressed[key] = suppressed.get(key, 0) + 1
+            return False
+
+    @abc.abstractmethod
+    def _allow(self, key: Hashable) -> bool:
+        """Return whether the next sampled record keyed ``key`` is logged."""
+
+    def take_summary(
+        self, force: bool = False
+    ) -> Optional[Dict[Hashable, int]]:
+        """Return and reset the suppressed counts once they are due."""
+        if not self._suppressed:
+            return None
+        now = time.monotonic()
+        if not force and now < self._next_summary:
+            return None
+        with self._lock:
+            summary, self._suppressed = self._suppressed, {}
+            self._next_summary = now + self.summary_interval
+        return summary or None
+
+
+class ProbabilisticSampler(Sampler):
+    """Logs each record with probability ``rate``.
+
+    ``rates`` overrides the probability for individual keys.
+    """
+
+    def __init__(
+        self,
+        rate: float = 0.1,
+        rates: Optional[Dict[Hashable, float]] = None,
+        max_level: str = "INFO",
+        summary_interval: float = 60.0,
+        seed: Optional[int] = None,
+    ):
+        super().__init__(max_level, summary_interval)
+        self.rate = rate
+        self.rates = rates or {}
+        self._random = random.Random(seed).random
+
+    def _allow(self, key: Hashable) -> bool:
+        rates = self.rates
+        rate = rates.get(key, self.rate) if rates else self.rate
+        return self._random() < rate
+
+
+class RateLimitSampler(Sampler):
+    """Token bucket per key allowing ``rate`` records per second.
+
+    Up to ``burst`` records (by default ``rate``) may pass at once.
+    """
+
+    def __init__(
+        self,
+        rate: float = 10.0,
+        burst: Optional[int] = None,
+        max_level: str = "INFO",
+        summary_interval: float = 60.0,
+    ):
+        super().__init__(max_level, summary_interval)
+        self.rate = rate
+        self.burst = max(1.0, rate) if burst is None else float(burst)
+        self._buckets: Dict[Hashable, List[float]] = {}
+
+    def _allow(self, key: Hashable) -> bool:
+        now = time.monotonic()
+        buckets = self._buckets
+        bucket = buckets.get(key)
+        if bucket is None:
+            if len(buckets) >= MAX_KEYS:
+                buckets.clear()
+            bucket = buckets[key] = [self.burst, now]
+        else:
+            tokens = bucket[0] + (now - bucket[1]) * self.rate
+            bucket[0] = tokens if tokens < self.burst else self.burst
+            bucket[1] = now
+        if bucket[0] >= 1.0:
+            bucket[0] -= 1.0
+            return True
+        return False
+
+
+class FirstNSampler(Sampler):
+    """Logs the first ``first`` records of a key, then every ``every``-th.
+
+    With ``period`` set, the counts start over every ``period`` seconds.
+    """
+
+    def __init__(
+        self,
+        first: int = 10,
+        every: int = 100,
+        period: Optional[float] = None,
+        max_level: str = "INFO",
+        summary_interval: float = 60.0,
+    ):
+        super().__init__(max_level, summary_interval)
+        self.first = first
+        self.every = every
+        self.period = period
+        self._counts: Dict[Hashable, int] = {}
+        self._reset_at = (
+            time.monotonic() + period if period is not None else None
+        )
+
+    def _allow(self, key: Hashable) -> bool:
+        counts = self._counts
+        reset_at = self._reset_at
+        if reset_at is not None and time.monotonic() >= reset_at:
+            counts.clear()
+            self._reset_at = time.monotonic() + self.period  # type: ignore
+        elif len(counts) >= MAX_KEYS and key not in counts:
+            counts.clear()
+        count = counts.get(key, 0) + 1
+        counts[key] = count
+        return count <= self.first or (count - self.first) % self.every == 0
+
+
+def summary_extra(summary: Dict[Hashable, Any]) -> Dict[str, Any]:
+    """Build the ``extra`` of a suppressed-records summary."""
+    by_key = {}
+    for key, count in summary.items():
+        if isinstance(key, tuple):
+            key = ":".join(map(str, key))
+        by_key[str(key)] = count
+    return {"suppressed": sum(summary.values()), "suppressed_by_key": by_key}
@@ -0,0 +1,173 @@
+import dataclasses
+import datetime
+import enum
+import json
+from typing import Any, Callable, Dict, List, Optional, Type, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None  # type: ignore[assignment]
+
+try:
+    import msgspec  # type: ignore[import]
+except ImportError:  # pragma: no cover - optional dependency
+    msgspec = None  # type: ignore[assignment]
+
+try:
+    import ujson  # type: ignore[import]
+except ImportError:  # pragma: no cover - optional dependency
+    ujson = None  # type: ignore[assignment]
+
+# Backends tried by "auto", fastest first
+AUTO_ORDER = ("orjson", "msgspec", "ujson", "stdlib")
+
+
+def json_default(obj: Any) -> Any:
+    """Convert values the JSON backends do not handle natively.
+
+    Every backend routes unknown types through this function, so the
+    output is the same whichever one is installed.
+    """
+    if isinstance(obj, (datetime.datetime, datetime.date, datetime.time)):
+        return obj.isoformat()
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return dataclasses.asdict(obj)
+    if isinstance(obj, enum.Enum):
+        return obj.value
+    if isinstance(obj, (bytes, bytearray)):
+        return bytes(obj).decode("utf-8", errors="replace")
+    try:
+        return str(obj)
+    except Exception:
+        return f"<unserializable {type(obj).__name__}>"
+
+
+class Serializer:
+    """Serializes log records to UTF-8 encoded compact JSON."""
+
+    name = "stdlib"
+
+    def dumps(self, obj: Any) -> bytes:
+        return json.dumps(
+            obj,
+            default=json_default,
+            ensure_ascii=False,
+            separators=(",", ":"),
+        ).encode("utf-8", errors="replace")
+
+
+class DumpsSerializer(Serializer):
+    """Serializes through a ``json.dumps`` compatible function.
+
+    Used for the ``json_*`` options of python-json-logger, which it calls
+    like python-json-logger does; the output is spaced unless ``dumps``
+    says otherwise.
+    """
+
+    def __init__(
+        self,
+        dumps: Callable[..., str] = json.dumps,
+        default: Optional[Callable[[Any], Any]] = json_default,
+        encoder: Optional[Type[json.JSONEncoder]] = None,
+        indent: Optional[Union[int, str]] = None,
+        ensure_ascii: bool = False,
+    ):
+        self._dumps = dumps
+        self._default = default
+        self._encoder = encoder
+        self._indent = indent
+        self._ensure_ascii = ensure_ascii
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._dumps(
+            obj,
+            default=self._default,
+            cls=self._encoder,
+            indent=self._indent,
+            ensure_ascii=self._ensure_ascii,
+        ).encode("utf-8", errors="replace")
+
+
+class OrjsonSerializer(Serializer):
+    name = "orjson"
+
+    def __init__(self) -> None:
+        self._option = orjson.OPT_NON_STR_KEYS
+
+    def dumps(self, obj: Any) -> bytes:
+        try:
+            return orjson.dumps(obj, default=json_default, option=self._option)
+        except TypeError:
+            # Values orjson refuses outright, such as integers wider than
+            # 64 bits or lone surrogates, still get logged.
+            return super().dumps(obj)
+
+
+class MsgspecSerializer(Serializer):
+    name = "msgspec"
+
+    def __init__(self) -> None:
+        self._encoder = msgspec.json.Encoder(enc_hook=json_default)
+
+    def dumps(self, obj: Any) -> bytes:
+        try:
+            return self._encoder.encode(obj)
+        except (TypeError, msgspec.EncodeError):
+            return super().dumps(obj)
+
+
+class UjsonSerializer(Serializer):
+    name = "ujson"
+
+    def dumps(self, obj: Any) -> bytes:
+        try:
+            return ujson.dumps(
+                obj,
+                default=json_default,
+                ensure_ascii=False,
+                escape_forward_slashes=False,
+            ).encode("utf-8")
+        except (TypeError, OverflowError, UnicodeEncodeError):
+            return super().dumps(obj)
+
+
+_BACKENDS: Dict[str, Callable[[], Serializer]] = {
+    "orjson": OrjsonSerializer,
+    "msgspec": MsgspecSerializer,
+    "ujson": UjsonSerializer,
+    "stdlib": Serializer,
+}
+
+_MODULES = {"orjson": orjson, "msgspec": msgspec, "ujson": ujson}
+
+
+def available_serializers() -> List[str]:
+    """Return the names of the installed backends, fastest first."""
+    return [
+        name
+        for name in AUTO_ORDER
+        if name == "stdlib" or _MODULES[name] is not None
+    ]
+
+
+def get_serializer(name: Union[str, Serializer] = "auto") -> Serializer:
+    """Return a serializer by backend name.
+
+    ``"auto"`` picks the fastest installed backend and falls back to the
+    standard library ``json`` module.
+    """
+    if isinstance(name, Serializer):
+        return name
+    if name == "auto":
+        name = available_serializers()[0]
+    if name not in _BACKENDS:
+        raise ValueError(
+            f"Unknown serializer {name!r}, "
+            f"expected one of auto, {', '.join(AUTO_ORDER)}"
+        )
+    if name != "stdlib" and _MODULES[name] is None:
+        raise ImportError(f"Serializer {name!r} requires {name} installed")
+    return _BACKENDS[name]()
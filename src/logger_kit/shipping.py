@@ -0,0 +1,413 @@
+import gzip
+import http.client
+import logging
+import os
+import socket
+import ssl
+import sys
+import threading
+import time
+import traceback
+from typing import Dict, List, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+from .formatters import format_bytes
+from .queueing import RecordQueue
+
+SCHEMES = ("http", "https", "tcp")
+
+
+class DeliveryError(Exception):
+    """A payload was not accepted by the collector.
+
+    ``retryable`` tells whether sending it again may succeed.
+    """
+
+    def __init__(self, message: str, retryable: bool = True):
+        super().__init__(message)
+        self.retryable = retryable
+
+
+class _HTTPConnection:
+    """Keep-alive HTTP connection POSTing payloads to one URL."""
+
+    def __init__(
+        self,
+        url: str,
+        headers: Dict[str, str],
+        timeout: float,
+        ssl_context: Optional[ssl.SSLContext],
+    ):
+        parts = urlsplit(url)
+        self.scheme = parts.scheme
+        self.host = parts.hostname or "localhost"
+        self.port = parts.port
+        self.path = parts.path or "/"
+        if parts.query:
+            self.path += "?" + parts.query
+        self.headers = headers
+        self.timeout = timeout
+        self.ssl_context = ssl_context
+        self._conn: Optional[http.client.HTTPConnection] = None
+
+    def send(self, payload: bytes, headers: Dict[str, str]) -> None:
+        if self._conn is None:
+            if self.scheme == "https":
+                self._conn = http.client.HTTPSConnection(
+                    self.host,
+                    self.port,
+                    timeout=self.timeout,
+                    context=self.ssl_context,
+                )
+            else:
+                self._conn = http.client.HTTPConnection(
+                    self.host, self.port, timeout=self.timeout
+                )
+        try:
+            self._conn.request(
+                "POST", self.path, payload, {**self.headers, **headers}
+            )
+            response = self._conn.getresponse()
+            # The body must be read for the connection to be reused
+            response.read()
+        except (OSError, http.client.HTTPException) as e:
+            self.close()
+            raise DeliveryError(str(e)) from e
+        if response.will_close:
+            self.close()
+        status = response.status
+        if status >= 300:
+            raise DeliveryError(
+                f"Collector answered {status} {response.reason}",
+                retryable=status == 429 or status >= 500,
+            )
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+class _TCPConnection:
+    """Persistent TCP connection streaming newline-delimited payloads."""
+
+    def __init__(self, url: str, timeout: float):
+        parts = urlsplit(url)
+        self.address = (parts.hostname or "localhost", parts.port or 5170)
+        self.timeout = timeout
+        self._sock: Optional[socket.socket] = None
+
+    def send(self, payload: bytes, headers: Dict[str, str]) -> None:
+        try:
+            if self._sock is None:
+                self._sock = socket.create_connection(
+                    self.address, timeout=self.timeout
+                )
+            self._sock.sendall(payload)
+        except OSError as e:
+            self.close()
+            raise DeliveryError(str(e)) from e
+
+    def close(self) -> None:
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+
+
+_Connection = Union[_HTTPConnection, _TCPConnection]
+
+
+class NDJSONShippingHandler(logging.Handler):
+    """Ships records to a collector as newline-delimited JSON batches.
+
+    Records are encoded on the caller's thread and put in a bounded
+    queue. ``connections`` sender threads, each owning one persistent
+    connection, take up to ``batch_size`` records at a time, waiting up
+    to ``linger`` seconds for a batch to fill, and POST them as one
+    payload (``http``/``https`` URLs, optionally gzip compressed) or
+    stream them over a socket (``tcp://host:port``). With more than one
+    connection, batches may arrive out of order.
+
+    A failed batch is retried ``max_retries`` times with exponential
+    backoff. If it still cannot be delivered and ``spill_dir`` is set, it
+    is written there and sent again, oldest first, once the collector
+    accepts a batch; the spill directory holds at most
+    ``max_spill_bytes``, dropping its oldest files beyond that. Payloads
+    rejected with a 4xx status other than 429 are not retried.
+    """
+
+    accepts_compact = True
+
+    def __init__(
+        self,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        compress: bool = False,
+        batch_size: int = 500,
+        linger: float = 0.5,
+        capacity: int = 10000,
+        overflow: str = "drop_oldest",
+        connections: int = 1,
+        timeout: float = 5.0,
+        max_retries: int = 3,
+        retry_delay: float = 0.5,
+        spill_dir: Optional[str] = None,
+        max_spill_bytes: int = 100 * 1024 * 1024,
+        ssl_context: Optional[ssl.SSLContext] = None,
+    ):
+        scheme = urlsplit(url).scheme
+        if scheme not in SCHEMES:
+            raise ValueError(
+                f"Unsupported URL scheme {scheme!r}, "
+                f"expected one of {', '.join(SCHEMES)}"
+            )
+        super().__init__()
+        self.url = url
+        self.compress = compress and scheme != "tcp"
+        self.batch_size = batch_size
+        self.linger = linger
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.spill_dir = spill_dir
+        self.max_spill_bytes = max_spill_bytes
+        self.sent = 0
+        self.failed = 0
+        self.spilled = 0
+        self.queue = RecordQueue(capacity, overflow)
+        if spill_dir is not None:
+            os.makedirs(spill_dir, exist_ok=True)
+        # Left over from a previous run, or written since the last replay
+        self._spill_pending = bool(self._spilled_files())
+        headers = {"Content-Type": "application/x-ndjson", **(headers or {})}
+        self._spill_lock = threading.Lock()
+        # Set while a sender replays the spill directory
+        self._replaying = False
+        self._stopped = threading.Event()
+        self._connections = [
+            (
+                _TCPConnection(url, timeout)
+                if scheme == "tcp"
+                else _HTTPConnection(url, headers, timeout, ssl_context)
+            )
+            for _ in range(connections)
+        ]
+        self._senders = [
+            threading.Thread(
+                target=self._run,
+                args=(connection,),
+                name=f"logger-kit-shipper-{index}",
+            )
+            for index, connection in enumerate(self._connections)
+        ]
+        for sender in self._senders:
+            sender.daemon = True
+            sender.start()
+
+    @property
+    def dropped(self) -> int:
+        return self.queue.dropped_oldest + self.queue.dropped_new
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put(format_bytes(self.formatter, record))
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+    def _next_batch(self) -> List[bytes]:
+        queue = self.queue
+        batch = queue.get_batch(self.batch_size)
+        deadline = time.monotonic() + self.linger
+        while batch and len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or queue.closed:
+                break
+            more = queue.get_batch(self.batch_size - len(batch), remaining)
+            if not more:
+                break
+            batch += more
+        return batch
+
+    def _encode(self, batch: List[bytes]) -> Tuple[bytes, Dict[str, str]]:
+        payload = b"\n".join(batch) + b"\n"
+        if self.compress:
+            return gzip.compress(payload, 6), {"Content-Encoding": "gzip"}
+        return payload, {}
+
+    def _deliver(
+        self, connection: _Connection, payload: bytes, headers: Dict[str, str]
+    ) -> bool:
+        """Send one payload with retries; False if it was not delivered."""
+        delay = self.retry_delay
+        for attempt in range(self.max_retries + 1):
+            try:
+                connection.send(payload, headers)
+                return True
+            except DeliveryError as e:
+                if not e.retryable:
+                    raise
+                if attempt == self.max_retries or self._stopped.is_set():
+                    return False
+                self._stopped.wait(delay)
+                delay *= 2
+        return False
+
+    def _run(self, connection: _Connection) -> None:
+        queue = self.queue
+        while True:
+            batch = self._next_batch()
+            if not batch:
+                connection.close()
+                return
+            try:
+                payload, headers = self._encode(batch)
+                if self._deliver(connection, payload, headers):
+                    self.sent += len(batch)
+                    self._replay_spilled(connection)
+                elif self.spill_dir is not None:
+                    self._spill(payload, headers, len(batch))
+                else:
+                    self.failed += len(batch)
+            except DeliveryError as e:
+                self.failed += len(batch)
+                self._report(f"Dropped log batch of {len(batch)}: {e}")
+            except Exception:
+                traceback.print_exc(file=sys.stderr)
+                self.failed += len(batch)
+            queue.task_done(len(batch))
+
+    def _spill(
+        self, payload: bytes, headers: Dict[str, str], count: int
+    ) -> None:
+        suffix = ".ndjson.gz" if headers else ".ndjson"
+        name = f"{time.time_ns():020d}-{threading.get_ident()}{suffix}"
+        path = os.path.join(self.spill_dir, name)  # type: ignore[arg-type]
+        with self._spill_lock:
+            with open(path + ".tmp", "wb") as f:
+                f.write(payload)
+            os.replace(path + ".tmp", path)
+            self._spill_pending = True
+            self.spilled += count
+            self._trim_spill()
+
+    def _spilled_files(self) -> List[str]:
+        spill_dir = self.spill_dir
+        if spill_dir is None:
+            return []
+        return sorted(
+            os.path.join(spill_dir, name)
+            for name in os.listdir(spill_dir)
+            if name.endswith((".ndjson", ".ndjson.gz"))
+        )
+
+    def _trim_spill(self) -> None:
+        files = self._spilled_files()
+        sizes = [os.path.getsize(path) for path in files]
+        total = sum(sizes)
+        for path, size in zip(files, sizes):
+            if total <= self.max_spill_bytes:
+                break
+            os.remove(path)
+            total -= size
+
+    def _report(self, message: str) -> None:
+        """Report a dropped batch like handleError() reports errors."""
+        if logging.raiseExceptions and logging.lastResort is not None:
+            logging.lastResort.handle(
+                logging.makeLogRecord(
+                    {
+                        "name": __name__,
+                        "msg": message,
+                        "levelno": logging.WARNING,
+                        "levelname": "WARNING",
+                    }
+                )
+            )
+
+    def _replay_spilled(self, connection: _Connection) -> None:
+        """Send spilled payloads, oldest first, while the collector is up.
+
+        One sender replays at a time; the others keep sending new batches
+        and spilling meanwhile.
+        """
+        if not self._spill_pending:
+            return
+        with self._spill_lock:
+            if self._replaying or not self._spill_pending:
+                return
+            self._replaying = True
+            self._spill_pending = False
+            files = self._spilled_files()
+        try:
+            for path in files:
+                try:
+                    with open(path, "rb") as f:
+                        payload = f.read()
+                except FileNotFoundError:
+                    # Trimmed away by a sender spilling meanwhile
+                    continue
+                headers = (
+                    {"Content-Encoding": "gzip"}
+                    if path.endswith(".gz")
+                    else {}
+                )
+                try:
+                    connection.send(payload, headers)
+                except DeliveryError as e:
+                    if e.retryable:
+                        self._spill_pending = True
+                        return
+                    self._report(f"Dropped spilled log batch {path}: {e}")
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+        finally:
+            self._replaying = False
+
+    def _max_wait(self) -> float:
+        """Return how long retrying one batch can take."""
+        return self.retry_delay * 2 ** (self.max_retries + 1) + 5
+
+    def drain(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every queued record has been shipped or given up.
+
+        Without ``timeout`` the wait is bounded by the time retries take.
+        Returns False if the timeout expired first.
+        """
+        if threading.current_thread() in self._senders:
+            return False
+        if timeout is None:
+            timeout = self._max_wait()
+        return self.queue.join(timeout)
+
+    def flush(self) -> None:
+        """Wait, at most the time retries take, for queued records.
+
+        Bounded so an unreachable collector cannot hang logging.shutdown().
+        """
+        self.drain()
+
+    def close(self, timeout: Optional[float] = 10.0) -> None:
+        """Ship what is queued, waiting up to ``timeout`` seconds.
+
+        Without ``timeout`` the wait is bounded by the time retries take.
+        """
+        if timeout is None:
+            timeout = self._max_wait()
+        self.acquire()
+        try:
+            self.queue.close()
+            self._join_senders(timeout)
+            # Undelivered batches are spilled or counted right away now
+            self._stopped.set()
+            self._join_senders(timeout)
+        finally:
+            self.release()
+            super().close()
+
+    def _join_senders(self, timeout: float) -> None:
+        deadline = time.monotonic() + timeout
+        for sender in self._senders:
+            sender.join(max(0.0, deadline - time.monotonic()))
@@ -0,0 +1,235 @@
+import datetime
+import errno
+import logging
+import logging.handlers
+import os
+import socket
+import sys
+import threading
+import traceback
+from typing import List, Optional, Tuple, Union
+
+from .formatters import format_bytes
+from .levels import NOTICE, TRACE
+from .queueing import RecordQueue
+
+TRANSPORTS = ("tcp", "unix")
+
+Address = Union[Tuple[str, int], str]
+
+# RFC 5424 NILVALUE
+_NIL = "-"
+
+# Syslog severities by level name, including logger-kit's own levels
+PRIORITY_MAP = {
+    **logging.handlers.SysLogHandler.priority_map,
+    logging.getLevelName(NOTICE): "notice",
+    logging.getLevelName(TRACE): "debug",
+}
+
+
+def _header_field(value: Optional[str], limit: int) -> str:
+    """Return a header field made of printable US-ASCII, or NILVALUE."""
+    if not value:
+        return _NIL
+    cleaned = "".join(c for c in value if "!" <= c <= "~")
+    return cleaned[:limit] or _NIL
+
+
+class BatchingSysLogHandler(logging.Handler):
+    """Syslog handler sending RFC 5424 messages over TCP or a UNIX socket.
+
+    Records are framed on the caller's thread and put in a bounded queue;
+    a sender thread writes them in batches over one persistent
+    connection. TCP and UNIX stream sockets use octet-counting framing
+    (RFC 6587), so messages of any size arrive whole. A UNIX datagram
+    socket such as /dev/log gets one datagram per message.
+
+    When the connection drops the sender reconnects with exponential
+    backoff and resends the whole batch it was sending, so delivery is at
+    least once. Meanwhile the queue keeps filling up to ``capacity``
+    records and the ``overflow`` policy applies; drops are counted in
+    ``dropped``. Messages given up on (too large for a datagram, or still
+    undeliverable at close) are counted in ``failed``.
+    """
+
+    accepts_compact = True
+
+    def __init__(
+        self,
+        address: Address = ("localhost", 514),
+        facility: int = logging.handlers.SysLogHandler.LOG_USER,
+        transport: str = "tcp",
+        app_name: Optional[str] = None,
+        hostname: Optional[str] = None,
+        capacity: int = 10000,
+        overflow: str = "drop_oldest",
+        batch_size: int = 256,
+        timeout: float = 5.0,
+        reconnect_delay: float = 0.5,
+        max_reconnect_delay: float = 30.0,
+    ):
+        if transport not in TRANSPORTS:
+            raise ValueError(
+                f"Unknown transport {transport!r}, "
+                f"expected one of {', '.join(TRANSPORTS)}"
+            )
+        super().__init__()
+        self.address = address
+        self.facility = facility
+        self.transport = transport
+        self.batch_size = batch_size
+        self.timeout = timeout
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.sent = 0
+        self.failed = 0
+        self.reconnects = 0
+        self.queue = RecordQueue(capacity, overflow)
+        self._hostname = _header_field(hostname or socket.gethostname(), 255)
+        self._app_name = _header_field(
+            app_name or os.path.basename(sys.argv[0] or "python"), 48
+        )
+        self._procid = str(os.getpid())
+        self._socket: Optional[socket.socket] = None
+        self._datagram = False
+        self._stopped = threading.Event()
+        self._sender = threading.Thread(
+            target=self._run, name="logger-kit-syslog"
+        )
+        self._sender.daemon = True
+        self._sender.start()
+
+    @property
+    def dropped(self) -> int:
+        return self.queue.dropped_oldest + self.queue.dropped_new
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put(self.frame(record))
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+    def frame(self, record: logging.LogRecord) -> bytes:
+        """Encode ``record`` as an RFC 5424 message."""
+        severity = PRIORITY_MAP.get(record.levelname, "warning")
+        priority = (self.facility << 3) | (
+            logging.handlers.SysLogHandler.priority_names[severity]
+        )
+        timestamp = datetime.datetime.fromtimestamp(
+            record.created, datetime.timezone.utc
+        ).isoformat(timespec="microseconds")
+        header = (
+            f"<{priority}>1 {timestamp[:-6]}Z {self._hostname} "
+            f"{self._app_name} {self._procid} "
+            f"{_header_field(record.name, 32)} - "
+        )
+        return header.encode("ascii") + format_bytes(self.formatter, record)
+
+    def _connect(self) -> socket.socket:
+        if self.transport == "tcp":
+            sock = socket.create_connection(
+                self.address, timeout=self.timeout  # type: ignore[arg-type]
+            )
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self._datagram = False
+            return sock
+        try:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+            sock.settimeout(self.timeout)
+            sock.connect(self.address)
+            self._datagram = True
+        except OSError:
+            sock.close()
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            try:
+                sock.connect(self.address)
+            except OSError:
+                sock.close()
+                raise
+            self._datagram = False
+        return sock
+
+    def _send(self, batch: List[bytes]) -> None:
+        if self._socket is None:
+            self._socket = self._connect()
+        sock = self._socket
+        if self._datagram:
+            for message in batch:
+                try:
+                    sock.send(message)
+                except OSError as e:
+                    if e.errno != errno.EMSGSIZE:
+                        raise
+                    self.failed += 1
+        else:
+            sock.sendall(b"".join(b"%d %s" % (len(m), m) for m in batch))
+
+    def _run(self) -> None:
+        queue = self.queue
+        delay = self.reconnect_delay
+        while True:
+            batch = queue.get_batch(self.batch_size)
+            if not batch:
+                return
+            while True:
+                try:
+                    self._send(batch)
+                    self.sent += len(batch)
+                    delay = self.reconnect_delay
+                    break
+                except OSError:
+                    self._disconnect()
+                    if self._stopped.is_set():
+                        # Closing: give up on what cannot be delivered
+                        self.failed += len(batch)
+                        break
+                    self.reconnects += 1
+                    self._stopped.wait(delay)
+                    delay = min(delay * 2, self.max_reconnect_delay)
+                except Exception:
+                    traceback.print_exc(file=sys.stderr)
+                    self.failed += len(batch)
+                    break
+            queue.task_done(len(batch))
+
+    def _disconnect(self) -> None:
+        if self._socket is not None:
+            try:
+                self._socket.close()
+            except OSError:
+                pass
+            self._socket = None
+
+    def drain(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every queued message has been sent or given up.
+
+        Waits at most ``timeout`` seconds, the socket timeout by default,
+        and returns False if it expired first.
+        """
+        if threading.current_thread() is self._sender:
+            return False
+        return self.queue.join(self.timeout if timeout is None else timeout)
+
+    def flush(self) -> None:
+        """Wait, at most the socket timeout, for queued messages.
+
+        Bounded so an unreachable server cannot hang logging.shutdown().
+        """
+        self.drain()
+
+    def close(self, timeout: Optional[float] = 5.0) -> None:
+        """Send what is queued, waiting up to ``timeout`` seconds."""
+        self.acquire()
+        try:
+            self.queue.close()
+            self._sender.join(timeout)
+            self._stopped.set()
+            self._sender.join(timeout)
+            self._disconnect()
+        finally:
+            self.release()
+            super().close()
@@ -0,0 +1,97 @@
+import contextvars
+import logging
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+# Creation time, level, message and its arguments, extra (all possibly
+# still lazy), the logger (or bound child) that logged the record and
+# the caller, if looked up
+Entry = Tuple[float, str, Any, Tuple[Any, ...], Any, Any, Any]
+# The LogContext a buffer belongs to, and the buffer
+_Slot = Optional[Tuple[Any, Deque[Entry]]]
+
+
+class TailBuffer:
+    """Keeps recent records below the logger level until an error occurs.
+
+    Records at or above ``level`` that the logger level filters out are
+    stored as plain tuples, before any masking, copying or formatting,
+    in a ring of the last ``capacity`` records. When a record at or above
+    ``trigger_level`` is logged, the buffered records are logged first,
+    with their original timestamps, and the buffer starts over.
+
+    Buffers are kept per ``logger.context()`` block, and outside of one
+    per thread or asyncio task, so an error only brings up the history of
+    the request it happened in. As with queued loggers, ``extra`` must not
+    be mutated after the call returns.
+    """
+
+    def __init__(
+        self,
+        capacity: int = 100,
+        level: str = "DEBUG",
+        trigger_level: str = "ERROR",
+    ):
+        self.capacity = capacity
+        self.level = logging.getLevelName(level.upper())
+        self.trigger_level = logging.getLevelName(trigger_level.upper())
+        self.flushed = 0
+        # Per-level answers of buffers() and triggers()
+        self._buffered_levels: Dict[str, bool] = {}
+        self._trigger_levels: Dict[str, bool] = {}
+        self._buffer: "contextvars.ContextVar[_Slot]" = contextvars.ContextVar(
+            f"logger_kit_tail_{id(self)}", default=None
+        )
+
+    @staticmethod
+    def _answer(answers: Dict[str, bool], level: str, threshold: int) -> bool:
+        levelno = logging.getLevelName(level)
+        answer = isinstance(levelno, int) and levelno >= threshold
+        answers[level] = answer
+        return answer
+
+    def buffers(self, level: str) -> bool:
+        """Return whether filtered out records at ``level`` are kept."""
+        try:
+            return self._buffered_levels[level]
+        except KeyError:
+            return self._answer(self._buffered_levels, level, self.level)
+
+    def triggers(self, level: str) -> bool:
+        """Return whether a record at ``level`` flushes the buffer."""
+        try:
+            return self._trigger_levels[level]
+        except KeyError:
+            return self._answer(
+                self._trigger_levels, level, self.trigger_level
+            )
+
+    def append(
+        self,
+        context: Any,
+        level: str,
+        message: Any,
+        args: Tuple[Any, ...],
+        extra: Any,
+        logger: Any,
+        caller: Any = None,
+    ) -> None:
+        """Keep a record logged within the LogContext ``context``."""
+        current = self._buffer.get()
+        if current is None or current[0] is not context:
+            current = (context, deque(maxlen=self.capacity))
+            self._buffer.set(current)
+        current[1].append(
+            (time.time(), level, message, args, extra, logger, caller)
+        )
+
+    def take(self, context: Any) -> List[Entry]:
+        """Return and clear the records kept within ``context``."""
+        current = self._buffer.get()
+        if current is None or current[0] is not context or not current[1]:
+            return []
+        entries = list(current[1])
+        current[1].clear()
+        self.flushed += len(entries)
+        return entries
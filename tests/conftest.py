@@ -0,0 +1,53 @@
+import json
+import logging
+
+import pytest
+
+from logger_kit.formatters import RecordFormatter
+
+
+@pytest.fixture
+def make_logger():
+    """Return a factory of stdlib loggers writing only to ``handler``."""
+
+    def make(name, handler):
+        handler.setFormatter(RecordFormatter(fields=["message"]))
+        logger = logging.getLogger(name)
+        logger.handlers = [handler]
+        logger.propagate = False
+        logger.setLevel(logging.DEBUG)
+        return logger
+
+    return make
+
+
+@pytest.fixture
+def read_lines():
+    """Return a reader of the JSON lines in a log file."""
+
+    def read(path):
+        with open(path, encoding="utf-8") as f:
+            return [json.loads(line) for line in f]
+
+    return read
+
+
+@pytest.fixture
+def read_messages(read_lines):
+    """Return a reader of the messages in a log file."""
+
+    def read(path):
+        return [record["message"] for record in read_lines(path)]
+
+    return read
+
+
+@pytest.fixture
+def console_messages(capsys):
+    """Return a reader of the JSON records written to stderr so far."""
+
+    def read():
+        out = capsys.readouterr().err
+        return [json.loads(line) for line in out.splitlines()]
+
+    return read
@@ -0,0 +1,147 @@
+from logger_kit import Logger
+from logger_kit.dedup import Deduplicator
+
+
+def test_duplicates_collapse_into_one_record(console_messages):
+    logger = Logger("dedup_collapse_test", deduplicator=Deduplicator(60))
+
+    for i in range(1000):
+        logger.error("Database unavailable", extra={"attempt": i})
+    logger.close()
+
+    first, aggregate = console_messages()
+    assert first["attempt"] == 0
+    assert "repeat_count" not in first
+    assert aggregate["@message"] == "Database unavailable"
+    assert aggregate["levelname"] == "ERROR"
+    assert aggregate["repeat_count"] == 999
+    assert aggregate["attempt"] == 999
+    assert aggregate["first_seen"] <= aggregate["last_seen"]
+
+
+def test_window_expiry_emits_aggregate(monkeypatch, console_messages):
+    now = [100.0]
+    monkeypatch.setattr("time.monotonic", lambda: now[0])
+    logger = Logger("dedup_window_test", deduplicator=Deduplicator(1.0))
+
+    for _ in range(3):
+        logger.warning("Retrying")
+    now[0] += 1.5
+    logger.warning("Retrying")
+
+    records = console_messages()
+    assert [r.get("repeat_count") for r in records] == [None, 2, None]
+
+
+def test_flush_emits_expired_aggregates(monkeypatch, console_messages):
+    now = [100.0]
+    monkeypatch.setattr("time.monotonic", lambda: now[0])
+    logger = Logger("dedup_flush_test", deduplicator=Deduplicator(1.0))
+
+    for _ in range(3):
+        logger.warning("Retrying")
+    logger.flush()
+    assert len(console_messages()) == 1
+    now[0] += 1.5
+    logger.flush()
+
+    (aggregate,) = console_messages()
+    assert aggregate["repeat_count"] == 2
+
+
+def test_first_seen_is_the_first_record(monkeypatch):
+    wall = [1700000000.0]
+    monkeypatch.setattr("time.time", lambda: wall[0])
+    deduplicator = Deduplicator(60)
+    emitted = []
+
+    def emit(*record):
+        emitted.append(record)
+
+    for _ in range(3):
+        deduplicator.check("INFO", "Polling", None, emit)
+        wall[0] += 5
+    deduplicator.flush(emit)
+
+    ((_, _, extra, _),) = emitted
+    assert extra["first_seen"] == "2023-11-14T22:13:20+00:00"
+    assert extra["last_seen"] == "2023-11-14T22:13:30+00:00"
+
+
+def test_aggregate_keeps_the_fields_of_its_context(console_messages):
+    logger = Logger("dedup_context_test", deduplicator=Deduplicator(60))
+
+    with logger.context(request_id="a"):
+        logger.error("Timeout")
+        logger.error("Timeout")
+    with logger.context(request_id="b"):
+        logger.info("Other request")
+        logger.close()
+
+    records = console_messages()
+    assert [(r["@message"], r["request_id"]) for r in records] == [
+        ("Timeout", "a"),
+        ("Other request", "b"),
+        ("Timeout", "a"),
+    ]
+    assert records[-1]["repeat_count"] == 1
+
+
+def test_keys_split_fingerprints(console_messages):
+    logger = Logger(
+        "dedup_keys_test", deduplicator=Deduplicator(60, keys=["user_id"])
+    )
+
+    for _ in range(3):
+        logger.info("Login failed", extra={"user_id": 1, "ip": "a"})
+        logger.info("Login failed", extra={"user_id": 2, "ip": "b"})
+    logger.close()
+
+    records = console_messages()
+    assert [(r["user_id"], r.get("repeat_count")) for r in records] == [
+        (1, None),
+        (2, None),
+        (1, 2),
+        (2, 2),
+    ]
+
+
+def test_levels_are_distinct(console_messages):
+    logger = Logger("dedup_levels_test", deduplicator=Deduplicator(60))
+
+    logger.info("Same text")
+    logger.error("Same text")
+
+    assert [r["levelname"] for r in console_messages()] == ["INFO", "ERROR"]
+
+
+def test_lru_eviction_emits_pending_aggregate(console_messages):
+    logger = Logger(
+        "dedup_lru_test", deduplicator=Deduplicator(60, max_entries=2)
+    )
+
+    logger.info("one")
+    logger.info("one")
+    logger.info("two")
+    logger.info("three")
+
+    records = console_messages()
+    assert [(r["@message"], r.get("repeat_count")) for r in records] == [
+        ("one", None),
+        ("two", None),
+        ("one", 1),
+        ("three", None),
+    ]
+
+
+def test_unhashable_key_values():
+    deduplicator = Deduplicator(60, keys=["payload"])
+    emitted = []
+
+    def emit(*args):
+        emitted.append(args)
+
+    extra = {"payload": {"nested": [1]}}
+    assert deduplicator.check("INFO", "msg", extra, emit)
+    assert not deduplicator.check("INFO", "msg", dict(extra), emit)
+    assert deduplicator.suppressed == 1
@@ -0,0 +1,258 @@
+import dataclasses
+import datetime
+import enum
+import io
+import json
+import logging
+import os
+import sys
+
+import pytest
+
+from logger_kit import Logger
+from logger_kit.formatters import JsonFormatter, RecordFormatter
+from logger_kit.serializers import (
+    available_serializers,
+    get_serializer,
+    json_default,
+)
+
+
+class Color(enum.Enum):
+    RED = "red"
+
+
+@dataclasses.dataclass
+class Point:
+    x: int
+    y: int
+
+
+class Opaque:
+    def __str__(self):
+        return "opaque"
+
+
+PAYLOAD = {
+    "when": datetime.datetime(2025, 1, 2, 3, 4, 5, 678000),
+    "day": datetime.date(2025, 1, 2),
+    "tags": {"a"},
+    "point": Point(1, 2),
+    "color": Color.RED,
+    "raw": b"bytes",
+    "opaque": Opaque(),
+    "text": "héllo",
+    "nested": {"items": [1, 2.5, None, True]},
+}
+
+EXPECTED = {
+    "when": "2025-01-02T03:04:05.678000",
+    "day": "2025-01-02",
+    "tags": ["a"],
+    "point": {"x": 1, "y": 2},
+    "color": "red",
+    "raw": "bytes",
+    "opaque": "opaque",
+    "text": "héllo",
+    "nested": {"items": [1, 2.5, None, True]},
+}
+
+
+def make_record(msg="Test message", **extra):
+    record = logging.LogRecord(
+        "formatter_test", logging.INFO, __file__, 1, msg, (), None
+    )
+    record.__dict__.update(extra)
+    return record
+
+
+@pytest.mark.parametrize("backend", available_serializers())
+def test_serializers_are_consistent(backend):
+    serializer = get_serializer(backend)
+    data = serializer.dumps(PAYLOAD)
+
+    assert isinstance(data, bytes)
+    assert json.loads(data) == EXPECTED
+
+
+@pytest.mark.parametrize("backend", available_serializers())
+def test_serializers_fall_back_on_unsupported_values(backend):
+    serializer = get_serializer(backend)
+    assert json.loads(serializer.dumps({"big": 2**80})) == {"big": 2**80}
+
+
+def test_unknown_serializer():
+    with pytest.raises(ValueError):
+        get_serializer("pickle")
+
+
+def test_json_default_handles_unprintable_objects():
+    class Broken:
+        def __str__(self):
+            raise RuntimeError("no")
+
+    assert json_default(Broken()) == "<unserializable Broken>"
+
+
+@pytest.mark.parametrize("backend", available_serializers())
+def test_json_formatter_bytes(backend):
+    formatter = JsonFormatter(
+        fmt="%(name)s %(levelname)s %(message)s",
+        rename_fields={"message": "@message"},
+        serializer=backend,
+    )
+    record = make_record(user_id=123)
+
+    data = formatter.format_bytes(record)
+    assert formatter.format(record) == data.decode("utf-8")
+    assert json.loads(data) == {
+        "name": "formatter_test",
+        "levelname": "INFO",
+        "@message": "Test message",
+        "user_id": 123,
+    }
+
+
+def test_default_json_output_is_compact():
+    formatter = JsonFormatter("%(message)s", json_ensure_ascii=False)
+    assert formatter.format(make_record("é", user_id=1)) == (
+        '{"message":"é","user_id":1}'
+    )
+
+
+def test_python_json_logger_options_are_honoured():
+    record = make_record("é", point=Point(1, 2))
+    indented = JsonFormatter("%(message)s", json_indent=2)
+    assert indented.format(record) == json.dumps(
+        {"message": "é", "point": {"x": 1, "y": 2}},
+        indent=2,
+        ensure_ascii=False,
+    )
+
+    ascii_only = JsonFormatter("%(message)s", json_ensure_ascii=True)
+    assert ascii_only.format(record) == (
+        '{"message": "\\u00e9", "point": {"x": 1, "y": 2}}'
+    )
+
+    custom = JsonFormatter("%(message)s", json_default=repr)
+    assert json.loads(custom.format(record))["point"] == "Point(x=1, y=2)"
+
+
+def test_python_json_logger_options_need_stdlib():
+    with pytest.raises(ValueError):
+        JsonFormatter("%(message)s", json_indent=2, serializer="ujson")
+
+
+def test_logger_writes_bytes_to_console():
+    stream = io.TextIOWrapper(io.BytesIO(), encoding="utf-8")
+    logger = Logger(name="console_bytes_test", serializer="stdlib")
+    handler = logger.logger.handlers[0]
+    handler.setStream(stream)
+
+    stream.write("before\n")
+    logger.info("Console message", extra={"when": datetime.date(2025, 1, 2)})
+    stream.flush()
+
+    lines = stream.buffer.getvalue().decode("utf-8").splitlines()
+    assert lines[0] == "before"
+    entry = json.loads(lines[1])
+    assert entry["@message"] == "Console message"
+    assert entry["when"] == "2025-01-02"
+
+
+@pytest.mark.parametrize(
+    "encoding, newline",
+    [("latin-1", None), ("utf-8", "\r\n"), ("utf-8-sig", None)],
+)
+def test_console_honours_stream_encoding_and_newlines(encoding, newline):
+    stream = io.TextIOWrapper(
+        io.BytesIO(), encoding=encoding, newline=newline
+    )
+    logger = Logger(name="console_encoding_test", serializer="stdlib")
+    logger.logger.handlers[0].setStream(stream)
+
+    logger.info("Café")
+    logger.info("Crème")
+    stream.flush()
+
+    text = stream.buffer.getvalue().decode(encoding)
+    terminator = newline or os.linesep
+    lines = text.split(terminator)
+    assert lines[-1] == ""
+    assert [json.loads(line)["@message"] for line in lines[:-1]] == [
+        "Café",
+        "Crème",
+    ]
+
+
+def test_record_formatter_matches_json_formatter():
+    json_formatter = JsonFormatter(
+        fmt="%(asctime)s %(name)s %(levelname)s %(message)s",
+        rename_fields={"message": "@message"},
+    )
+    record_formatter = RecordFormatter(rename_fields={"message": "@message"})
+    record = make_record("Hello %s", user_id=123, nested={"a": [1, 2]})
+    record.args = ("world",)
+
+    expected = json.loads(json_formatter.format(record))
+    assert json.loads(record_formatter.format(record)) == expected
+    assert expected["@message"] == "Hello world"
+
+
+def test_record_formatter_timestamp_cache():
+    formatter = RecordFormatter()
+    record = make_record()
+    reference = logging.Formatter().formatTime(record)
+
+    assert json.loads(formatter.format(record))["asctime"] == reference
+    record.msecs = 7.0
+    assert json.loads(formatter.format(record))["asctime"].endswith(",007")
+
+    record.created += 1
+    record.msecs = 0.0
+    later = logging.Formatter().formatTime(record)
+    assert json.loads(formatter.format(record))["asctime"] == later
+
+
+def test_record_formatter_custom_datefmt():
+    formatter = RecordFormatter(fields=["asctime"], datefmt="%Y")
+    record = make_record()
+    year = logging.Formatter(datefmt="%Y").formatTime(record, "%Y")
+    assert json.loads(formatter.format(record)) == {"asctime": year}
+
+
+def test_record_formatter_exception():
+    formatter = RecordFormatter(fields=["message"])
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        record = logging.LogRecord(
+            "test", logging.ERROR, __file__, 1, "Failed", (), sys.exc_info()
+        )
+
+    entry = json.loads(formatter.format(record))
+    assert entry["message"] == "Failed"
+    assert "ValueError: boom" in entry["exc_info"]
+
+
+def test_logger_fast_formatter():
+    stream = io.TextIOWrapper(io.BytesIO(), encoding="utf-8")
+    logger = Logger(name="fast_formatter_test", formatter="fast")
+    logger.logger.handlers[0].setStream(stream)
+
+    logger.info("Fast message", extra={"user_id": 1})
+    stream.flush()
+
+    entry = json.loads(stream.buffer.getvalue())
+    assert list(entry) == [
+        "asctime",
+        "name",
+        "levelname",
+        "@message",
+        "user_id",
+    ]
+
+
+def test_logger_unknown_formatter():
+    with pytest.raises(ValueError):
+        Logger(name="unknown_formatter_test", formatter="xml")
@@ -0,0 +1,609 @@
+import asyncio
+import bz2
+import gzip
+import json
+import logging
+import lzma
+import multiprocessing
+import os
+import sys
+import time
+
+import pytest
+
+from logger_kit import Logger
+from logger_kit.compression import SegmentCompressor, available_compressions
+from logger_kit.formatters import RecordFormatter
+from logger_kit.handlers import (
+    AiofilesFileHandler,
+    AiofilesRotatingFileHandler,
+    AsyncFileHandler,
+    AsyncRotatingFileHandler,
+    BatchingFileHandler,
+    BatchingRotatingFileHandler,
+    CompressingRotatingFileHandler,
+    CompressingTimedRotatingFileHandler,
+    FileHandler,
+    RotatingFileHandler,
+    SharedRotatingFileHandler,
+    TimedRotatingFileHandler,
+)
+
+
+def write_shared_log(path, worker, count):
+    """Log ``count`` records from a separate process."""
+    handler = RotatingFileHandler(
+        path,
+        max_bytes=4096,
+        backup_count=1000,
+        buffer_size=512,
+        multiprocess=True,
+    ).get_handler()
+    handler.setFormatter(RecordFormatter(fields=["message"]))
+    logger = logging.getLogger(f"shared_worker_{worker}")
+    logger.handlers = [handler]
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    for seq in range(count):
+        logger.info(f"{worker}:{seq}:" + "x" * (seq % 50))
+    handler.close()
+
+
+def log_after_fork(handler, worker, count):
+    """Log ``count`` records through a handler inherited across fork."""
+    logger = logging.getLogger("shared_fork_test")
+    for seq in range(count):
+        logger.info(f"{worker}:{seq}:" + "x" * (seq % 50))
+    handler.close()
+
+
+def read_compressed(path):
+    openers = {".gz": gzip.open, ".bz2": bz2.open, ".xz": lzma.open}
+    opener = openers.get(path.suffix)
+    if opener is None:
+        import zstandard
+
+        with open(path, "rb") as f:
+            data = zstandard.ZstdDecompressor().stream_reader(f).read()
+    else:
+        with opener(path, "rb") as f:
+            data = f.read()
+    return [json.loads(line)["message"] for line in data.splitlines()]
+
+
+@pytest.fixture
+def count_writes(monkeypatch):
+    calls = []
+    real_write = os.write
+
+    def counting_write(fd, data):
+        calls.append(len(data))
+        return real_write(fd, data)
+
+    monkeypatch.setattr(os, "write", counting_write)
+    return calls
+
+
+class TestBatchingFileHandler:
+    def test_records_are_batched(
+        self, tmp_path, count_writes, make_logger, read_messages
+    ):
+        path = tmp_path / "batched.log"
+        handler = BatchingFileHandler(str(path), flush_interval=None)
+        logger = make_logger("batching_test", handler)
+
+        for i in range(1000):
+            logger.info(f"Batched message {i}")
+        assert count_writes == []
+        assert path.read_bytes() == b""
+
+        handler.flush()
+        assert len(count_writes) == 1
+        expected = [f"Batched message {i}" for i in range(1000)]
+        assert read_messages(path) == expected
+        handler.close()
+
+    def test_buffer_size_triggers_write(
+        self, tmp_path, count_writes, make_logger, read_messages
+    ):
+        path = tmp_path / "sized.log"
+        handler = BatchingFileHandler(
+            str(path), buffer_size=1024, flush_interval=None
+        )
+        logger = make_logger("batching_size_test", handler)
+
+        for i in range(200):
+            logger.info(f"Sized message {i}")
+        handler.close()
+
+        assert 1 < len(count_writes) < 20
+        assert len(read_messages(path)) == 200
+
+    def test_flush_level_forces_write(
+        self, tmp_path, make_logger, read_messages
+    ):
+        path = tmp_path / "level.log"
+        handler = BatchingFileHandler(str(path), flush_interval=None)
+        logger = make_logger("batching_level_test", handler)
+
+        logger.info("Buffered")
+        logger.error("Failure")
+        assert read_messages(path) == ["Buffered", "Failure"]
+        handler.close()
+
+    def test_flush_interval_writes_idle_buffer(
+        self, tmp_path, make_logger, read_messages
+    ):
+        import time
+
+        path = tmp_path / "interval.log"
+        handler = BatchingFileHandler(str(path), flush_interval=0.05)
+        logger = make_logger("batching_interval_test", handler)
+
+        logger.info("Idle record")
+        deadline = time.monotonic() + 5
+        while not path.read_bytes() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert read_messages(path) == ["Idle record"]
+        handler.close()
+
+    def test_file_handler_wrapper(self, tmp_path):
+        path = tmp_path / "nested" / "wrapped.log"
+        file_handler = FileHandler(str(path), buffer_size=4096)
+        assert isinstance(file_handler.get_handler(), BatchingFileHandler)
+
+        logger = Logger(name="batching_wrapper_test")
+        logger.logger.addHandler(file_handler.get_handler())
+        logger.info("Wrapped message")
+        logger.flush()
+
+        assert "Wrapped message" in path.read_text()
+        logger.logger.removeHandler(file_handler.get_handler())
+        file_handler.get_handler().close()
+
+
+class TestBatchingRotatingFileHandler:
+    def test_rotation(self, tmp_path, make_logger, read_messages):
+        path = tmp_path / "rotating.log"
+        handler = BatchingRotatingFileHandler(
+            str(path),
+            max_bytes=300,
+            backup_count=50,
+            buffer_size=100,
+            flush_interval=None,
+        )
+        logger = make_logger("batching_rotating_test", handler)
+
+        for i in range(100):
+            logger.info(f"Rotating message {i}")
+        handler.close()
+
+        files = sorted(
+            tmp_path.glob("rotating.log.*"),
+            key=lambda p: int(p.suffix[1:]),
+            reverse=True,
+        )
+        assert files
+        messages = []
+        for file in files + [path]:
+            assert file.stat().st_size <= 300
+            messages.extend(read_messages(file))
+        assert messages == [f"Rotating message {i}" for i in range(100)]
+
+    def test_backup_count_limits_files(self, tmp_path, make_logger):
+        path = tmp_path / "limited.log"
+        rotating = RotatingFileHandler(
+            str(path), max_bytes=200, backup_count=2, buffer_size=64
+        )
+        handler = rotating.get_handler()
+        assert isinstance(handler, BatchingRotatingFileHandler)
+        logger = make_logger("batching_limited_test", handler)
+
+        for i in range(100):
+            logger.info(f"Limited message {i}")
+        handler.close()
+
+        assert sorted(p.name for p in tmp_path.iterdir()) == [
+            "limited.log",
+            "limited.log.1",
+            "limited.log.2",
+        ]
+
+
+class TestAiofilesFileHandler:
+    @pytest.mark.asyncio
+    async def test_async_logging_writes_file(self, tmp_path, read_messages):
+        path = tmp_path / "async.log"
+        handler = AsyncFileHandler(str(path)).get_handler()
+        assert isinstance(handler, AiofilesFileHandler)
+        logger = Logger("aiofiles_test", async_inline=True)
+        logger.logger.handlers = [handler]
+        logger.logger.propagate = False
+        handler.setFormatter(RecordFormatter(fields=["message"]))
+
+        for i in range(50):
+            await logger.ainfo(f"Async message {i}")
+        await logger.aflush()
+
+        assert read_messages(path) == [f"Async message {i}" for i in range(50)]
+        handler.close()
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("method", ["flush", "close"])
+    @pytest.mark.parametrize("off_loop", [False, True])
+    async def test_flush_and_close_write_every_record(
+        self, tmp_path, method, off_loop, read_messages
+    ):
+        path = tmp_path / "burst.log"
+        handler = AsyncFileHandler(str(path)).get_handler()
+        logger = Logger("aiofiles_flush_test", async_inline=True)
+        logger.logger.handlers = [handler]
+        logger.logger.propagate = False
+        handler.setFormatter(RecordFormatter(fields=["message"]))
+        for i in range(1000):
+            await logger.ainfo(f"Burst message {i}")
+
+        if off_loop:
+            call = asyncio.get_running_loop().run_in_executor(
+                None, getattr(handler, method)
+            )
+            await asyncio.wait_for(call, 5)
+        else:
+            # On the loop thread; the writer task has not run yet
+            getattr(handler, method)()
+        expected = [f"Burst message {i}" for i in range(1000)]
+        assert read_messages(path) == expected
+        await logger.aflush()
+        handler.close()
+        assert read_messages(path) == expected
+
+    @pytest.mark.asyncio
+    async def test_burst_does_not_lag_the_event_loop(
+        self, tmp_path, monkeypatch, make_logger, read_messages
+    ):
+        path = tmp_path / "lag.log"
+        handler = AsyncFileHandler(str(path)).get_handler()
+        write_sync = handler._write_sync
+
+        def slow_disk(data):
+            time.sleep(0.05)
+            write_sync(data)
+
+        monkeypatch.setattr(handler, "_write_sync", slow_disk)
+        logger = make_logger("aiofiles_lag_test", handler)
+        loop = asyncio.get_running_loop()
+
+        async def measure_lag(done):
+            lags = []
+            while not done.is_set():
+                start = loop.time()
+                await asyncio.sleep(0.005)
+                lags.append(loop.time() - start - 0.005)
+            return lags
+
+        async def lag_while(work):
+            done = asyncio.Event()
+            lags = asyncio.ensure_future(measure_lag(done))
+            await work()
+            done.set()
+            return max(await lags)
+
+        async def idle():
+            await asyncio.sleep(0.5)
+
+        async def burst():
+            # 10 records per millisecond: 10k records/s for half a second
+            for tick in range(500):
+                for i in range(10):
+                    logger.info(f"Burst {tick * 10 + i}")
+                await asyncio.sleep(0.001)
+
+        idle_lag = await lag_while(idle)
+        burst_lag = await lag_while(burst)
+        await handler.aflush()
+        handler.close()
+
+        assert len(read_messages(path)) == 5000
+        # Writes that blocked the loop would add the 50 ms disk time
+        assert burst_lag < idle_lag + 0.03
+
+    def test_sync_logging_without_event_loop(
+        self, tmp_path, make_logger, read_messages
+    ):
+        path = tmp_path / "sync.log"
+        handler = AiofilesFileHandler(str(path))
+        logger = make_logger("aiofiles_sync_test", handler)
+
+        logger.info("Written synchronously")
+
+        assert read_messages(path) == ["Written synchronously"]
+        handler.close()
+
+    @pytest.mark.asyncio
+    async def test_rotation(self, tmp_path, make_logger):
+        path = tmp_path / "async_rotating.log"
+        handler = AsyncRotatingFileHandler(
+            str(path), max_bytes=500, backup_count=3
+        ).get_handler()
+        assert isinstance(handler, AiofilesRotatingFileHandler)
+        logger = make_logger("aiofiles_rotating_test", handler)
+
+        for i in range(100):
+            logger.info(f"Rotating message {i}")
+            await handler.aflush()
+        handler.close()
+
+        files = sorted(p.name for p in tmp_path.iterdir())
+        assert files == [
+            "async_rotating.log",
+            "async_rotating.log.1",
+            "async_rotating.log.2",
+            "async_rotating.log.3",
+        ]
+        assert os.path.getsize(path.with_suffix(".log.1")) >= 500
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="requires fcntl")
+class TestSharedRotatingFileHandler:
+    def test_processes_share_rotating_file(self, tmp_path, read_messages):
+        path = tmp_path / "shared.log"
+        workers, count = 4, 1000
+        context = multiprocessing.get_context("spawn")
+        processes = [
+            context.Process(
+                target=write_shared_log, args=(str(path), worker, count)
+            )
+            for worker in range(workers)
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join(60)
+            assert process.exitcode == 0
+
+        backups = sorted(
+            (p for p in tmp_path.iterdir() if p.suffix[1:].isdigit()),
+            key=lambda p: -int(p.suffix[1:]),
+        )
+        assert len(backups) > 1
+        sequences = {worker: [] for worker in range(workers)}
+        for log_file in [*backups, path]:
+            # Every line must be a complete record: no interleaving
+            for message in read_messages(log_file):
+                worker, seq, _ = message.split(":")
+                sequences[int(worker)].append(int(seq))
+        for worker in range(workers):
+            assert sequences[worker] == list(range(count))
+
+    def test_forked_children_get_their_own_files(
+        self, tmp_path, make_logger, read_messages
+    ):
+        path = tmp_path / "forked.log"
+        handler = SharedRotatingFileHandler(
+            str(path), max_bytes=4096, backup_count=1000, buffer_size=512
+        )
+        logger = make_logger("shared_fork_test", handler)
+        # Still buffered when the children are forked
+        logger.info("parent:0:")
+        workers, count = 3, 500
+        context = multiprocessing.get_context("fork")
+        processes = [
+            context.Process(
+                target=log_after_fork, args=(handler, worker, count)
+            )
+            for worker in range(workers)
+        ]
+        for process in processes:
+            process.start()
+        for seq in range(1, count):
+            logger.info(f"parent:{seq}:")
+        for process in processes:
+            process.join(60)
+            assert process.exitcode == 0
+        handler.close()
+
+        sequences = {}
+        log_files = sorted(
+            (p for p in tmp_path.iterdir() if p.suffix[1:].isdigit()),
+            key=lambda p: -int(p.suffix[1:]),
+        )
+        for log_file in [*log_files, path]:
+            for message in read_messages(log_file):
+                worker, seq, _ = message.split(":")
+                sequences.setdefault(worker, []).append(int(seq))
+        assert sequences == {
+            worker: list(range(count))
+            for worker in ["parent", *map(str, range(workers))]
+        }
+
+    def test_reopens_file_rotated_elsewhere(
+        self, tmp_path, make_logger, read_messages
+    ):
+        path = tmp_path / "reopen.log"
+        first = SharedRotatingFileHandler(
+            str(path), max_bytes=200, backup_count=5, buffer_size=0
+        )
+        second = SharedRotatingFileHandler(
+            str(path), max_bytes=200, backup_count=5, buffer_size=0
+        )
+        first_logger = make_logger("shared_first_test", first)
+        second_logger = make_logger("shared_second_test", second)
+
+        for i in range(10):
+            first_logger.info(f"First {i}")
+            second_logger.info(f"Second {i}")
+        first.close()
+        second.close()
+
+        files = [path.with_name(f"reopen.log.{i}") for i in range(5, 0, -1)]
+        messages = []
+        for log_file in [*files, path]:
+            if log_file.exists():
+                messages += read_messages(log_file)
+        expected = []
+        for i in range(10):
+            expected += [f"First {i}", f"Second {i}"]
+        assert messages == expected
+        for log_file in [*files, path]:
+            if log_file.exists():
+                assert os.path.getsize(log_file) <= 200
+
+
+class TestCompressedRotation:
+    @pytest.mark.parametrize("compression", available_compressions())
+    def test_rotated_files_are_compressed(
+        self, tmp_path, compression, make_logger, read_messages
+    ):
+        path = tmp_path / "compressed.log"
+        handler = RotatingFileHandler(
+            str(path), max_bytes=500, backup_count=20, compression=compression
+        ).get_handler()
+        assert isinstance(handler, CompressingRotatingFileHandler)
+        logger = make_logger(f"compressed_{compression}_test", handler)
+
+        for i in range(100):
+            logger.info(f"Compressed message {i}")
+        handler.close()
+
+        suffix = handler.compressor.suffix
+        backups = sorted(
+            tmp_path.glob(f"compressed.log.*{suffix}"),
+            key=lambda p: -int(p.name.split(".")[2]),
+        )
+        assert len(backups) > 1
+        assert not list(tmp_path.glob("*.tmp"))
+        messages = []
+        for backup in backups:
+            messages += read_compressed(backup)
+        messages += read_messages(path)
+        assert messages == [f"Compressed message {i}" for i in range(100)]
+
+    def test_rotation_does_not_wait_for_compression(
+        self, tmp_path, monkeypatch, make_logger, read_messages
+    ):
+        compress = SegmentCompressor.compress
+
+        def slow_compress(self, source, dest):
+            time.sleep(0.5)
+            compress(self, source, dest)
+
+        monkeypatch.setattr(SegmentCompressor, "compress", slow_compress)
+        path = tmp_path / "slow.log"
+        handler = CompressingRotatingFileHandler(
+            str(path), max_bytes=1000, backup_count=3
+        )
+        logger = make_logger("slow_compression_test", handler)
+        logger.info("Before rotation")
+
+        start = time.perf_counter()
+        handler.doRollover()
+        elapsed = time.perf_counter() - start
+        logger.info("After rotation")
+
+        assert elapsed < 0.25
+        assert not (tmp_path / "slow.log.1.gz").exists()
+        handler.close()
+        assert read_compressed(tmp_path / "slow.log.1.gz") == [
+            "Before rotation"
+        ]
+        assert read_messages(path) == ["After rotation"]
+
+    def test_failed_compression_keeps_the_segment(
+        self, tmp_path, monkeypatch, capsys, make_logger, read_messages
+    ):
+        compress = SegmentCompressor.compress
+        calls = []
+
+        def failing_once(self, source, dest):
+            calls.append(source)
+            if len(calls) == 1:
+                raise OSError("disk full")
+            compress(self, source, dest)
+
+        monkeypatch.setattr(SegmentCompressor, "compress", failing_once)
+        path = tmp_path / "failing.log"
+        handler = CompressingRotatingFileHandler(
+            str(path), max_bytes=1000, backup_count=3
+        )
+        logger = make_logger("failing_compression_test", handler)
+        logger.info("First segment")
+        handler.doRollover()
+        logger.info("Second segment")
+        handler.doRollover()
+        handler.close()
+
+        assert "disk full" in capsys.readouterr().err
+        assert read_messages(calls[0]) == ["First segment"]
+        assert read_compressed(tmp_path / "failing.log.1.gz") == [
+            "Second segment"
+        ]
+
+    def test_retention_by_age_and_size(self, tmp_path, make_logger):
+        path = tmp_path / "retained.log"
+        old = tmp_path / "retained.log.9.gz"
+        old.write_bytes(gzip.compress(b""))
+        os.utime(old, (time.time() - 7200, time.time() - 7200))
+        handler = CompressingRotatingFileHandler(
+            str(path),
+            max_bytes=100,
+            backup_count=50,
+            max_total_size=120,
+            max_age=3600,
+        )
+        logger = make_logger("retention_test", handler)
+
+        for i in range(40):
+            logger.info(f"Retained message {i}")
+        handler.close()
+
+        backups = handler.compressor.segments()
+        assert not old.exists()
+        assert 0 < len(backups) < 10
+        assert sum(stat.st_size for _, stat in backups) <= 120
+
+    def test_batched_rotation_is_compressed(
+        self, tmp_path, make_logger, read_messages
+    ):
+        path = tmp_path / "batched.log"
+        handler = RotatingFileHandler(
+            str(path),
+            max_bytes=500,
+            backup_count=20,
+            buffer_size=128,
+            compression="gzip",
+        ).get_handler()
+        assert isinstance(handler, BatchingRotatingFileHandler)
+        logger = make_logger("batched_compression_test", handler)
+
+        for i in range(100):
+            logger.info(f"Batched message {i}")
+        handler.close()
+
+        backups = sorted(
+            tmp_path.glob("batched.log.*.gz"),
+            key=lambda p: -int(p.name.split(".")[2]),
+        )
+        messages = []
+        for backup in backups:
+            messages += read_compressed(backup)
+        messages += read_messages(path)
+        assert messages == [f"Batched message {i}" for i in range(100)]
+
+    def test_timed_rotation_is_compressed(self, tmp_path, make_logger):
+        path = tmp_path / "timed.log"
+        handler = TimedRotatingFileHandler(
+            str(path), when="S", compression="lzma"
+        ).get_handler()
+        assert isinstance(handler, CompressingTimedRotatingFileHandler)
+        logger = make_logger("timed_compression_test", handler)
+
+        logger.info("Timed message")
+        handler.doRollover()
+        handler.close()
+
+        (segment,) = tmp_path.glob("timed.log.*.xz")
+        assert read_compressed(segment) == ["Timed message"]
+
+    def test_retention_requires_compression(self, tmp_path):
+        with pytest.raises(ValueError):
+            RotatingFileHandler(str(tmp_path / "app.log"), max_age=60)
@@ -1,6 +1,10 @@
+import logging
+import threading
+import time
+
 import pytest
 
-from logger_kit import Logger
+from logger_kit import NOTICE, TRACE, Lazy, Logger, add_level
 from logger_kit.handlers import FileHandler, RotatingFileHandler
 
 
@@ -52,6 +56,271 @@ def test_context_manager(logger, caplog):
     assert "After context" in caplog.text
 
 
+def test_context_fields(caplog):
+    logger = Logger(name="context_fields_test", extra={"service": "api"})
+    logger.key_masker.add_exact_match("token")
+    with logger.context(request_id="r-1", token="secret"):
+        logger.info("Outer")
+        with logger.context(step="parse") as scoped:
+            assert scoped is logger
+            logger.info("Inner", extra={"request_id": "override"})
+    logger.info("After")
+
+    outer, inner, after = caplog.records[-3:]
+    assert outer.request_id == "r-1"
+    assert outer.service == "api"
+    assert outer.token != "secret"
+    assert inner.step == "parse"
+    assert inner.request_id == "override"
+    assert not hasattr(after, "request_id")
+
+
+def test_context_level_is_thread_local(caplog):
+    logger = Logger(name="context_thread_test", level="INFO")
+    entered = threading.Event()
+    done = threading.Event()
+
+    def other_thread():
+        entered.wait(5)
+        logger.debug("Other thread debug")
+        done.set()
+
+    thread = threading.Thread(target=other_thread)
+    thread.start()
+    with logger.context(level="DEBUG"):
+        entered.set()
+        assert done.wait(5)
+        logger.debug("Scoped debug")
+    thread.join()
+
+    messages = [r.message for r in caplog.records]
+    assert "Scoped debug" in messages
+    assert "Other thread debug" not in messages
+    assert logger.logger.level == logging.INFO
+
+
+@pytest.mark.asyncio
+async def test_async_context_isolates_tasks(caplog):
+    import asyncio
+
+    logger = Logger(name="async_context_test", level="INFO")
+
+    async def request(i):
+        level = "DEBUG" if i % 2 else None
+        async with logger.context(level=level, request_id=i):
+            for step in range(3):
+                await asyncio.sleep(0)
+                await logger.adebug(f"debug {i}")
+                await logger.ainfo(f"info {i}", extra={"step": step})
+
+    await asyncio.gather(*(request(i) for i in range(2000)))
+
+    records = [r for r in caplog.records if r.name == "async_context_test"]
+    infos = [r for r in records if r.levelname == "INFO"]
+    debugs = [r for r in records if r.levelname == "DEBUG"]
+    assert len(infos) == 6000
+    assert len(debugs) == 3000
+    for record in records:
+        assert record.message.endswith(f" {record.request_id}")
+    assert all(r.request_id % 2 for r in debugs)
+    await logger.ainfo("After")
+    assert not hasattr(caplog.records[-1], "request_id")
+
+
+def test_disabled_level_skips_masking(caplog):
+    logger = Logger(name="disabled_level_test", level="INFO")
+    calls = []
+    logger.key_masker.mask_data = lambda data: calls.append(data) or data
+
+    logger.debug("Dropped", extra={"payload": list(range(10))})
+    assert calls == []
+    assert "Dropped" not in caplog.text
+
+    with logger.context(level="DEBUG"):
+        logger.debug("Kept", extra={"payload": [1]})
+    assert len(calls) == 1
+    assert "Kept" in caplog.text
+
+    logger.debug("Dropped again", extra={"payload": [2]})
+    assert len(calls) == 1
+
+
+def test_level_change_through_stdlib_logger(caplog):
+    logger = Logger(name="stdlib_level_test", level="INFO")
+    logger.debug("Before")
+    logger.logger.setLevel("DEBUG")
+    logger.debug("After")
+
+    assert "Before" not in caplog.text
+    assert "After" in caplog.text
+
+
+def test_logging_disable_silences_logger(caplog):
+    logger = Logger(name="disable_test", level="INFO")
+    logger.info("Before")
+    logger.debug("Filtered out")
+    logging.disable(logging.CRITICAL)
+    try:
+        logger.info("Disabled")
+        logger.critical("Disabled too")
+        with logger.context(level="DEBUG"):
+            logger.debug("Disabled in context")
+    finally:
+        logging.disable(logging.NOTSET)
+    logger.info("After")
+    logger.debug("Filtered out again")
+
+    assert [r.getMessage() for r in caplog.records] == ["Before", "After"]
+
+
+def test_custom_levels(caplog):
+    logger = Logger(name="custom_levels_test", level="trace")
+    add_level("AUDIT", 35)
+    logger.trace("Tracing")
+    logger.notice("Noticed")
+    logger.log("audit", "Audited")
+    logger.log("NOTICE", "Noticed again")
+    assert [(r.levelname, r.levelno) for r in caplog.records] == [
+        ("TRACE", TRACE),
+        ("NOTICE", NOTICE),
+        ("AUDIT", 35),
+        ("NOTICE", NOTICE),
+    ]
+    with pytest.raises(ValueError):
+        logger.log("chatty", "Unknown")
+    with pytest.raises(ValueError):
+        add_level("AUDIT", 36)
+
+
+def test_disabled_levels_follow_level_changes(caplog):
+    logger = Logger(name="dispatch_test", level="NOTICE")
+    bound = logger.bind(job="sync")
+    assert "info" in logger.__dict__ and "info" in bound.__dict__
+    logger.info("Filtered out")
+    with logger.context(level="DEBUG"):
+        bound.debug("Context level")
+
+    logger.set_level("INFO")
+    assert "info" not in logger.__dict__
+    logger.info("Logger level")
+    # The bound logger notices the shared stdlib level changed
+    bound.info("Bound level")
+    assert "info" not in bound.__dict__
+    bound.debug("Still filtered out")
+    assert [r.getMessage() for r in caplog.records] == [
+        "Context level",
+        "Logger level",
+        "Bound level",
+    ]
+
+
+def test_lazy_extra(caplog):
+    logger = Logger(name="lazy_extra_test", level="INFO")
+    calls = []
+
+    def build_extra():
+        calls.append(True)
+        return {"expensive": "value"}
+
+    logger.debug("Lazy dropped", extra=build_extra)
+    assert calls == []
+
+    logger.info("Lazy kept", extra=build_extra)
+    assert calls == [True]
+    assert caplog.records[-1].expensive == "value"
+
+
+def test_message_arguments(caplog):
+    logger = Logger(name="message_args_test", level="INFO")
+    logger.info("User %s logged in from %s", "alice", "10.0.0.1")
+    logger.info("Retry %(attempt)d of %(total)d", {"attempt": 2, "total": 5})
+    logger.info("Order {} shipped to {}", 42, "Berlin")
+    logger.info("Nothing to interpolate", "stray")
+
+    messages = [r.message for r in caplog.records[-4:]]
+    assert messages == [
+        "User alice logged in from 10.0.0.1",
+        "Retry 2 of 5",
+        "Order 42 shipped to Berlin",
+        "Nothing to interpolate ('stray',)",
+    ]
+    # Records carry the final message, with nothing left to interpolate
+    assert caplog.records[-1].args == ()
+
+
+def test_lone_mapping_without_placeholders_is_extra(caplog):
+    logger = Logger(name="mapping_extra_test", level="INFO")
+    logger.key_masker.add_exact_match("password")
+    logger.info("Login", {"password": "secret", "user": "alice"})
+    logger.info("Retry", {"attempt": 2}, extra={"attempt": 3})
+
+    login, retry = caplog.records[-2:]
+    assert login.message == "Login"
+    assert login.password == "*****"
+    assert login.user == "alice"
+    assert retry.attempt == 3
+
+
+def test_lone_none_is_positional_extra(caplog):
+    logger = Logger(name="lone_none_test", level="INFO")
+    logger.info("No extra", None)
+    logger.info("Value %s", None)
+    assert [r.message for r in caplog.records[-2:]] == [
+        "No extra",
+        "Value None",
+    ]
+
+
+def test_lazy_message_and_values(caplog):
+    logger = Logger(name="lazy_message_test", level="INFO")
+    calls = []
+
+    def expensive():
+        calls.append(True)
+        return "computed"
+
+    logger.debug(expensive)
+    logger.debug("Value %s", Lazy(expensive))
+    logger.debug("Extra", extra={"value": Lazy(expensive)})
+    assert calls == []
+
+    logger.info(expensive)
+    logger.info("Value %s", Lazy(expensive))
+    logger.info("Extra", extra={"value": Lazy(expensive), "kind": dict})
+    assert len(calls) == 3
+    first, second, third = caplog.records[-3:]
+    assert first.message == "computed"
+    assert second.message == "Value computed"
+    assert third.value == "computed"
+    assert third.kind is dict
+
+
+def test_plain_functions_are_logged_as_given(caplog):
+    logger = Logger(name="lazy_plain_test", level="INFO")
+
+    def callback(event):
+        raise AssertionError("callbacks must not be called")
+
+    logger.info("Registered %s", callback)
+    logger.info("Registered", extra={"callback": callback})
+    first, second = caplog.records[-2:]
+    assert first.message == f"Registered {callback}"
+    assert second.callback is callback
+
+
+def test_sampling_keys_by_template(caplog):
+    from logger_kit.sampling import FirstNSampler
+
+    logger = Logger(
+        name="template_sampling_test",
+        sampler=FirstNSampler(first=2, every=1000),
+    )
+    for i in range(10):
+        logger.info("Cache miss for %s", i)
+    messages = [r.message for r in caplog.records]
+    assert messages == ["Cache miss for 0", "Cache miss for 1"]
+
+
 @pytest.mark.asyncio
 async def test_async_logging(logger, caplog):
     message = "Async test message"
@@ -59,6 +328,31 @@ async def test_async_logging(logger, caplog):
     assert message in caplog.text
 
 
+@pytest.mark.asyncio
+async def test_async_message_arguments(logger, caplog):
+    await logger.ainfo("Task %s finished in %.1fs", "sync", 1.25)
+    await logger.aerror("Task {} failed", "sync", extra={"code": 3})
+    first, second = caplog.records[-2:]
+    assert first.message == "Task sync finished in 1.2s"
+    assert second.message == "Task sync failed"
+    assert second.code == 3
+
+
+@pytest.mark.asyncio
+async def test_async_custom_levels(caplog):
+    logger = Logger(name="async_levels_test", level="INFO")
+    await logger.atrace("Filtered out")
+    async with logger.context(level="TRACE"):
+        await logger.atrace("Traced")
+    await logger.anotice("Noticed")
+    await logger.alog("warning", "Warned")
+    assert [r.getMessage() for r in caplog.records] == [
+        "Traced",
+        "Noticed",
+        "Warned",
+    ]
+
+
 def test_file_handler(tmp_path):
     log_file = tmp_path / "test.log"
     logger = Logger(name="file_test")
@@ -90,3 +384,217 @@ def test_rotating_file_handler(tmp_path):
     # Check that backup files were created
     assert log_file.exists()
     assert (tmp_path / "rotating.log.1").exists()
+
+
+def test_constructor_fields(caplog):
+    logger = Logger(
+        name="static_fields_test",
+        extra={"service": "web"},
+        extra_fields={"environment": "test"},
+    )
+    logger.info("Static fields", extra={"user_id": 1})
+
+    log_entry = caplog.records[-1]
+    assert log_entry.service == "web"
+    assert log_entry.environment == "test"
+    assert log_entry.user_id == 1
+
+
+def test_bind(caplog):
+    logger = Logger(name="bind_test", extra={"service": "web"})
+    request_logger = logger.bind(request_id="abc", user_id=1)
+    user_logger = request_logger.bind(user_id=2)
+
+    user_logger.info("Bound", extra={"action": "login"})
+    log_entry = caplog.records[-1]
+    assert log_entry.service == "web"
+    assert log_entry.request_id == "abc"
+    assert log_entry.user_id == 2
+    assert log_entry.action == "login"
+
+    request_logger.info("Overridden", extra={"request_id": "xyz"})
+    assert caplog.records[-1].request_id == "xyz"
+
+    logger.info("Parent unchanged")
+    assert not hasattr(caplog.records[-1], "request_id")
+
+
+def test_bound_fields_are_masked_once(caplog, monkeypatch):
+    logger = Logger(name="bind_mask_test")
+    logger.key_masker.add_exact_match("token")
+    child = logger.bind(token="secret", service="web")
+    masked = []
+    mask_data = logger.key_masker.mask_data
+    monkeypatch.setattr(
+        logger.key_masker,
+        "mask_data",
+        lambda data: masked.append(data) or mask_data(data),
+    )
+
+    for _ in range(3):
+        child.info("Bound and masked")
+    assert caplog.records[-1].token == "*****"
+    assert masked == [{"token": "secret", "service": "web"}]
+
+    # New rules apply to fields bound earlier
+    logger.key_masker.add_exact_match("service", "[hidden]")
+    child.info("Rules changed")
+    assert caplog.records[-1].service == "[hidden]"
+
+
+def test_queued_bound_logger(caplog):
+    logger = Logger(name="queued_bind_test", queued=True)
+    logger.bind(request_id="abc").info("Queued and bound")
+    assert logger.flush(timeout=5)
+
+    assert caplog.records[-1].request_id == "abc"
+    logger.close()
+
+
+def test_queued_logging(caplog):
+    logger = Logger(name="queued_test", level="DEBUG", queued=True)
+    logger.key_masker.add_exact_match("password")
+    logger.info("Queued message", extra={"password": "secret"})
+    assert logger.flush(timeout=5)
+
+    log_entry = caplog.records[-1]
+    assert log_entry.message == "Queued message"
+    assert log_entry.password == "*****"
+    logger.close()
+
+
+def test_queued_logging_close_drains_queue(caplog):
+    logger = Logger(name="queued_close_test", queued=True)
+    for i in range(100):
+        logger.info(f"Drained message {i}")
+    logger.close(timeout=5)
+
+    messages = [r.message for r in caplog.records]
+    assert messages[-100:] == [f"Drained message {i}" for i in range(100)]
+
+    # Logging after close falls back to synchronous emission
+    logger.info("After close")
+    assert caplog.records[-1].message == "After close"
+
+
+class BlockingHandler(logging.Handler):
+    """Handler that stalls on its first record until released."""
+
+    def __init__(self):
+        super().__init__()
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.messages = []
+
+    def emit(self, record):
+        self.started.set()
+        self.release.wait(5)
+        self.messages.append(record.getMessage())
+
+
+@pytest.mark.parametrize(
+    "overflow, kept",
+    [("drop_new", [0, 1]), ("drop_oldest", [3, 4])],
+)
+def test_queued_logging_overflow_policies(overflow, kept):
+    logger = Logger(
+        name=f"overflow_{overflow}",
+        queued=True,
+        queue_size=2,
+        overflow=overflow,
+    )
+    handler = BlockingHandler()
+    logger.logger.addHandler(handler)
+
+    logger.info("Blocker")
+    assert handler.started.wait(5)
+    for i in range(5):
+        logger.info(f"Overflow message {i}")
+    handler.release.set()
+    logger.close(timeout=5)
+    logger.logger.removeHandler(handler)
+
+    expected = [f"Overflow message {i}" for i in kept]
+    assert handler.messages == ["Blocker"] + expected
+    queue = logger.writer.queue
+    assert queue.dropped_new + queue.dropped_oldest == 3
+    if overflow == "drop_new":
+        assert queue.dropped_new == 3
+    else:
+        assert queue.dropped_oldest == 3
+
+
+def test_queued_logging_invalid_overflow():
+    with pytest.raises(ValueError):
+        Logger(name="invalid_overflow", queued=True, overflow="explode")
+
+
+@pytest.mark.asyncio
+async def test_queued_async_logging(caplog):
+    logger = Logger(name="queued_async_test", queued=True)
+    for i in range(50):
+        await logger.ainfo(f"Async queued {i}")
+    await logger.aflush()
+
+    messages = [r.message for r in caplog.records]
+    assert messages[-50:] == [f"Async queued {i}" for i in range(50)]
+    await logger.aclose()
+    assert logger.writer.closed
+
+
+class SlowHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        time.sleep(0.05)
+        self.records.append(record)
+
+
+@pytest.mark.asyncio
+async def test_queued_records_keep_their_logging_time():
+    logger = Logger(name="queued_created_test", queued=True, console=False)
+    logger.logger.propagate = False
+    handler = SlowHandler()
+    logger.logger.addHandler(handler)
+    for i in range(3):
+        logger.info(f"Sync {i}")
+        await logger.ainfo(f"Async {i}")
+    logged = time.time()
+    await logger.aclose()
+
+    assert len(handler.records) == 6
+    assert all(record.created <= logged for record in handler.records)
+    logger.logger.removeHandler(handler)
+
+
+@pytest.mark.asyncio
+async def test_queued_async_backpressure_does_not_block_loop():
+    import asyncio
+
+    logger = Logger(
+        name="queued_async_backpressure", queued=True, queue_size=1
+    )
+    handler = BlockingHandler()
+    logger.logger.addHandler(handler)
+
+    await logger.ainfo("Blocker")
+    assert handler.started.wait(5)
+    await logger.ainfo("Fills the queue")
+
+    pending = asyncio.ensure_future(logger.ainfo("Waits for space"))
+    await asyncio.sleep(0.05)
+    # The event loop kept running while the producer waited for space
+    assert not pending.done()
+
+    handler.release.set()
+    await asyncio.wait_for(pending, 5)
+    await logger.aclose()
+    logger.logger.removeHandler(handler)
+
+    assert handler.messages == [
+        "Blocker",
+        "Fills the queue",
+        "Waits for space",
+    ]
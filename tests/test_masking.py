@@ -1,6 +1,10 @@
+import re
+import tracemalloc
+
 import pytest
 
-from logger_kit import Logger
+from logger_kit import KeyMasker, Logger
+from logger_kit.masking import COMMON_VALUE_PATTERNS, MaskingRule
 
 
 @pytest.fixture
@@ -132,3 +136,186 @@ class TestCustomMasking:
         log_entry = caplog.records[-1]
 
         assert log_entry.password == "[HIDDEN]"
+
+
+class TestCopyOnWrite:
+    @pytest.fixture
+    def masker(self):
+        masker = KeyMasker()
+        masker.add_exact_match("password")
+        return masker
+
+    def test_clean_data_is_not_copied(self, masker):
+        """Test payloads without sensitive keys are returned untouched."""
+        data = {
+            "users": [{"id": i, "tags": ["a", "b"]} for i in range(100)],
+            "meta": ({"version": 1},),
+        }
+        assert masker.mask_data(data) is data
+
+        tracemalloc.start()
+        try:
+            before = tracemalloc.get_traced_memory()[0]
+            masker.mask_data(data)
+            allocated = tracemalloc.get_traced_memory()[0] - before
+        finally:
+            tracemalloc.stop()
+        assert allocated < 1024
+
+    def test_only_dirty_path_is_copied(self, masker):
+        """Test only containers leading to a masked value are copied."""
+        clean = {"name": "john"}
+        data = {"clean": clean, "auth": {"password": "secret"}}
+        masked = masker.mask_data(data)
+
+        assert masked is not data
+        assert masked["clean"] is clean
+        assert masked["auth"] == {"password": "*****"}
+        assert data["auth"]["password"] == "secret"
+
+    def test_rule_changes_recompile_plan(self, masker):
+        """Test rules added after first use are applied."""
+        data = {"token": "abc"}
+        assert masker.mask_data(data) is data
+
+        masker.add_exact_match("token")
+        assert masker.mask_data(data) == {"token": "*****"}
+
+        masker.set_default_mask("[HIDDEN]")
+        assert masker.mask_data(data) == {"token": "[HIDDEN]"}
+
+    def test_rules_edited_directly_recompile_plan(self, masker):
+        """Test rules replaced or assigned directly are applied."""
+        masker.add_exact_match("token")
+        assert masker.mask_data({"token": "abc"}) == {"token": "*****"}
+
+        masker.rules["token"] = MaskingRule(mask="[TOKEN]")
+        assert masker.mask_data({"token": "abc"}) == {"token": "[TOKEN]"}
+
+        masker.rules = {"secret": MaskingRule(mask="[SECRET]")}
+        masked = masker.mask_data({"token": "abc", "secret": "x"})
+        assert masked == {"token": "abc", "secret": "[SECRET]"}
+
+        masker.value_rules["id"] = MaskingRule(
+            pattern=re.compile(r"id_\d+"), mask="[ID]"
+        )
+        assert masker.mask_data({"note": "id_42"}) == {"note": "[ID]"}
+
+    def test_tuple_is_masked(self, masker):
+        """Test tuples keep their type when masked."""
+        data = ({"password": "secret"}, "plain")
+        assert masker.mask_data(data) == ({"password": "*****"}, "plain")
+
+
+class TestShapeCache:
+    @pytest.fixture
+    def masker(self):
+        masker = KeyMasker(shape_cache_size=2)
+        masker.add_exact_match("password")
+        return masker
+
+    @staticmethod
+    def record(**values):
+        data = {"user": "john", "action": "login", "ip": "127.0.0.1"}
+        data.update(values)
+        return data
+
+    def test_repeated_shapes_hit_cache(self, masker):
+        """Test payloads with the same shape reuse one plan."""
+        for i in range(3):
+            masked = masker.mask_data(self.record(password=f"secret{i}"))
+            assert masked["password"] == "*****"
+            assert masked["user"] == "john"
+
+        info = masker.shape_cache_info()
+        assert (info.hits, info.misses, info.currsize) == (2, 1, 1)
+
+    def test_value_types_are_part_of_shape(self, masker):
+        """Test a nested container under a known key is still walked."""
+        masker.mask_data(self.record(extra="plain"))
+        masked = masker.mask_data(self.record(extra={"password": "secret"}))
+
+        assert masked["extra"] == {"password": "*****"}
+        assert masker.shape_cache_info().misses == 2
+
+    def test_least_recently_used_shape_is_evicted(self, masker):
+        """Test the cache never grows beyond its maximum size."""
+        for key in ("a", "b", "c"):
+            masker.mask_data(self.record(**{key: 1}))
+        masker.mask_data(self.record(a=1))
+
+        info = masker.shape_cache_info()
+        assert info.currsize == 2
+        assert info.misses == 4
+
+    def test_rule_changes_clear_cache(self, masker):
+        """Test cached plans are dropped when rules change."""
+        data = self.record(token="abc")
+        assert masker.mask_data(data) is data
+
+        masker.add_exact_match("token")
+        assert masker.mask_data(data)["token"] == "*****"
+        assert masker.shape_cache_info().currsize == 1
+
+
+class TestContentScanning:
+    @pytest.fixture
+    def masker(self):
+        masker = KeyMasker()
+        for name, pattern in COMMON_VALUE_PATTERNS.items():
+            masker.add_value_pattern(name, pattern)
+        masker.add_value_pattern("session", r"sess_[0-9a-f]{8}", "[SESSION]")
+        return masker
+
+    def test_free_text_values(self, masker):
+        """Test secrets embedded in free text are masked in place."""
+        data = {
+            "note": "contact john@example.com about card 4111 1111 1111 1111",
+            "headers": {"Authorization": "Bearer abc.def-123"},
+            "count": 3,
+        }
+        masked = masker.mask_data(data)
+
+        assert masked["note"] == "contact ***** about card *****"
+        assert masked["headers"]["Authorization"] == "*****"
+        assert masked["count"] == 3
+
+    def test_list_primitives_are_scanned(self, masker):
+        """Test strings inside lists are scanned too."""
+        masked = masker.mask_data({"ids": ["ok", "sess_0123abcd", 7]})
+        assert masked["ids"] == ["ok", "[SESSION]", 7]
+
+    def test_key_rules_take_precedence(self, masker):
+        """Test a key rule wins over value patterns for its key."""
+        masker.add_exact_match("email", "[EMAIL]")
+        masked = masker.mask_data({"email": "john@example.com"})
+        assert masked["email"] == "[EMAIL]"
+
+    def test_clean_text_is_not_copied(self, masker):
+        """Test payloads without matches are returned untouched."""
+        data = {"note": "nothing to see", "tags": ["a", "b"]}
+        assert masker.mask_data(data) is data
+
+    def test_scanning_with_shape_cache(self):
+        """Test scanned keys are part of cached shape plans."""
+        masker = KeyMasker(shape_cache_size=8)
+        masker.add_value_pattern("session", r"sess_[0-9a-f]{8}")
+        for i in range(3):
+            data = {"a": 1, "b": 2, "c": 3, "note": f"sess_0000000{i}"}
+            assert masker.mask_data(data)["note"] == "*****"
+        assert masker.shape_cache_info().hits == 2
+
+    def test_invalid_value_pattern(self, masker):
+        """Test patterns that cannot be combined are rejected."""
+        masker.add_value_pattern("broken", r"(?i)global flags")
+        assert "broken" not in masker.value_rules
+
+    def test_message_is_scanned(self, caplog):
+        """Test the log message itself is scanned."""
+        logger = Logger(name="scanning_test")
+        logger.key_masker.add_value_pattern(
+            "email", COMMON_VALUE_PATTERNS["email"]
+        )
+        logger.info("Password reset for john@example.com")
+
+        assert caplog.records[-1].message == "Password reset for *****"
@@ -0,0 +1,174 @@
+import io
+import threading
+import time
+
+import pytest
+
+from logger_kit import Logger
+from logger_kit.dedup import Deduplicator
+from logger_kit.metrics import Histogram, PipelineMetrics
+from logger_kit.sampling import FirstNSampler
+
+
+def quiet_logger(name, **kwargs):
+    logger = Logger(name, formatter="fast", **kwargs)
+    logger.logger.handlers[0].setStream(io.StringIO())
+    logger.logger.propagate = False
+    return logger
+
+
+def test_records_and_bytes_are_counted():
+    metrics = PipelineMetrics(sample_every=1000)
+    logger = quiet_logger("metrics_count_test", metrics=metrics)
+    stream = logger.logger.handlers[0].stream
+    logger.debug("Filtered out")
+    logger.info("One")
+    logger.info("Two", extra={"user_id": 1})
+    logger.error("Three")
+
+    stats = logger.stats()
+    assert stats["records"] == {"INFO": 2, "ERROR": 1}
+    assert stats["bytes_formatted"] == len(stream.getvalue()) - 3
+    # Only the first record was timed
+    assert stats["latency"]["emit"]["count"] == 1
+    assert stats["queue"] is None
+
+
+def test_sampled_records_are_timed_by_stage():
+    metrics = PipelineMetrics(sample_every=2)
+    logger = quiet_logger("metrics_timing_test", metrics=metrics)
+    logger.key_masker.add_exact_match("password")
+    for i in range(10):
+        logger.info("Login", extra={"password": "secret", "attempt": i})
+
+    latency = logger.stats()["latency"]
+    assert set(latency) == {"mask", "format", "handler:ConsoleHandler", "emit"}
+    for histogram in latency.values():
+        assert histogram["count"] == 5
+        assert 0 < histogram["sum"]
+        assert histogram["p50"] <= histogram["p99"]
+    # Timed records are written once, like the others
+    stream = logger.logger.handlers[0].stream
+    assert len(stream.getvalue().splitlines()) == 10
+
+
+def test_drops_are_reported():
+    metrics = PipelineMetrics()
+    logger = quiet_logger(
+        "metrics_drops_test",
+        metrics=metrics,
+        sampler=FirstNSampler(first=2, every=1000),
+        deduplicator=Deduplicator(window=60),
+        queued=True,
+        queue_size=10,
+        overflow="drop_new",
+    )
+    for _ in range(5):
+        logger.info("Sampled")
+    logger.warning("Repeated")
+    logger.warning("Repeated")
+    stats = logger.stats()
+    assert stats["sampled_out"] == 3
+    # The second record of each message is a repeat
+    assert stats["deduplicated"] == 2
+    assert stats["queue"]["capacity"] == 10
+    logger.close()
+    stats = logger.stats()
+    assert stats["queue"]["depth"] == 0
+    # Repeat summaries and the sampling summary on close
+    assert stats["records"] == {"INFO": 2, "WARNING": 3}
+
+
+def test_stats_without_metrics():
+    logger = quiet_logger("metrics_none_test")
+    logger.info("Uncounted")
+    stats = logger.stats()
+    assert stats["records"] == {}
+    assert stats["handlers"] == {}
+
+
+def test_histogram_quantiles():
+    histogram = Histogram(bounds=(0.001, 0.01, 0.1))
+    for seconds in (0.0005, 0.005, 0.005, 0.05, 5.0):
+        histogram.observe(seconds)
+    assert histogram.counts == [1, 2, 1, 1]
+    assert histogram.quantile(0.5) == 0.01
+    assert histogram.quantile(0.99) == float("inf")
+
+
+def test_prometheus_export(tmp_path):
+    path = tmp_path / "logger_kit.prom"
+    metrics = PipelineMetrics(sample_every=1, export=str(path))
+    logger = quiet_logger("metrics_export_test", metrics=metrics)
+    logger.info("Exported")
+    logger.warning("Exported")
+    logger.close()
+
+    lines = path.read_text().splitlines()
+    assert "# TYPE logger_kit_records_total counter" in lines
+    assert (
+        'logger_kit_records_total{logger="metrics_export_test",'
+        'level="WARNING"} 1'
+    ) in lines
+    assert (
+        'logger_kit_stage_seconds_count{logger="metrics_export_test",'
+        'stage="emit"} 2'
+    ) in lines
+    buckets = [line for line in lines if "_bucket{" in line and "emit" in line]
+    assert buckets[-1].endswith('le="+Inf"} 2')
+
+
+def wait_until(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_quiet_logger_is_exported_periodically():
+    texts = []
+    metrics = PipelineMetrics(export=texts.append, export_interval=0.05)
+    logger = quiet_logger("metrics_periodic_test", metrics=metrics)
+    logger.info("Only record")
+
+    assert wait_until(lambda: len(texts) >= 2)
+    metrics.close()
+    assert 'level="INFO"} 1' in texts[-1]
+
+
+def test_failing_export_does_not_break_logging(capsys):
+    def export(text):
+        raise OSError("disk full")
+
+    metrics = PipelineMetrics(export=export, export_interval=0.01)
+    logger = quiet_logger("metrics_failing_test", metrics=metrics)
+    logger.info("Still logged")
+    errors = []
+
+    def reported():
+        errors.append(capsys.readouterr().err)
+        return "disk full" in "".join(errors)
+
+    assert wait_until(reported)
+    metrics.close()
+    assert logger.stats()["records"] == {"INFO": 1}
+    with pytest.raises(OSError):
+        metrics.export()
+
+
+def test_counts_of_ended_threads_are_merged():
+    metrics = PipelineMetrics()
+    logger = quiet_logger("metrics_threads_test", metrics=metrics)
+    threads = [
+        threading.Thread(target=logger.info, args=("From a thread",))
+        for _ in range(5)
+    ]
+    for thread in threads:
+        thread.start()
+        thread.join()
+    logger.info("From the main thread")
+
+    assert logger.stats()["records"] == {"INFO": 6}
+    assert [thread for thread, _ in metrics._shards] == [
+        threading.current_thread()
+    ]
@@ -1,9 +1,30 @@
 import asyncio
+import contextlib
+import io
+import logging
+import os
 import time
+import tracemalloc
 
 import pytest
 
-from logger_kit import Logger
+from logger_kit import KeyMasker, Logger
+from logger_kit.dedup import Deduplicator
+from logger_kit.formatters import JsonFormatter, RecordFormatter
+from logger_kit.handlers import (
+    ConsoleHandler,
+    FileHandler,
+    RingBufferHandler,
+    RotatingFileHandler,
+)
+from logger_kit.metrics import PipelineMetrics
+from logger_kit.sampling import (
+    FirstNSampler,
+    ProbabilisticSampler,
+    RateLimitSampler,
+)
+from logger_kit.serializers import available_serializers
+from logger_kit.tail import TailBuffer
 
 
 @pytest.fixture
@@ -75,9 +96,14 @@ def test_bulk_logging_performance(logger, benchmark):
     benchmark(log_bulk)
 
 
-def test_different_log_levels_performance(logger, benchmark):
+@pytest.mark.parametrize("level", ["INFO", "ERROR"])
+def test_different_log_levels_performance(logger, benchmark, level):
+    logger.set_level(level)
+
     def log_different_levels():
+        logger.trace("Trace message")
         logger.debug("Debug message")
+        logger.notice("Notice message")
         logger.info("Info message")
         logger.warning("Warning message")
         logger.error("Error message")
@@ -116,6 +142,206 @@ def test_large_data_structure_logging_performance(logger, benchmark):
     benchmark(log_large_data)
 
 
+def _large_payload():
+    return {
+        "users": [
+            {
+                "id": i,
+                "name": f"user_{i}",
+                "metadata": {
+                    "role": "user",
+                    "active": True,
+                },
+            }
+            for i in range(100)
+        ],
+        "system_info": {
+            "version": "1.0.0",
+            "environment": "test",
+            "features": [f"feature_{i}" for i in range(50)],
+        },
+    }
+
+
+def test_disabled_level_large_data_logging_performance(logger, benchmark):
+    large_data = _large_payload()
+
+    def log_disabled_large_data():
+        logger.debug(
+            "Processing large data structure",
+            extra={
+                "data": large_data,
+            },
+        )
+
+    benchmark(log_disabled_large_data)
+
+
+def test_disabled_level_lazy_extra_logging_performance(logger, benchmark):
+    def log_disabled_lazy_extra():
+        logger.debug(
+            "Processing large data structure",
+            extra=lambda: {"data": _large_payload()},
+        )
+
+    benchmark(log_disabled_lazy_extra)
+
+
+@pytest.mark.parametrize(
+    "call", ["level_check", "f_string", "lazy_args", "lazy_message"]
+)
+def test_disabled_level_message_performance(logger, benchmark, call):
+    user, items = "alice", list(range(100))
+    is_enabled = logger.logger.isEnabledFor
+
+    def level_check():
+        if is_enabled(logging.DEBUG):
+            logger.debug(f"User {user} has items {items}")
+
+    calls = {
+        "level_check": level_check,
+        "f_string": lambda: logger.debug(f"User {user} has items {items}"),
+        "lazy_args": lambda: logger.debug("User %s has items %s", user, items),
+        "lazy_message": lambda: logger.debug(
+            lambda: f"User {user} has items {items}"
+        ),
+    }
+    benchmark(calls[call])
+
+
+@pytest.mark.parametrize("tail", [False, True], ids=["plain", "tail_buffer"])
+def test_disabled_level_tail_buffer_performance(benchmark, tail):
+    # Steady state without errors: filtered out debug calls are only kept
+    logger = Logger(
+        f"tail_{tail}",
+        level="INFO",
+        tail_buffer=TailBuffer(capacity=200) if tail else None,
+    )
+
+    def log_disabled_debug():
+        logger.debug("Cache lookup", extra={"key": "user:42", "hit": True})
+
+    benchmark(log_disabled_debug)
+
+
+def test_clean_data_masking_performance(benchmark):
+    masker = KeyMasker()
+    masker.add_exact_match("password")
+    masker.add_pattern("email", r"[^@]+@[^@]+\.[^@]+")
+    large_data = _large_payload()
+
+    result = benchmark(masker.mask_data, large_data)
+    assert result is large_data
+
+
+@pytest.mark.parametrize(
+    "shape_cache_size", [0, 256], ids=["uncached", "shape_cached"]
+)
+@pytest.mark.parametrize("shapes", ["repeated", "randomized"])
+def test_shape_cache_masking_performance(benchmark, shape_cache_size, shapes):
+    import itertools
+    import random
+
+    masker = KeyMasker(shape_cache_size=shape_cache_size)
+    masker.add_exact_match("password")
+    fields = [f"field_{i}" for i in range(20)]
+    if shapes == "repeated":
+        keys = [fields] * 1000
+    else:
+        keys = [random.sample(fields, 12) for _ in range(1000)]
+    payloads = itertools.cycle(
+        [
+            dict.fromkeys(record_keys, "value") | {"password": "secret"}
+            for record_keys in keys
+        ]
+    )
+
+    benchmark(lambda: masker.mask_data(next(payloads)))
+
+
+@pytest.mark.parametrize("pattern_count", [1, 10, 100])
+@pytest.mark.parametrize("strategy", ["combined", "per_pattern"])
+def test_content_scanning_performance(benchmark, pattern_count, strategy):
+    import re
+
+    patterns = [rf"tok{i:03d}_[0-9a-f]{{16}}" for i in range(pattern_count)]
+    text = (
+        "user 42 refreshed session tok000_0123456789abcdef from 10.0.0.1 "
+        "after the previous request timed out; retrying with backoff"
+    )
+
+    if strategy == "combined":
+        masker = KeyMasker()
+        for index, pattern in enumerate(patterns):
+            masker.add_value_pattern(f"token_{index}", pattern)
+        scan = masker.mask_text
+    else:
+        compiled = [re.compile(pattern) for pattern in patterns]
+
+        def scan(value):
+            for pattern in compiled:
+                value = pattern.sub("*****", value)
+            return value
+
+    assert "*****" in benchmark(scan, text)
+
+
+SERIALIZER_PAYLOADS = {
+    "simple": {},
+    "structured": {"user_id": 123, "action": "test", "timestamp": 1.5},
+    "masked": {"user": {"email": "*****", "password": "*****"}},
+    "large": {"data": _large_payload()},
+}
+
+
+@pytest.mark.parametrize("payload", list(SERIALIZER_PAYLOADS))
+@pytest.mark.parametrize("backend", available_serializers())
+def test_serializer_backend_performance(benchmark, backend, payload):
+    formatter = JsonFormatter(
+        fmt="%(asctime)s %(name)s %(levelname)s %(message)s",
+        json_ensure_ascii=False,
+        rename_fields={"message": "@message"},
+        serializer=backend,
+    )
+    record = logging.LogRecord(
+        "benchmark", logging.INFO, __file__, 1, "Benchmark", (), None
+    )
+    record.__dict__.update(SERIALIZER_PAYLOADS[payload])
+
+    benchmark(formatter.format_bytes, record)
+
+
+@pytest.mark.parametrize("payload", list(SERIALIZER_PAYLOADS))
+@pytest.mark.parametrize("formatter_name", ["json", "fast"])
+def test_formatter_performance(benchmark, formatter_name, payload):
+    if formatter_name == "json":
+        formatter = JsonFormatter(
+            fmt="%(asctime)s %(name)s %(levelname)s %(message)s",
+            json_ensure_ascii=False,
+            rename_fields={"message": "@message"},
+        )
+    else:
+        formatter = RecordFormatter(rename_fields={"message": "@message"})
+    record = logging.LogRecord(
+        "benchmark", logging.INFO, __file__, 1, "Benchmark", (), None
+    )
+    record.__dict__.update(SERIALIZER_PAYLOADS[payload])
+
+    benchmark(formatter.format, record)
+
+
+def test_fast_formatter_logging_performance(benchmark):
+    logger = Logger(name="benchmark_fast_formatter", formatter="fast")
+
+    def log_structured():
+        logger.info(
+            "Structured log message",
+            extra={"user_id": 123, "action": "test", "timestamp": time.time()},
+        )
+
+    benchmark(log_structured)
+
+
 def test_error_logging_with_traceback_performance(logger, benchmark):
     def generate_error():
         try:
@@ -133,13 +359,23 @@ def test_error_logging_with_traceback_performance(logger, benchmark):
     benchmark(generate_error)
 
 
-def test_multiple_handlers_logging_performance(logger, benchmark):
-    import logging
-    import os
+@pytest.mark.parametrize("sink_count", [1, 4])
+def test_multiple_handlers_logging_performance(
+    logger, benchmark, tmp_path, sink_count
+):
+    # Additional file handlers sharing the logger's formatter
+    file_handlers = [
+        logger.add_handler(logging.FileHandler(tmp_path / f"{i}.log"))
+        for i in range(sink_count)
+    ]
+    formats = []
+    build = logger.formatter._build_log_record
+
+    def counting_build(record):
+        formats.append(record)
+        return build(record)
 
-    # Add an additional file handler
-    file_handler = logging.FileHandler("benchmark_test.log")
-    logger.logger.addHandler(file_handler)
+    logger.formatter._build_log_record = counting_build
 
     def log_with_multiple_handlers():
         logger.info(
@@ -148,9 +384,271 @@ def test_multiple_handlers_logging_performance(logger, benchmark):
         )
 
     benchmark(log_with_multiple_handlers)
+    # Each record was formatted once, however many sinks wrote it
+    with open(file_handlers[0].baseFilename) as f:
+        assert len(formats) == len(f.readlines())
     # Cleanup
-    logger.logger.removeHandler(file_handler)
-    file_handler.close()
+    for file_handler in file_handlers:
+        logger.logger.removeHandler(file_handler)
+        file_handler.close()
+
+
+class SlowHandler(logging.Handler):
+    """Handler simulating a stalled stdout or disk write."""
 
-    if os.path.exists("benchmark_test.log"):
-        os.remove("benchmark_test.log")
+    def emit(self, record):
+        time.sleep(0.0005)
+
+
+def _caller_p99_ns(logger, count=200):
+    latencies = []
+    for i in range(count):
+        start = time.perf_counter_ns()
+        logger.info("Latency probe", extra={"iteration": i})
+        latencies.append(time.perf_counter_ns() - start)
+    latencies.sort()
+    return latencies[int(len(latencies) * 0.99) - 1]
+
+
+def test_queued_logging_performance(benchmark):
+    queued_logger = Logger(name="benchmark_queued", level="INFO", queued=True)
+
+    def log_queued():
+        queued_logger.info("Queued log message", extra={"task_id": 123})
+
+    benchmark(log_queued)
+    queued_logger.close()
+
+
+def test_queued_logging_caller_p99_latency(benchmark):
+    sync_logger = Logger(name="benchmark_p99_sync")
+    queued_logger = Logger(name="benchmark_p99_queued", queued=True)
+    slow_handler = SlowHandler()
+    sync_logger.logger.addHandler(slow_handler)
+    queued_logger.logger.addHandler(slow_handler)
+
+    try:
+        sync_p99 = _caller_p99_ns(sync_logger)
+        queued_p99 = benchmark.pedantic(
+            _caller_p99_ns, args=(queued_logger,), rounds=1, iterations=1
+        )
+        queued_logger.flush()
+    finally:
+        queued_logger.close()
+        sync_logger.logger.removeHandler(slow_handler)
+        queued_logger.logger.removeHandler(slow_handler)
+
+    benchmark.extra_info["sync_p99_ns"] = sync_p99
+    benchmark.extra_info["queued_p99_ns"] = queued_p99
+    assert queued_p99 < sync_p99
+
+
+@pytest.mark.parametrize("queued", [False, True], ids=["executor", "queued"])
+def test_async_logging_backend_performance(benchmark, queued):
+    logger = Logger(name=f"benchmark_async_{queued}", queued=queued)
+    loop = asyncio.new_event_loop()
+
+    async def log_async_burst():
+        for i in range(100):
+            await logger.ainfo("Async log message", extra={"task_id": i})
+
+    try:
+        benchmark(lambda: loop.run_until_complete(log_async_burst()))
+        loop.run_until_complete(logger.aclose())
+    finally:
+        loop.close()
+
+
+@pytest.mark.parametrize("buffer_size", [0, 65536], ids=["direct", "batched"])
+@pytest.mark.parametrize("handler_class", [FileHandler, RotatingFileHandler])
+def test_file_handler_performance(
+    benchmark, tmp_path, handler_class, buffer_size
+):
+    handler = handler_class(
+        str(tmp_path / "benchmark.log"), buffer_size=buffer_size
+    ).get_handler()
+    formatter = RecordFormatter(rename_fields={"message": "@message"})
+    handler.setFormatter(formatter)
+    record = logging.LogRecord(
+        "benchmark", logging.INFO, __file__, 1, "File log message", (), None
+    )
+    record.__dict__.update({"user_id": 123, "action": "test"})
+
+    benchmark(handler.handle, record)
+    handler.close()
+
+
+@pytest.mark.parametrize("sink", ["ring_buffer", "file", "batched_file"])
+def test_ring_buffer_handler_performance(benchmark, tmp_path, sink):
+    if sink == "ring_buffer":
+        handler = RingBufferHandler(str(tmp_path / "benchmark.ring"))
+    else:
+        buffer_size = 65536 if sink == "batched_file" else 0
+        handler = FileHandler(
+            str(tmp_path / "benchmark.log"), buffer_size=buffer_size
+        )
+    handler = handler.get_handler()
+    handler.setFormatter(RecordFormatter())
+    record = logging.LogRecord(
+        "benchmark", logging.DEBUG, __file__, 1, "Flight record", (), None
+    )
+    record.__dict__.update({"user_id": 123, "action": "test"})
+
+    benchmark(handler.handle, record)
+    handler.close()
+
+
+SAMPLERS = {
+    "probabilistic": lambda: ProbabilisticSampler(rate=0.0),
+    "rate_limit": lambda: RateLimitSampler(rate=0.001, burst=1),
+    "first_n": lambda: FirstNSampler(first=0, every=10**9),
+}
+
+
+@pytest.mark.parametrize("sample_by", ["message", "site"])
+@pytest.mark.parametrize("sampler", list(SAMPLERS))
+def test_sampled_out_logging_performance(benchmark, sampler, sample_by):
+    logger = Logger(
+        f"sampled_{sampler}_{sample_by}",
+        sampler=SAMPLERS[sampler](),
+        sample_by=sample_by,
+    )
+    logger.logger.handlers = []
+    logger.logger.propagate = False
+    large_data = _large_payload()
+
+    def log_sampled_out():
+        logger.info("Hot loop iteration", extra={"data": large_data})
+
+    benchmark(log_sampled_out)
+
+
+@pytest.mark.parametrize("dedup", [False, True], ids=["plain", "deduplicated"])
+def test_duplicate_flood_logging_performance(benchmark, tmp_path, dedup):
+    logger = Logger(
+        f"duplicate_flood_{dedup}",
+        level="ERROR",
+        deduplicator=Deduplicator(window=1.0) if dedup else None,
+    )
+    handler = FileHandler(str(tmp_path / "flood.log")).get_handler()
+    handler.setFormatter(logger.logger.handlers[0].formatter)
+    logger.logger.handlers = [handler]
+    logger.logger.propagate = False
+
+    def log_flood():
+        for _ in range(1000):
+            logger.error(
+                "Database unavailable", extra={"host": "db1", "retry": True}
+            )
+
+    benchmark(log_flood)
+    logger.close()
+
+
+BOUND_FIELDS = {
+    "service": "web",
+    "environment": "production",
+    "region": "eu-west-1",
+    "version": "1.4.2",
+    "host": "web-12",
+    "request_id": "5f0c1a",
+    "user_id": 123,
+    "session": "s-42",
+    "api_key": "sk-live-abcdef",
+    "client_ip": "10.0.0.1",
+}
+
+
+@pytest.mark.parametrize("formatter", ["json", "fast"])
+@pytest.mark.parametrize("style", ["extra", "bound"])
+def test_bound_fields_logging_performance(benchmark, style, formatter):
+    logger = Logger(f"bound_fields_{style}_{formatter}", formatter=formatter)
+    logger.key_masker.add_exact_match("api_key")
+    logger.logger.handlers[0].setStream(io.StringIO())
+    logger.logger.propagate = False
+    bound = logger.bind(**BOUND_FIELDS)
+
+    def log_with_extra():
+        logger.info("Request handled", extra={**BOUND_FIELDS, "status": 200})
+
+    def log_bound():
+        bound.info("Request handled", extra={"status": 200})
+
+    benchmark(log_bound if style == "bound" else log_with_extra)
+
+
+@pytest.mark.parametrize("scope", ["none", "fields", "level"])
+def test_context_logging_performance(benchmark, scope):
+    logger = Logger(f"context_{scope}", level="INFO", formatter="fast")
+    logger.key_masker.add_exact_match("api_key")
+    logger.logger.handlers[0].setStream(io.StringIO())
+    logger.logger.propagate = False
+    if scope == "fields":
+        context = logger.context(**BOUND_FIELDS)
+    elif scope == "level":
+        context = logger.context(level="DEBUG", **BOUND_FIELDS)
+    else:
+        context = contextlib.nullcontext()
+
+    with context:
+        benchmark(logger.info, "Request handled", extra={"status": 200})
+
+
+def _peak_bytes_per_record(logger, count=100):
+    """Return the mean peak of memory traced while logging one record."""
+    logger.info("Warm up", extra={"status": 200})
+    peaks = []
+    tracemalloc.start()
+    try:
+        for i in range(count):
+            tracemalloc.reset_peak()
+            current = tracemalloc.get_traced_memory()[0]
+            logger.info("Request handled", extra={"status": 200})
+            peaks.append(tracemalloc.get_traced_memory()[1] - current)
+    finally:
+        tracemalloc.stop()
+    return sum(peaks) / len(peaks)
+
+
+@pytest.mark.parametrize("record", ["compact", "caller_info", "log_record"])
+def test_record_allocations_performance(benchmark, record):
+    logger = Logger(
+        f"allocations_{record}",
+        formatter="fast",
+        caller_info=record == "caller_info",
+        console=False,
+    )
+    logger.logger.propagate = False
+    with open(os.devnull, "w") as devnull:
+        if record == "log_record":
+            # A stdlib handler gets a LogRecord built for it
+            handler = logger.add_handler(logging.StreamHandler(devnull))
+        else:
+            handler = logger.add_handler(ConsoleHandler(devnull))
+        try:
+            peak = benchmark.pedantic(
+                _peak_bytes_per_record, args=(logger,), rounds=1, iterations=1
+            )
+        finally:
+            logger.logger.removeHandler(handler)
+    benchmark.extra_info["peak_bytes_per_record"] = peak
+
+
+@pytest.mark.parametrize("metrics", [False, True], ids=["plain", "metrics"])
+def test_metrics_overhead_performance(benchmark, metrics):
+    logger = Logger(
+        f"metrics_{metrics}",
+        level="INFO",
+        formatter="fast",
+        metrics=PipelineMetrics() if metrics else None,
+        console=False,
+    )
+    logger.key_masker.add_exact_match("api_key")
+    logger.logger.propagate = False
+    with open(os.devnull, "w") as devnull:
+        handler = logger.add_handler(ConsoleHandler(devnull))
+        benchmark(logger.info, "Request handled", extra={"status": 200})
+        logger.logger.removeHandler(handler)
+    if metrics:
+        stats = logger.stats()
+        benchmark.extra_info["timed"] = stats["latency"]["emit"]["count"]
@@ -0,0 +1,146 @@
+import io
+import json
+import logging
+import sys
+
+import pytest
+
+from logger_kit import Logger
+from logger_kit.formatters import JsonFormatter, RecordFormatter
+from logger_kit.records import CompactRecord
+
+
+class RecordingHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+def record_pair(extra=None):
+    compact = CompactRecord(
+        "records_test",
+        logging.INFO,
+        "INFO",
+        "Hello",
+        extra,
+        1700000000.25,
+        ("/app/service.py", 12, "handle"),
+    )
+    return compact, compact.to_log_record()
+
+
+@pytest.mark.parametrize(
+    "formatter",
+    [
+        RecordFormatter(),
+        RecordFormatter(
+            fields=("asctime", "message", "filename", "lineno", "funcName"),
+            rename_fields={"message": "msg", "user_id": "user"},
+        ),
+        JsonFormatter("%(asctime)s %(levelname)s %(message)s %(module)s"),
+    ],
+)
+def test_compact_record_formats_like_a_log_record(formatter):
+    assert formatter.accepts_compact
+    compact, record = record_pair({"user_id": 1, "tags": ["a"]})
+    assert formatter.format(compact) == formatter.format(record)
+
+
+def test_formatters_needing_more_fields_do_not_accept_compact():
+    assert not RecordFormatter(fields=("message", "thread")).accepts_compact
+    assert not JsonFormatter(
+        "%(message)s", static_fields={"app": "api"}
+    ).accepts_compact
+
+
+def test_stdlib_handler_receives_a_log_record(capsys):
+    logger = Logger("records_stdlib_test")
+    logger.logger.propagate = False
+    handler = logger.add_handler(RecordingHandler())
+    filtered = logger.add_handler(RecordingHandler())
+    filtered.addFilter(lambda record: record.user_id == 2)
+
+    logger.info("Converted", extra={"user_id": 1})
+    logger.info("Filtered", extra={"user_id": 2})
+    (record,) = filtered.records
+    assert type(record) is logging.LogRecord
+    assert record.getMessage() == "Filtered"
+    # Handlers of one record share the one conversion
+    assert handler.records[1] is record
+    assert handler.records[0].user_id == 1
+    err = capsys.readouterr().err
+    assert [json.loads(line)["@message"] for line in err.splitlines()] == [
+        "Converted",
+        "Filtered",
+    ]
+    logger.logger.removeHandler(handler)
+    logger.logger.removeHandler(filtered)
+
+
+def test_logger_filters_see_a_log_record():
+    logger = Logger("records_filter_test", console=False)
+    logger.logger.propagate = False
+    handler = logger.add_handler(RecordingHandler())
+    logger.logger.addFilter(lambda record: record.levelno >= logging.WARNING)
+    logger.info("Dropped")
+    logger.warning("Kept")
+    assert [r.getMessage() for r in handler.records] == ["Kept"]
+    logger.logger.removeHandler(handler)
+
+
+def test_records_propagate_to_parent_handlers():
+    parent = logging.getLogger("records_parent")
+    handler = RecordingHandler()
+    parent.addHandler(handler)
+    logger = Logger("records_parent.child", console=False)
+    logger.info("To the parent")
+    logger.logger.propagate = False
+    logger.info("Not to the parent")
+    parent.removeHandler(handler)
+    assert [r.getMessage() for r in handler.records] == ["To the parent"]
+
+
+def test_caller_info_is_opt_in():
+    stream = io.StringIO()
+    fields = ("message", "filename", "lineno", "funcName")
+    for caller_info in (False, True):
+        logger = Logger(
+            f"records_caller_{caller_info}_test",
+            formatter=RecordFormatter(fields=fields),
+            caller_info=caller_info,
+            console=False,
+        )
+        logger.logger.propagate = False
+        logger.add_handler(logging.StreamHandler(stream))
+        logger.info("Where")
+        line = sys._getframe().f_lineno - 1
+
+    plain, traced = map(json.loads, stream.getvalue().splitlines())
+    assert plain["filename"] == "(unknown file)"
+    assert traced["filename"] == "test_records.py"
+    assert traced["lineno"] == line
+    assert traced["funcName"] == "test_caller_info_is_opt_in"
+
+
+@pytest.mark.asyncio
+async def test_async_caller_info():
+    logger = Logger(
+        "records_async_caller_test",
+        formatter=RecordFormatter(fields=("message", "funcName")),
+        caller_info=True,
+        console=False,
+    )
+    logger.logger.propagate = False
+    handler = logger.add_handler(RecordingHandler())
+    await logger.ainfo("Where")
+    assert handler.records[0].funcName == "test_async_caller_info"
+    logger.logger.removeHandler(handler)
+
+
+def test_extra_may_not_overwrite_record_attributes():
+    logger = Logger("records_clash_test", console=False)
+    with pytest.raises(KeyError):
+        logger.info("Clash", extra={"lineno": 1})
@@ -0,0 +1,165 @@
+import io
+import json
+import logging
+
+import pytest
+
+from logger_kit import (
+    Logger,
+    configure,
+    get_sink,
+    register_sink,
+    unregister_sink,
+)
+from logger_kit.formatters import RecordFormatter
+from logger_kit.handlers import ConsoleHandler, FileHandler
+
+
+def test_logger_built_twice_has_one_console_handler(capsys):
+    Logger("registry_twice_test")
+    logger = Logger("registry_twice_test")
+    consoles = [
+        h for h in logger.logger.handlers if isinstance(h, ConsoleHandler)
+    ]
+    assert len(consoles) == 1
+
+    logger.info("Once")
+    assert capsys.readouterr().err.count("Once") == 1
+
+
+def test_console_can_be_left_out(capsys):
+    logger = Logger("registry_no_console_test", console=False)
+    assert logger.logger.handlers == []
+    logger.info("Nowhere")
+    assert "Nowhere" not in capsys.readouterr().err
+
+
+def test_console_of_an_earlier_logger_is_kept(capsys):
+    first = Logger("registry_keep_console_test")
+    second = Logger("registry_keep_console_test", console=False)
+    assert len(second.logger.handlers) == 1
+    first.info("Still on the console")
+    assert "Still on the console" in capsys.readouterr().err
+
+
+def test_sinks_share_the_logger_formatter(tmp_path, read_lines):
+    wrapper = FileHandler(str(tmp_path / "wrapped.log"))
+    handler = logging.FileHandler(tmp_path / "plain.log")
+    logger = Logger(
+        "registry_sinks_test", formatter="fast", sinks=[wrapper, handler]
+    )
+    logger.add_handler(handler)
+
+    assert logger.logger.handlers.count(handler) == 1
+    assert wrapper.get_handler().formatter is logger.formatter
+    assert handler.formatter is logger.formatter
+
+    logger.info("Shared", extra={"user_id": 1})
+    logger.flush()
+    for name in ("wrapped.log", "plain.log"):
+        (record,) = read_lines(tmp_path / name)
+        assert record["@message"] == "Shared"
+        assert record["user_id"] == 1
+    for h in (wrapper.get_handler(), handler):
+        logger.logger.removeHandler(h)
+        h.close()
+
+
+def test_record_is_formatted_once_for_all_handlers(
+    tmp_path, monkeypatch, read_lines
+):
+    logger = Logger("registry_format_once_test", formatter="fast")
+    logger.logger.handlers[0].setStream(io.StringIO())
+    handlers = [
+        logger.add_handler(logging.FileHandler(tmp_path / f"{i}.log"))
+        for i in range(4)
+    ]
+    calls = []
+    build = logger.formatter._build_log_record
+    monkeypatch.setattr(
+        logger.formatter,
+        "_build_log_record",
+        lambda record: calls.append(record) or build(record),
+    )
+
+    logger.info("First")
+    logger.info("Second")
+    assert len(calls) == 2
+    for handler in handlers:
+        logger.logger.removeHandler(handler)
+        handler.close()
+        assert len(read_lines(handler.baseFilename)) == 2
+
+
+def test_formatting_a_record_again_is_not_cached():
+    formatter = RecordFormatter()
+    record = logging.LogRecord("test", logging.INFO, "", 0, "Old", (), None)
+    assert json.loads(formatter.format(record))["message"] == "Old"
+    record.msg = "New"
+    assert json.loads(formatter.format(record))["message"] == "New"
+
+
+def test_register_sink(tmp_path):
+    handler = register_sink(
+        "registry_file", FileHandler(str(tmp_path / "app.log"))
+    )
+    assert get_sink("registry_file") is handler
+    logger = Logger("registry_named_sink_test", sinks=["registry_file"])
+    assert handler in logger.logger.handlers
+
+    unregister_sink("registry_file")
+    assert handler not in logger.logger.handlers
+    with pytest.raises(KeyError):
+        get_sink("registry_file")
+    with pytest.raises(KeyError):
+        Logger("registry_missing_sink_test", sinks=["registry_file"])
+
+
+def test_configure(tmp_path, read_lines):
+    path = str(tmp_path / "app.log")
+    config = {
+        "sinks": {
+            "configure_file": {
+                "type": "file",
+                "filename": path,
+                "level": "warning",
+            },
+        },
+        "loggers": {
+            "configure_api": {
+                "level": "DEBUG",
+                "formatter": "fast",
+                "console": False,
+                "sinks": ["configure_file"],
+            },
+            "configure_db": {"console": False, "sinks": ["configure_file"]},
+        },
+    }
+    loggers = configure(config)
+    sink = get_sink("configure_file")
+    # Configuring again keeps the sink and adds no handler
+    loggers = configure(config)
+    assert get_sink("configure_file") is sink
+    api, db = loggers["configure_api"], loggers["configure_db"]
+    assert api.logger.handlers == [sink]
+    assert db.logger.handlers == [sink]
+    assert sink.level == logging.WARNING
+    assert isinstance(sink.formatter, RecordFormatter)
+
+    api.debug("Filtered by the sink")
+    api.error("From api")
+    db.warning("From db")
+    sink.flush()
+    records = read_lines(path)
+    assert [r["@message"] for r in records] == ["From api", "From db"]
+
+    config["sinks"]["configure_file"]["filename"] = str(tmp_path / "b.log")
+    configure(config)
+    assert get_sink("configure_file") is not sink
+    assert api.logger.handlers == [get_sink("configure_file")]
+    unregister_sink("configure_file")
+
+
+def test_configure_unknown_sink_type():
+    with pytest.raises(ValueError):
+        configure({"sinks": {"bad": {"type": "carrier_pigeon"}}})
@@ -0,0 +1,132 @@
+import json
+import logging
+import subprocess
+import sys
+
+import pytest
+
+from logger_kit.formatters import RecordFormatter
+from logger_kit.handlers import MmapRingHandler, RingBufferHandler
+from logger_kit.ringbuffer import (
+    FRAME,
+    HEADER_SIZE,
+    RingBuffer,
+    RingBufferReader,
+)
+
+
+def records(path):
+    reader = RingBufferReader(str(path))
+    try:
+        return list(reader)
+    finally:
+        reader.close()
+
+
+def test_records_round_trip(tmp_path):
+    path = tmp_path / "ring.bin"
+    ring = RingBuffer(str(path), capacity=4096)
+    for i in range(10):
+        assert ring.write(f"record {i}".encode())
+    ring.close()
+
+    assert records(path) == [f"record {i}".encode() for i in range(10)]
+
+
+def test_wraparound_keeps_newest_records(tmp_path):
+    path = tmp_path / "ring.bin"
+    ring = RingBuffer(str(path), capacity=256)
+    payloads = [f"record {i:03d}".encode() for i in range(100)]
+    for payload in payloads:
+        ring.write(payload)
+    ring.close()
+
+    kept = records(path)
+    # Each frame is 18 bytes, so 14 of them fit in 256 bytes
+    assert kept == payloads[-14:]
+
+
+def test_reopening_appends(tmp_path):
+    path = tmp_path / "ring.bin"
+    ring = RingBuffer(str(path), capacity=256)
+    ring.write(b"first run")
+    ring.close()
+    ring = RingBuffer(str(path), capacity=1024)
+    assert ring.capacity == 256
+    ring.write(b"second run")
+    ring.close()
+
+    assert records(path) == [b"first run", b"second run"]
+
+
+def test_oversized_record_is_dropped(tmp_path):
+    ring = RingBuffer(str(tmp_path / "ring.bin"), capacity=64)
+    assert not ring.write(b"x" * 64)
+    assert ring.dropped == 1
+    ring.close()
+
+
+def test_torn_record_is_detected(tmp_path):
+    path = tmp_path / "ring.bin"
+    ring = RingBuffer(str(path), capacity=4096)
+    for i in range(3):
+        ring.write(f"record {i}".encode())
+    ring.close()
+
+    # Corrupt the payload of the second frame
+    frame_size = FRAME.size + len(b"record 0")
+    with open(path, "r+b") as f:
+        f.seek(HEADER_SIZE + frame_size + FRAME.size)
+        f.write(b"X")
+
+    reader = RingBufferReader(str(path))
+    assert list(reader) == [b"record 0", b"record 2"]
+    assert reader.corrupted == 1
+    reader.close()
+
+
+def test_incremental_reads(tmp_path):
+    path = tmp_path / "ring.bin"
+    ring = RingBuffer(str(path), capacity=4096)
+    reader = RingBufferReader(str(path))
+    ring.write(b"one")
+    batch, position = reader.read()
+    assert batch == [b"one"]
+    ring.write(b"two")
+    batch, position = reader.read(position)
+    assert batch == [b"two"]
+    reader.close()
+    ring.close()
+
+
+def test_not_a_ring_buffer(tmp_path):
+    path = tmp_path / "plain.log"
+    path.write_bytes(b"x" * 128)
+    with pytest.raises(ValueError):
+        RingBufferReader(str(path))
+
+
+def test_handler_and_cli(tmp_path):
+    path = tmp_path / "logs" / "flight.ring"
+    handler = RingBufferHandler(str(path), capacity=65536).get_handler()
+    assert isinstance(handler, MmapRingHandler)
+    handler.setFormatter(RecordFormatter(fields=["levelname", "message"]))
+    logger = logging.getLogger("ring_handler_test")
+    logger.handlers = [handler]
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+
+    for i in range(5):
+        logger.debug(f"Flight record {i}")
+    handler.close()
+
+    result = subprocess.run(
+        [sys.executable, "-m", "logger_kit.ringbuffer", str(path)],
+        capture_output=True,
+        check=True,
+    )
+    lines = result.stdout.decode().splitlines()
+    assert [json.loads(line) for line in lines] == [
+        {"levelname": "DEBUG", "message": f"Flight record {i}"}
+        for i in range(5)
+    ]
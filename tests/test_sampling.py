@@ -0,0 +1,156 @@
+import pytest
+
+from logger_kit import Logger
+from logger_kit.sampling import (
+    FirstNSampler,
+    ProbabilisticSampler,
+    RateLimitSampler,
+    Sampler,
+)
+
+
+def test_first_n_then_every_mth():
+    sampler = FirstNSampler(first=3, every=5)
+    allowed = [n for n in range(1, 21) if sampler.allow("INFO", "key")]
+    assert allowed == [1, 2, 3, 8, 13, 18]
+
+
+def test_first_n_counts_per_key():
+    sampler = FirstNSampler(first=1, every=1000)
+    assert sampler.allow("INFO", "a")
+    assert sampler.allow("INFO", "b")
+    assert not sampler.allow("INFO", "a")
+
+
+def test_probabilistic_rate():
+    sampler = ProbabilisticSampler(rate=0.25, rates={"rare": 0.0}, seed=1)
+    allowed = sum(sampler.allow("INFO", "key") for _ in range(10000))
+    assert 2200 < allowed < 2800
+    assert not any(sampler.allow("INFO", "rare") for _ in range(100))
+
+
+def test_rate_limit_bucket(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("time.monotonic", lambda: now[0])
+    sampler = RateLimitSampler(rate=2, burst=3)
+    assert [sampler.allow("INFO", "k") for _ in range(4)] == [
+        True,
+        True,
+        True,
+        False,
+    ]
+    now[0] += 0.5
+    assert sampler.allow("INFO", "k")
+    assert not sampler.allow("INFO", "k")
+
+
+def test_warnings_are_never_sampled():
+    sampler = FirstNSampler(first=0, every=1000)
+    assert all(sampler.allow("WARNING", "key") for _ in range(10))
+    assert not sampler.allow("INFO", "key")
+
+
+def test_logger_drops_before_masking(monkeypatch, console_messages):
+    logger = Logger(
+        "sampling_logger_test", sampler=FirstNSampler(first=2, every=1000)
+    )
+    masked = []
+    mask_data = logger.key_masker.mask_data
+    monkeypatch.setattr(
+        logger.key_masker,
+        "mask_data",
+        lambda data: masked.append(data) or mask_data(data),
+    )
+
+    for i in range(10):
+        logger.info("Hot loop", extra={"i": i})
+
+    assert [m["i"] for m in console_messages()] == [0, 1]
+    assert len(masked) == 2
+
+
+def test_sample_by_site(console_messages):
+    logger = Logger(
+        "sampling_site_test",
+        sampler=FirstNSampler(first=1, every=1000),
+        sample_by="site",
+    )
+
+    for i in range(3):
+        logger.info(f"Message {i}")
+        logger.info(f"Other site {i}")
+
+    assert [m["@message"] for m in console_messages()] == [
+        "Message 0",
+        "Other site 0",
+    ]
+
+
+def test_summary_record(console_messages):
+    logger = Logger(
+        "sampling_summary_test",
+        sampler=FirstNSampler(first=1, every=1000, summary_interval=3600),
+    )
+
+    for _ in range(5):
+        logger.info("Noisy")
+    logger.close()
+
+    summary = console_messages()[-1]
+    assert summary["levelname"] == "WARNING"
+    assert summary["suppressed"] == 4
+    assert summary["suppressed_by_key"] == {"Noisy": 4}
+
+
+def test_summary_has_no_context_fields(console_messages):
+    logger = Logger(
+        "sampling_summary_fields_test",
+        sampler=FirstNSampler(first=1, every=1000, summary_interval=3600),
+        extra={"service": "api"},
+    )
+    bound = logger.bind(user_id=1)
+
+    with logger.context(request_id="b"):
+        for _ in range(5):
+            bound.info("Noisy")
+        bound.close()
+
+    first, summary = console_messages()
+    assert (first["user_id"], first["request_id"]) == (1, "b")
+    assert summary["service"] == "api"
+    assert "user_id" not in summary and "request_id" not in summary
+
+
+@pytest.mark.asyncio
+async def test_async_records_are_sampled_once(console_messages):
+    logger = Logger(
+        "sampling_async_test", sampler=FirstNSampler(first=2, every=1000)
+    )
+
+    for i in range(5):
+        await logger.ainfo("Async hot loop", extra={"i": i})
+
+    assert [m["i"] for m in console_messages()] == [0, 1]
+
+
+def test_unknown_sample_by():
+    with pytest.raises(ValueError):
+        Logger("sampling_invalid_test", sample_by="thread")
+
+
+def test_summary_respects_logger_level(console_messages):
+    logger = Logger(
+        "sampling_summary_level_test",
+        sampler=FirstNSampler(first=1, every=1000, summary_interval=3600),
+    )
+    for _ in range(5):
+        logger.info("Noisy")
+    logger.set_level("ERROR")
+    logger.close()
+
+    assert [m["@message"] for m in console_messages()] == ["Noisy"]
+
+
+def test_sampler_requires_allow():
+    with pytest.raises(TypeError):
+        Sampler()
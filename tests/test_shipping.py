@@ -0,0 +1,193 @@
+import gzip
+import json
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from logger_kit.handlers import NetworkHandler
+from logger_kit.shipping import NDJSONShippingHandler
+
+
+class Collector(ThreadingHTTPServer):
+    """HTTP stand-in for a log collector."""
+
+    daemon_threads = True
+
+    def __init__(self, status=200, port=0):
+        super().__init__(("127.0.0.1", port), CollectorRequestHandler)
+        self.status = status
+        self.batches = []
+        self.connections = set()
+        self.requests = 0
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_port}/ingest"
+
+    @property
+    def messages(self):
+        return [m for batch in self.batches for m in batch]
+
+    def wait_for(self, count, timeout=5):
+        deadline = time.monotonic() + timeout
+        while len(self.messages) < count and time.monotonic() < deadline:
+            time.sleep(0.01)
+        return self.messages
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+class CollectorRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        server = self.server
+        server.requests += 1
+        server.connections.add(self.client_address)
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        if self.headers.get("Content-Encoding") == "gzip":
+            body = gzip.decompress(body)
+        if server.status == 200:
+            server.batches.append(
+                [json.loads(line)["message"] for line in body.splitlines()]
+            )
+        self.send_response(server.status)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def collector():
+    collector = Collector()
+    yield collector
+    collector.stop()
+
+
+def test_batches_over_one_connection(collector, make_logger):
+    handler = NetworkHandler(collector.url, linger=0.2).get_handler()
+    assert isinstance(handler, NDJSONShippingHandler)
+    logger = make_logger("shipping_batch_test", handler)
+
+    for i in range(200):
+        logger.info(f"Shipped {i}")
+    messages = collector.wait_for(200)
+    handler.close()
+
+    assert messages == [f"Shipped {i}" for i in range(200)]
+    assert collector.requests < 10
+    assert len(collector.connections) == 1
+    assert handler.sent == 200
+
+
+def test_compressed_payloads(collector, make_logger):
+    handler = NDJSONShippingHandler(collector.url, compress=True, linger=0)
+    logger = make_logger("shipping_gzip_test", handler)
+
+    logger.info("Compressed")
+    assert handler.drain(timeout=5)
+    handler.close()
+
+    assert collector.messages == ["Compressed"]
+
+
+def test_retries_server_errors(collector, make_logger):
+    collector.status = 503
+    handler = NDJSONShippingHandler(
+        collector.url, linger=0, retry_delay=0.1, max_retries=5
+    )
+    logger = make_logger("shipping_retry_test", handler)
+
+    logger.info("Eventually delivered")
+    time.sleep(0.15)
+    collector.status = 200
+    messages = collector.wait_for(1)
+    handler.close()
+
+    assert messages == ["Eventually delivered"]
+    assert collector.requests > 1
+
+
+def test_client_errors_are_not_retried(collector, capsys, make_logger):
+    collector.status = 400
+    handler = NDJSONShippingHandler(collector.url, linger=0)
+    logger = make_logger("shipping_reject_test", handler)
+
+    logger.info("Rejected")
+    handler.flush()
+    handler.close()
+
+    assert collector.requests == 1
+    assert handler.failed == 1
+    assert "Dropped log batch of 1: Collector answered 400" in (
+        capsys.readouterr().err
+    )
+
+
+def test_spills_to_disk_while_collector_is_down(
+    tmp_path, collector, make_logger
+):
+    spill_dir = tmp_path / "spill"
+    url = collector.url
+    collector.stop()
+    handler = NDJSONShippingHandler(
+        url,
+        linger=0,
+        max_retries=0,
+        spill_dir=str(spill_dir),
+    )
+    logger = make_logger("shipping_spill_test", handler)
+
+    logger.info("Spilled")
+    handler.flush()
+    handler.close(timeout=None)
+    assert handler.spilled == 1
+    assert len(list(spill_dir.iterdir())) == 1
+
+    # A new handler replays the spill once the collector accepts a batch
+    revived = Collector(port=int(url.split(":")[2].split("/")[0]))
+    try:
+        handler = NDJSONShippingHandler(
+            url, linger=0, spill_dir=str(spill_dir)
+        )
+        logger = make_logger("shipping_replay_test", handler)
+        logger.info("Live")
+        messages = revived.wait_for(2)
+        handler.close()
+    finally:
+        revived.stop()
+
+    assert sorted(messages) == ["Live", "Spilled"]
+    assert not list(spill_dir.iterdir())
+
+
+def test_tcp_transport(make_logger):
+    server = socket.socket()
+    server.bind(("127.0.0.1", 0))
+    server.listen()
+    port = server.getsockname()[1]
+    handler = NDJSONShippingHandler(f"tcp://127.0.0.1:{port}", linger=0)
+    logger = make_logger("shipping_tcp_test", handler)
+
+    logger.info("Over TCP")
+    conn, _ = server.accept()
+    conn.settimeout(5)
+    data = conn.recv(65536)
+    handler.close()
+    conn.close()
+    server.close()
+
+    assert json.loads(data) == {"message": "Over TCP"}
+
+
+def test_unsupported_scheme():
+    with pytest.raises(ValueError):
+        NDJSONShippingHandler("ftp://example.com")
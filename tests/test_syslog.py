@@ -0,0 +1,209 @@
+import json
+import re
+import socket
+import threading
+import time
+
+import pytest
+
+from logger_kit import NOTICE, TRACE
+from logger_kit.handlers import SysLogHandler
+from logger_kit.syslog import BatchingSysLogHandler
+
+RFC5424 = re.compile(
+    rb"<(\d+)>1 (\S+Z) (\S+) (\S+) (\d+) (\S+) - (.*)", re.DOTALL
+)
+
+
+class SyslogServer:
+    """Stream socket server decoding octet-counted syslog frames."""
+
+    def __init__(self, family=socket.AF_INET, address=("127.0.0.1", 0)):
+        self.sock = socket.socket(family, socket.SOCK_STREAM)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.sock.bind(address)
+        self.sock.listen()
+        self.address = self.sock.getsockname()
+        self.messages = []
+        self.connections = 0
+        self.reads = 0
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+
+    def _serve(self):
+        while True:
+            try:
+                conn, _ = self.sock.accept()
+            except OSError:
+                return
+            self.connections += 1
+            threading.Thread(
+                target=self._read, args=(conn,), daemon=True
+            ).start()
+
+    def _read(self, conn):
+        buffer = b""
+        with conn:
+            while True:
+                data = conn.recv(65536)
+                if not data:
+                    return
+                self.reads += 1
+                buffer += data
+                while b" " in buffer:
+                    prefix, rest = buffer.split(b" ", 1)
+                    length = int(prefix)
+                    if len(rest) < length:
+                        break
+                    self.messages.append(rest[:length])
+                    buffer = rest[length:]
+
+    def wait_for(self, count, timeout=5):
+        deadline = time.monotonic() + timeout
+        while len(self.messages) < count and time.monotonic() < deadline:
+            time.sleep(0.01)
+        return self.messages
+
+    def close(self):
+        self.sock.close()
+
+
+@pytest.fixture
+def server():
+    server = SyslogServer()
+    yield server
+    server.close()
+
+
+def test_rfc5424_over_tcp(server, make_logger):
+    handler = SysLogHandler(
+        address=server.address, transport="tcp", app_name="my app"
+    ).get_handler()
+    assert isinstance(handler, BatchingSysLogHandler)
+    logger = make_logger("syslog_tcp_test", handler)
+
+    logger.error("Something failed")
+    messages = server.wait_for(1)
+    handler.close()
+
+    match = RFC5424.fullmatch(messages[0])
+    assert match is not None
+    priority, _, _, app_name, _, msgid, body = match.groups()
+    assert int(priority) == 8 + 3  # user facility, err severity
+    assert app_name == b"myapp"
+    assert msgid == b"syslog_tcp_test"
+    assert json.loads(body) == {"message": "Something failed"}
+
+
+def test_logger_kit_levels_have_syslog_severities(server, make_logger):
+    handler = BatchingSysLogHandler(server.address)
+    logger = make_logger("syslog_levels_test", handler)
+    logger.setLevel(TRACE)
+
+    logger.log(NOTICE, "Noticed")
+    logger.log(TRACE, "Traced")
+    messages = server.wait_for(2)
+    handler.close()
+
+    priorities = [int(RFC5424.fullmatch(m).group(1)) for m in messages]
+    # user facility, notice and debug severities
+    assert priorities == [8 + 5, 8 + 7]
+
+
+def test_records_are_batched(server, make_logger):
+    handler = BatchingSysLogHandler(server.address)
+    logger = make_logger("syslog_batch_test", handler)
+    # Hold the sender until every record is queued
+    handler.queue._lock.acquire()
+    try:
+        threading.Thread(
+            target=lambda: [logger.info(f"Batched {i}") for i in range(100)]
+        ).start()
+        time.sleep(0.2)
+    finally:
+        handler.queue._lock.release()
+    messages = server.wait_for(100)
+    handler.close()
+
+    bodies = [json.loads(RFC5424.fullmatch(m).group(7)) for m in messages]
+    assert [b["message"] for b in bodies] == [
+        f"Batched {i}" for i in range(100)
+    ]
+    assert server.connections == 1
+    assert server.reads < 100
+
+
+def test_large_payload_is_not_truncated(server, make_logger):
+    handler = BatchingSysLogHandler(server.address)
+    logger = make_logger("syslog_large_test", handler)
+
+    logger.info("x" * 200000)
+    messages = server.wait_for(1)
+    handler.close()
+
+    body = RFC5424.fullmatch(messages[0]).group(7)
+    assert json.loads(body)["message"] == "x" * 200000
+
+
+def test_reconnects_with_backoff(make_logger):
+    probe = socket.socket()
+    probe.bind(("127.0.0.1", 0))
+    address = probe.getsockname()
+    probe.close()
+    handler = BatchingSysLogHandler(address, reconnect_delay=0.05)
+    logger = make_logger("syslog_reconnect_test", handler)
+
+    logger.info("Sent before the server is up")
+    time.sleep(0.2)
+    assert handler.reconnects > 0
+    assert not handler.drain(timeout=0.1)
+    server = SyslogServer(address=address)
+    try:
+        assert handler.drain(timeout=5)
+        messages = server.wait_for(1)
+        handler.close()
+    finally:
+        server.close()
+
+    assert json.loads(RFC5424.fullmatch(messages[0]).group(7)) == {
+        "message": "Sent before the server is up"
+    }
+
+
+def test_bounded_buffer_drops_when_unreachable(make_logger):
+    probe = socket.socket()
+    probe.bind(("127.0.0.1", 0))
+    address = probe.getsockname()
+    probe.close()
+    handler = BatchingSysLogHandler(address, capacity=10, batch_size=1)
+    logger = make_logger("syslog_drop_test", handler)
+
+    for i in range(50):
+        logger.info(f"Dropped {i}")
+    handler.close(timeout=0.1)
+
+    assert handler.dropped >= 39
+    assert handler.sent == 0
+
+
+@pytest.mark.skipif(
+    not hasattr(socket, "AF_UNIX"), reason="requires UNIX sockets"
+)
+def test_unix_stream_socket(tmp_path, make_logger):
+    path = str(tmp_path / "syslog.sock")
+    server = SyslogServer(socket.AF_UNIX, path)
+    try:
+        handler = SysLogHandler(address=path, transport="unix").get_handler()
+        logger = make_logger("syslog_unix_test", handler)
+        logger.warning("Over a UNIX socket")
+        messages = server.wait_for(1)
+        handler.close()
+    finally:
+        server.close()
+
+    assert int(RFC5424.fullmatch(messages[0]).group(1)) == 8 + 4
+
+
+def test_unknown_transport():
+    with pytest.raises(ValueError):
+        BatchingSysLogHandler(transport="udp")
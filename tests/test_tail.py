@@ -0,0 +1,116 @@
+import asyncio
+import time
+
+import pytest
+
+from logger_kit import Logger
+from logger_kit.tail import TailBuffer
+
+
+def test_history_is_logged_before_an_error(console_messages):
+    logger = Logger(
+        "tail_error_test", formatter="fast", tail_buffer=TailBuffer()
+    )
+    logger.key_masker.add_exact_match("password")
+
+    logger.debug("Connecting", extra={"password": "hunter2"})
+    time.sleep(0.01)
+    logger.info("Connected")
+    assert [r["@message"] for r in console_messages()] == ["Connected"]
+
+    logger.error("Query failed")
+    debug, error = console_messages()
+    assert debug["@message"] == "Connecting"
+    assert debug["levelname"] == "DEBUG"
+    assert debug["password"] != "hunter2"
+    assert debug["asctime"] < error["asctime"]
+    assert error["@message"] == "Query failed"
+
+    # The history was consumed
+    logger.error("Query failed again")
+    assert [r["@message"] for r in console_messages()] == [
+        "Query failed again"
+    ]
+    assert logger.tail_buffer.flushed == 1
+
+
+def test_only_the_last_records_are_kept(console_messages):
+    logger = Logger(
+        "tail_capacity_test",
+        tail_buffer=TailBuffer(capacity=3, trigger_level="WARNING"),
+    )
+    calls = []
+    for i in range(10):
+        logger.debug(f"Step {i}", extra=lambda i=i: calls.append(i) or {})
+    assert calls == []
+
+    logger.warning("Slow")
+    assert [r["@message"] for r in console_messages()] == [
+        "Step 7",
+        "Step 8",
+        "Step 9",
+        "Slow",
+    ]
+    assert calls == [7, 8, 9]
+
+
+def test_level_selects_buffered_records(console_messages):
+    logger = Logger(
+        "tail_level_test",
+        level="WARNING",
+        tail_buffer=TailBuffer(level="INFO"),
+    )
+    logger.debug("Dropped")
+    logger.info("Kept")
+    logger.critical("Crashed")
+    assert [r["@message"] for r in console_messages()] == ["Kept", "Crashed"]
+
+
+def test_contexts_have_separate_history(console_messages):
+    logger = Logger("tail_context_test", tail_buffer=TailBuffer())
+
+    with logger.context(request_id=1):
+        logger.debug("Request 1 detail")
+    with logger.context(request_id=2):
+        logger.debug("Request 2 detail")
+        logger.error("Request 2 failed")
+
+    records = console_messages()
+    assert [r["@message"] for r in records] == [
+        "Request 2 detail",
+        "Request 2 failed",
+    ]
+    assert records[0]["request_id"] == 2
+
+
+@pytest.mark.asyncio
+async def test_tasks_have_separate_history(console_messages):
+    logger = Logger("tail_task_test", tail_buffer=TailBuffer())
+
+    async def request(i):
+        for step in range(3):
+            await logger.adebug(f"Task {i} step {step}")
+            await asyncio.sleep(0)
+        if i == 5:
+            await logger.aerror(f"Task {i} failed")
+
+    await asyncio.gather(*(request(i) for i in range(10)))
+    assert [r["@message"] for r in console_messages()] == [
+        "Task 5 step 0",
+        "Task 5 step 1",
+        "Task 5 step 2",
+        "Task 5 failed",
+    ]
+
+
+def test_queued_logger_history(console_messages):
+    logger = Logger("tail_queued_test", queued=True, tail_buffer=TailBuffer())
+    bound = logger.bind(job="sync")
+    bound.debug("Fetching")
+    logger.error("Sync failed")
+    logger.close()
+
+    debug, error = console_messages()
+    assert debug["@message"] == "Fetching"
+    assert debug["job"] == "sync"
+    assert error["@message"] == "Sync failed"